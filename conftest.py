@@ -1,9 +1,174 @@
 import os
+import time
+import inspect
 import pytest
 from dotenv import load_dotenv # type: ignore
+from utils.request_handler import close_session, clear_memo
+from utils.async_request_handler import run, close_event_loop
+from utils import cassette
+from utils.response_store import flush_store
+from utils.durations import DURATIONS_FILE, save_durations
+from utils import auth
+from standin import StandinServer, LiveSimulator, build_store
+from standin.store import FIXTURES_DIR
+from standin.faults import PROFILES, load_profile
+from tests import state
 
 load_dotenv()
 
+# local stand-in API, started by --standin
+_standin = None
+
+# seconds per test node id, written to --durations-file when the session ends
+_durations = {}
+
+# (tests, requests, seconds) of the auth-matrix prefetch
+_auth_matrix = None
+
+# ------------------------
+# HTTP TRANSPORT
+# ------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup("cassettes")
+    group.addoption("--record", action="store_true", help="record every request/response into the cassette store")
+    group.addoption("--replay", action="store_true", help="answer every request from the cassette store, no network")
+    group.addoption("--cassette-dir", default=cassette.CASSETTE_DIR, help="directory holding recorded cassettes")
+
+    parser.getgroup("general").addoption(
+        "--durations-file", default=DURATIONS_FILE,
+        help="where to persist per-test durations for run.py sharding ('' to disable)")
+    parser.getgroup("general").addoption(
+        "--no-auth-matrix", action="store_true",
+        help="send each token test's request on its own instead of prefetching the whole grid")
+
+    group = parser.getgroup("standin")
+    group.addoption("--standin", action="store_true", help="run against the local stand-in API instead of the dev host")
+    group.addoption("--standin-fixtures", action="append", default=[], help="fixture directory for the stand-in (repeatable)")
+    group.addoption("--standin-faults", help=f"inject faults into the stand-in: {', '.join(PROFILES)} or a JSON profile")
+    group.addoption("--standin-fault-seed", type=int, help="seed for --standin-faults")
+    group.addoption("--standin-live", action="append", default=[], help="simulate this match key as a live match (repeatable)")
+    group.addoption("--standin-ball-interval", type=float, default=6.0, help="seconds between simulated deliveries")
+    group.addoption("--standin-fast-forward", type=int, default=0, help="deliveries already bowled in simulated matches")
+
+
+def pytest_configure(config):
+    if config.getoption("record") and config.getoption("replay"):
+        raise pytest.UsageError("--record and --replay are mutually exclusive")
+    if config.getoption("record"):
+        cassette.configure("record", config.getoption("cassette_dir"))
+    elif config.getoption("replay"):
+        cassette.configure("replay", config.getoption("cassette_dir"))
+
+    if config.getoption("standin"):
+        global _standin
+        for name in ("PROJECT_KEY", "REST_TOKEN", "REST_TOKEN_1", "GRAPHQL_TOKEN"):
+            os.environ.setdefault(name, f"standin-{name}")
+        fixtures = config.getoption("standin_fixtures") or [FIXTURES_DIR]
+        store = build_store(fixtures, [config.getoption("cassette_dir")])
+        if not len(store):
+            raise pytest.UsageError(
+                "--standin has no fixture data in {} or {}: run `pytest tests --record` against the API first, "
+                "or pass --standin-fixtures (e.g. one written by `python -m standin.generator`)".format(
+                    ", ".join(fixtures), config.getoption("cassette_dir")))
+        tokens = [os.getenv("REST_TOKEN"), os.getenv("REST_TOKEN_1")]
+        faults = config.getoption("standin_faults")
+        if faults:
+            faults = load_profile(faults, config.getoption("standin_fault_seed"))
+        simulator = None
+        if config.getoption("standin_live"):
+            simulator = LiveSimulator(store, interval=config.getoption("standin_ball_interval"))
+            for key in config.getoption("standin_live"):
+                simulator.add_key(key, upto=config.getoption("standin_fast_forward"))
+        _standin = StandinServer(store, tokens=tokens, graphql_tokens=[os.getenv("GRAPHQL_TOKEN")],
+                                 faults=faults, simulator=simulator).start_in_thread()
+
+
+def pytest_unconfigure(config):
+    global _standin
+    if _standin is not None:
+        _standin.stop()
+        _standin = None
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _standin is not None and _standin.faults is not None:
+        counts = ", ".join(f"{name} {count}" for name, count in _standin.faults.counts.items())
+        terminalreporter.write_line(f"stand-in faults (seed {_standin.faults.seed}): {counts}")
+    if _auth_matrix is not None:
+        terminalreporter.write_line("auth matrix: {} tests, {} requests prefetched in {:.2f}s".format(*_auth_matrix))
+
+
+def pytest_runtest_logreport(report):
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption("durations_file")
+    if not path or not _durations:
+        return
+    # node ids are relative to the rootdir, which moves with the arguments; store them relative to the cwd
+    root, here = session.config.rootpath, session.config.invocation_params.dir
+    recorded = {}
+    for node_id, seconds in _durations.items():
+        module, _, name = node_id.partition("::")
+        module = os.path.relpath(root / module, here).replace(os.sep, "/")
+        recorded[f"{module}::{name}"] = round(seconds, 4)
+    save_durations(recorded, path)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http_session():
+    # keep-alive pool shared by every request helper, closed once the run ends
+    yield
+    auth.clear_prefetched()
+    close_event_loop()
+    clear_memo()
+    flush_store()
+    close_session()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    # `async def` tests are awaited on the shared event loop
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    funcargs = pyfuncitem.funcargs
+    kwargs = {arg: funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames}
+    run(pyfuncitem.obj(**kwargs))
+    return True
+
+# ------------------------
+# KEY REGISTRY
+# ------------------------
+
+def _module_state(module, name):
+    # defaults from tests/state.py with the module's STATE_OVERRIDES applied
+    return state.resolve(name, getattr(module, "STATE_OVERRIDES", None))
+
+def _state(request, name):
+    return _module_state(request.module, name)
+
+@pytest.fixture(scope="module")
+def association_state(request):
+    return _state(request, "association")
+
+@pytest.fixture(scope="module")
+def country_state(request):
+    return _state(request, "country")
+
+@pytest.fixture(scope="module")
+def stadium_state(request):
+    return _state(request, "stadium")
+
+@pytest.fixture(scope="module")
+def tournament_state(request):
+    return _state(request, "tournament")
+
+@pytest.fixture(scope="module")
+def match_state(request):
+    return _state(request, "match")
+
 # ------------------------
 # REST API FIXTURES
 # ------------------------
@@ -14,43 +179,77 @@ def project_key():
 
 @pytest.fixture(scope="session")
 def base_url(project_key):
+    if _standin is not None:
+        return _standin.rest_url(project_key)
     return f"https://ants-api.sports.dev.roanuz.com/v5/cricket/{project_key}/"
 
+def rest_headers(name):
+    # header sets behind the fixtures below, also used to plan the auth matrix
+    account_key = os.getenv("RZ_ACCOUNT_KEY")
+    if name == "valid_headers":
+        return {"rs-token": os.getenv("REST_TOKEN"), "RZAccountKey": account_key, "Content-Type": "application/json"}
+    if name == "valid_headers_1":
+        return {"rs-token": os.getenv("REST_TOKEN_1"), "Content-Type": "application/json"}
+    if name == "invalid_headers":
+        return {"rs-token": "INVALID", "RZAccountKey": account_key}
+    if name == "no_token_headers":
+        return {"RZAccountKey": account_key}
+    if name == "empty_token_headers":
+        return {"RZAccountKey": account_key, "rs-token": "", "Content-Type": "application/json"}
+    raise KeyError(name)
+
 @pytest.fixture
 def valid_headers():
-    return {
-        "rs-token": os.getenv("REST_TOKEN"),
-        "RZAccountKey": os.getenv("RZ_ACCOUNT_KEY"),
-        "Content-Type": "application/json"
-    }
+    return rest_headers("valid_headers")
 
 @pytest.fixture
 def valid_headers_1():
-    return {
-        "rs-token": os.getenv("REST_TOKEN_1"),
-        "Content-Type": "application/json"
-    }
+    return rest_headers("valid_headers_1")
 
 @pytest.fixture
 def invalid_headers():
-    return {
-        "rs-token": "INVALID",
-        "RZAccountKey": os.getenv("RZ_ACCOUNT_KEY"),
-    }
+    return rest_headers("invalid_headers")
 
 @pytest.fixture
 def no_token_headers():
-    return {
-        "RZAccountKey": os.getenv("RZ_ACCOUNT_KEY"),
-    }
+    return rest_headers("no_token_headers")
 
 @pytest.fixture
 def empty_token_headers():
-    return {
-        "RZAccountKey": os.getenv("RZ_ACCOUNT_KEY"),
-        "rs-token": "",
-        "Content-Type": "application/json"
-    }
+    return rest_headers("empty_token_headers")
+
+# ------------------------
+# AUTH MATRIX
+# ------------------------
+
+REST_HEADER_FIXTURES = ("valid_headers", "valid_headers_1", "invalid_headers", "no_token_headers", "empty_token_headers")
+
+@pytest.fixture(scope="session", autouse=True)
+def auth_matrix(request, http_session, base_url):
+    # prefetch the token grid of every selected test from its module's ENDPOINT, state keys and header
+    # fixtures (or AUTH_ENDPOINTS); no test body runs here
+    global _auth_matrix
+    if request.config.getoption("no_auth_matrix"):
+        return
+    started = time.monotonic()
+    planned, tests = [], 0
+    for item in request.session.items:
+        module = getattr(item, "module", None)
+        endpoint = getattr(module, "ENDPOINT", None)
+        if not isinstance(item, pytest.Function) or not isinstance(endpoint, str) \
+                or not auth.uses_auth_helpers(item.obj):
+            continue
+        states = {name: _module_state(module, name) for name in state.REGISTRY}
+        declared = getattr(module, "AUTH_ENDPOINTS", None)
+        requests = []
+        for name in item._fixtureinfo.argnames:
+            path = auth.planned_endpoint(endpoint, name, states, declared) if name in REST_HEADER_FIXTURES else None
+            if path is not None:
+                requests.append((f"{base_url}{path}", rest_headers(name)))
+        planned += requests
+        tests += bool(requests)
+    if planned:
+        _auth_matrix = (tests, auth.prefetch(planned), time.monotonic() - started)
 
 # ------------------------
 # GRAPHQL FIXTURES
@@ -58,8 +257,17 @@ def empty_token_headers():
 
 @pytest.fixture(scope="session")
 def graphql_url():
+    if _standin is not None:
+        return _standin.graphql_url("/graphql/")
     return "https://ants.sports.dev.roanuz.com/graphql/"
 
+@pytest.fixture(scope="session")
+def gql_url():
+    # public v5 GraphQL endpoint used by the REST-vs-GraphQL parity tests
+    if _standin is not None:
+        return _standin.graphql_url("/v5/gql/")
+    return "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+
 @pytest.fixture
 def graphql_headers():
     return {
@@ -1,7 +1,132 @@
+import os
+import sys
+import glob
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+import xml.etree.ElementTree as ET
 import pytest
+from utils.durations import DURATIONS_FILE, load_durations, save_durations, module_costs, lpt_shards
+
+# python run.py                      - whole suite in this process, as before
+# python run.py -n 4                 - four worker processes, modules sharded by recorded duration
+# python run.py -n 4 -- --standin    - anything after -- is passed to every pytest run
+#
+# Shards are built longest-processing-time-first from the durations earlier
+# runs left in .test_durations.json. The network-bound modules in
+# NETWORK_BOUND always start first so a slow one cannot become the straggler.
+# Each shard writes its own JUnit XML; they are merged into --junitxml.
+
+TESTS_DIR = "tests"
+NETWORK_BOUND = ("tests/test_014_matches.py", "tests/test_016_over_summary.py")
+
+
+def run_shard(index, modules, pytest_args, work_dir):
+    # runs in a fresh worker process; its output goes to a per-shard log
+    log = os.path.join(work_dir, f"shard-{index}.log")
+    with open(log, "w") as f:
+        os.dup2(f.fileno(), 1)
+        os.dup2(f.fileno(), 2)
+        started = time.monotonic()
+        code = pytest.main(list(modules) + [
+            "-q",
+            f"--junitxml={os.path.join(work_dir, f'shard-{index}.xml')}",
+            f"--durations-file={os.path.join(work_dir, f'durations-{index}.json')}",
+        ] + list(pytest_args))
+    return index, int(code), time.monotonic() - started
+
+
+def _shard_process(results, index, modules, pytest_args, work_dir):
+    results.put(run_shard(index, modules, pytest_args, work_dir))
+
+
+def merge_junit(paths, target):
+    suites = ET.Element("testsuites")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    elapsed = 0.0
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        root = ET.parse(path).getroot()
+        for suite in ([root] if root.tag == "testsuite" else root.findall("testsuite")):
+            suites.append(suite)
+            for name in totals:
+                totals[name] += int(suite.get(name, 0))
+            elapsed = max(elapsed, float(suite.get("time", 0)))
+    for name, value in totals.items():
+        suites.set(name, str(value))
+    suites.set("time", f"{elapsed:.3f}")
+    ET.ElementTree(suites).write(target, encoding="utf-8", xml_declaration=True)
+    return totals
+
+
+def run_parallel(workers, pytest_args, durations_file, junitxml):
+    modules = sorted(glob.glob(os.path.join(TESTS_DIR, "test_*.py")))
+    costs = module_costs(load_durations(durations_file), modules)
+    shards = lpt_shards(costs, workers, first=NETWORK_BOUND)
+    for index, shard in enumerate(shards):
+        print(f"shard {index}: ~{shard['cost']:.1f}s  {' '.join(os.path.basename(m) for m in shard['modules'])}")
+
+    work_dir = tempfile.mkdtemp(prefix="pytest-shards-")
+    started = time.monotonic()
+    results = []
+    # spawn, one process per shard: every shard gets a clean interpreter with its own
+    # session, loop and stand-in, and pytest.main never runs twice in one process
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = [context.Process(target=_shard_process, args=(queue, index, shard["modules"], pytest_args, work_dir))
+                 for index, shard in enumerate(shards)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    wall = time.monotonic() - started
+    while not queue.empty():
+        results.append(queue.get())
+    finished = {index for index, _, _ in results}
+    for index, process in enumerate(processes):
+        if index not in finished:
+            # the worker died before reporting; keep its log in the failure output
+            results.append((index, process.exitcode or 1, wall))
+
+    recorded = {}
+    for index in range(len(shards)):
+        recorded.update(load_durations(os.path.join(work_dir, f"durations-{index}.json")))
+    if durations_file and recorded:
+        save_durations(recorded, durations_file)
+
+    totals = merge_junit([os.path.join(work_dir, f"shard-{index}.xml") for index in range(len(shards))], junitxml)
+    exit_code = 0
+    for index, code, seconds in sorted(results):
+        print(f"shard {index}: exit {code} in {seconds:.1f}s")
+        if code not in (0, 5):  # 5 = no tests collected
+            exit_code = exit_code or code
+            with open(os.path.join(work_dir, f"shard-{index}.log")) as f:
+                sys.stdout.write(f.read())
+    print(f"{totals['tests']} tests, {totals['failures']} failed, {totals['errors']} errors, "
+          f"{totals['skipped']} skipped in {wall:.1f}s -> {junitxml}")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API test suite")
+    parser.add_argument("-n", "--workers", type=int, default=0, help="worker processes (0 = run serially)")
+    parser.add_argument("--durations-file", default=DURATIONS_FILE, help="per-test durations used for sharding")
+    parser.add_argument("--junitxml", default="report.xml", help="merged JUnit report of a parallel run")
+    parser.add_argument("pytest_args", nargs="*", help="extra pytest arguments (after --)")
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        return pytest.main([
+            "tests",        # run all tests in tests/ folder
+            "-v",           # verbose output
+            f"--durations-file={args.durations_file}",
+        ] + args.pytest_args)
+    return run_parallel(args.workers, args.pytest_args, args.durations_file, args.junitxml)
+
 
 if __name__ == "__main__":
-    pytest.main([
-        "tests",        # run all tests in tests/ folder
-        "-v"            # verbose output
-    ])
+    sys.exit(main())
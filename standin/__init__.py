@@ -0,0 +1,3 @@
+from standin.store import FixtureStore, build_store
+from standin.server import StandinServer
+from standin.simulator import LiveSimulator
@@ -0,0 +1,49 @@
+import os
+import asyncio
+import argparse
+from standin import StandinServer, LiveSimulator, build_store
+from standin.store import FIXTURES_DIR
+from standin.faults import PROFILES, load_profile
+
+# python -m standin --fixtures standin/fixtures --cassettes cassettes --port 8765
+# python -m standin --faults chaos --fault-seed 7
+# python -m standin --live-count 3 --ball-interval 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Roanuz cricket API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", action="append", default=[], help="directory of fixture JSON files")
+    parser.add_argument("--cassettes", action="append", default=[], help="directory of recorded cassettes")
+    parser.add_argument("--token", action="append", default=[], help="accepted rs-token (default: $REST_TOKEN, $REST_TOKEN_1)")
+    parser.add_argument("--graphql-token", action="append", default=[], help="accepted rztoken (default: $GRAPHQL_TOKEN)")
+    parser.add_argument("--faults", help=f"fault profile: one of {', '.join(PROFILES)} or a JSON file")
+    parser.add_argument("--fault-seed", type=int, help="seed for the fault profile (default: the profile's own)")
+    parser.add_argument("--live", action="append", default=[], help="simulate this match key live (repeatable)")
+    parser.add_argument("--live-count", type=int, default=0, help="number of extra synthetic live matches")
+    parser.add_argument("--live-format", default="t20", help="format of simulated matches (t20, oneday, test)")
+    parser.add_argument("--ball-interval", type=float, default=6.0, help="seconds between deliveries")
+    parser.add_argument("--fast-forward", type=int, default=0, help="deliveries already bowled when serving starts")
+    args = parser.parse_args()
+
+    tokens = args.token or [os.getenv("REST_TOKEN"), os.getenv("REST_TOKEN_1")]
+    graphql_tokens = args.graphql_token or [os.getenv("GRAPHQL_TOKEN")]
+    store = build_store(args.fixtures or [FIXTURES_DIR], args.cassettes)
+    faults = load_profile(args.faults, args.fault_seed) if args.faults else None
+    simulator = None
+    live = args.live + [f"live--cricket--{number:04d}" for number in range(args.live_count)]
+    if live:
+        simulator = LiveSimulator(store, interval=args.ball_interval)
+        for key in live:
+            simulator.add_key(key, args.live_format, upto=args.fast_forward)
+    server = StandinServer(store, tokens=tokens, graphql_tokens=graphql_tokens, host=args.host, port=args.port,
+                           faults=faults, simulator=simulator)
+    print(f"Serving {len(store)} resources on {server.rest_url('<project_key>')} and {server.graphql_url()}")
+    if live:
+        print(f"Live matches ({args.ball_interval}s per ball): {', '.join(live)}")
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
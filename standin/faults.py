@@ -0,0 +1,125 @@
+import json
+import math
+import random
+from fnmatch import fnmatch
+
+# Fault and latency injection for the stand-in API
+# A profile is a seed plus an ordered list of rules; the first rule whose glob
+# matches the request path decides what happens to the request:
+#   latency       - delay before answering: {"dist": "fixed", "ms": 50}
+#                   {"dist": "uniform", "min_ms": 10, "max_ms": 80}
+#                   {"dist": "lognormal", "median_ms": 60, "sigma": 0.8}
+#                   {"dist": "pareto", "scale_ms": 20, "alpha": 1.5}   (heavy tail)
+#                   every distribution accepts "cap_ms"
+#   error_rate    - share of requests answered with one of `errors` (default [500, 502, 503])
+#   throttle_rate - share of requests answered 429 with Retry-After: `retry_after` seconds
+#   reset_rate    - share of connections dropped without a response
+#   drip          - send the body in {"chunk": bytes} pieces every {"interval_ms": ms}
+# Decisions are drawn from a generator seeded with (seed, method, path, n) for the
+# n-th request to that path, so a run is reproducible however requests interleave.
+#
+# Profiles are given by name (see PROFILES) or as a path to a JSON file:
+#   {"seed": 7, "rules": [{"match": "*/ball-by-ball/*", "latency": {...}, "reset_rate": 0.01}]}
+
+DEFAULT_ERRORS = (500, 502, 503)
+
+PROFILES = {
+    "none": {"rules": []},
+    "slow": {"rules": [{"match": "*", "latency": {"dist": "lognormal", "median_ms": 150, "sigma": 0.5}}]},
+    "tail": {"rules": [{"match": "*", "latency": {"dist": "pareto", "scale_ms": 20, "alpha": 1.5, "cap_ms": 5000}}]},
+    "flaky": {"rules": [{"match": "*", "latency": {"dist": "uniform", "min_ms": 10, "max_ms": 50},
+                         "error_rate": 0.05, "reset_rate": 0.02}]},
+    "throttled": {"rules": [{"match": "*", "throttle_rate": 0.2, "retry_after": 1}]},
+    "drip": {"rules": [{"match": "*/match/*", "drip": {"chunk": 512, "interval_ms": 10}}]},
+    "chaos": {"rules": [
+        {"match": "*/ball-by-ball/*", "latency": {"dist": "lognormal", "median_ms": 80, "sigma": 0.9, "cap_ms": 3000},
+         "drip": {"chunk": 1024, "interval_ms": 5}, "reset_rate": 0.01},
+        {"match": "*", "latency": {"dist": "pareto", "scale_ms": 10, "alpha": 2.0, "cap_ms": 2000},
+         "error_rate": 0.03, "throttle_rate": 0.05, "reset_rate": 0.01},
+    ]},
+}
+
+
+class Fault:
+    __slots__ = ("delay", "status", "reset", "drip", "retry_after")
+
+    def __init__(self, delay=0.0, status=None, reset=False, drip=None, retry_after=None):
+        self.delay = delay
+        self.status = status
+        self.reset = reset
+        self.drip = drip
+        self.retry_after = retry_after
+
+
+def sample_latency(rng, spec):
+    # seconds to wait before answering
+    if not spec:
+        return 0.0
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        ms = spec.get("ms", 0)
+    elif dist == "uniform":
+        ms = rng.uniform(spec.get("min_ms", 0), spec["max_ms"])
+    elif dist == "lognormal":
+        ms = rng.lognormvariate(math.log(spec["median_ms"]), spec.get("sigma", 0.5))
+    elif dist == "pareto":
+        ms = spec["scale_ms"] * rng.paretovariate(spec.get("alpha", 1.5))
+    else:
+        raise ValueError(f"Unknown latency distribution {dist!r}")
+    if "cap_ms" in spec:
+        ms = min(ms, spec["cap_ms"])
+    return max(ms, 0) / 1000
+
+
+class FaultProfile:
+
+    def __init__(self, rules=(), seed=0):
+        self.rules = list(rules)
+        self.seed = seed
+        self._seen = {}
+        self.counts = {"requests": 0, "delayed": 0, "errors": 0, "throttled": 0, "resets": 0, "dripped": 0}
+
+    def rule(self, path):
+        for rule in self.rules:
+            if fnmatch(path, rule.get("match", "*")):
+                return rule
+        return None
+
+    def decide(self, method, path):
+        self.counts["requests"] += 1
+        rule = self.rule(path)
+        if rule is None:
+            return None
+        n = self._seen.get((method, path), 0)
+        self._seen[(method, path)] = n + 1
+        rng = random.Random(f"{self.seed}:{method}:{path}:{n}")
+
+        fault = Fault(delay=sample_latency(rng, rule.get("latency")), drip=rule.get("drip"))
+        # one draw decides between the mutually exclusive outcomes
+        roll = rng.random()
+        reset_rate = rule.get("reset_rate", 0)
+        throttle_rate = rule.get("throttle_rate", 0)
+        error_rate = rule.get("error_rate", 0)
+        if roll < reset_rate:
+            fault.reset = True
+        elif roll < reset_rate + throttle_rate:
+            fault.status = 429
+            fault.retry_after = rule.get("retry_after", 1)
+        elif roll < reset_rate + throttle_rate + error_rate:
+            fault.status = rng.choice(rule.get("errors") or DEFAULT_ERRORS)
+
+        self.counts["delayed"] += fault.delay > 0
+        self.counts["resets"] += fault.reset
+        self.counts["throttled"] += fault.status == 429
+        self.counts["errors"] += fault.status is not None and fault.status != 429
+        self.counts["dripped"] += bool(fault.drip) and not fault.reset
+        return fault
+
+
+def load_profile(name_or_path, seed=None):
+    if name_or_path in PROFILES:
+        spec = PROFILES[name_or_path]
+    else:
+        with open(name_or_path) as f:
+            spec = json.load(f)
+    return FaultProfile(spec.get("rules", []), seed if seed is not None else spec.get("seed", 0))
@@ -0,0 +1,1127 @@
+import os
+import json
+import random
+import argparse
+import time
+
+# Synthetic match generator
+# Simulates cricket matches delivery by delivery and renders them as stand-in
+# fixture documents (path -> data) in the shapes the suite validates:
+#   match/<key>/                      match detail (innings, partnerships, live, players, squads)
+#   match/<key>/ball-by-ball/<over>/  one document per over, plus the latest over and FIRST-OVER
+#   match/<key>/over-summary/<page>/  over summaries, one page per OVERS_PER_PAGE overs of an innings
+#   match/<key>/worm|manhattan|run-rate/
+#   match/<key>/live-match-odds/ or pre-match-odds/
+# Everything except the delivery list is derived from the deliveries while
+# rendering, so scores, partnerships, summaries and graph series always agree
+# with each other. A match can be rendered up to any delivery, which is how a
+# live match is produced.
+#
+# python -m standin.generator --count 1000 --seed 7 --out standin/fixtures/synthetic
+
+FORMATS = {
+    # overs per innings (None = unlimited), innings per side
+    "t20": {"overs": 20, "innings": 1},
+    "oneday": {"overs": 50, "innings": 1},
+    "test": {"overs": None, "innings": 2},
+}
+OUTCOMES = ("completed", "super_over", "drawn", "abandoned", "live", "not_started")
+
+# (run weights for 0/1/2/3/4/6 off the bat, wicket probability per legal ball)
+PROFILES = {
+    "t20": ((33, 37, 9, 1, 13, 7), 0.05),
+    "oneday": ((45, 35, 8, 1, 9, 2), 0.03),
+    "test": ((62, 24, 5, 1, 7, 1), 0.018),
+}
+BAT_RUNS = (0, 1, 2, 3, 4, 6)
+EXTRAS = (("wide", 0.025), ("no_ball", 0.008), ("bye", 0.006), ("leg_bye", 0.012))
+WICKET_TYPES = (("caught", 50), ("bowled", 22), ("lbw", 15), ("run_out", 7), ("stumping", 6))
+
+OVERS_PER_PAGE = 10
+RECENT_OVERS = 6
+BALLS_PER_DAY = 90 * 6
+SECONDS_PER_BALL = 40
+
+TEAM_NAMES = (
+    "Coastal Kings", "Desert Hawks", "Harbour Giants", "Highland Rovers", "Island Sharks",
+    "Metro Strikers", "Northern Lights", "Plains Riders", "River Titans", "Southern Stars",
+    "Summit Chargers", "Valley Warriors",
+)
+FIRST_NAMES = ("Arjun", "Ben", "Carlos", "Dev", "Eli", "Faf", "Gus", "Hari", "Imam", "Jos",
+               "Kane", "Liam", "Mo", "Nathan", "Ollie", "Pat", "Quinton", "Rahul", "Sam", "Tom")
+LAST_NAMES = ("Ahmed", "Brook", "Cummins", "Dhar", "Evans", "Fernando", "Gill", "Hope", "Iyer",
+              "Jordan", "Khan", "Latham", "Marsh", "Nair", "Orr", "Perera", "Rashid", "Smith",
+              "Taylor", "Williams")
+COUNTRY = {"short_code": "SY", "code": "SYN", "name": "Synthetica", "official_name": "Republic of Synthetica",
+           "is_region": False}
+
+
+# ------------------------
+# SIMULATION
+# ------------------------
+
+class _Innings:
+
+    def __init__(self, key, batting, bowling, batters, bowlers):
+        self.key = key
+        self.batting = batting
+        self.bowling = bowling
+        self.batters = batters
+        self.bowlers = bowlers
+        self.balls = []
+        self.runs = 0
+        self.wickets = 0
+        self.legal = 0
+        self.striker = batters[0]
+        self.non_striker = batters[1]
+        self.next_batter = 2
+        self.sequence = 0
+
+
+class SyntheticMatch:
+
+    def __init__(self, key, match_format="t20", outcome="completed", seed=None, start_at=None, prefix="synthetic"):
+        if match_format not in FORMATS:
+            raise ValueError(f"Unknown format {match_format!r}, expected one of {sorted(FORMATS)}")
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown outcome {outcome!r}, expected one of {OUTCOMES}")
+        if outcome == "super_over" and match_format == "test":
+            raise ValueError("Test matches cannot end in a super over")
+
+        self.key = key
+        self.format = match_format
+        self.outcome = outcome
+        self.rng = random.Random(seed if seed is not None else key)
+        self.weights, self.wicket_chance = PROFILES[match_format]
+        overs = FORMATS[match_format]["overs"]
+        self.max_balls = overs * 6 if overs else None
+
+        now = time.time()
+        if start_at is None:
+            if outcome == "not_started":
+                start_at = now + self.rng.randint(1, 9) * 86400
+            elif outcome == "live":
+                start_at = now - self.rng.randint(1, 3) * 3600
+            else:
+                start_at = now - self.rng.randint(2, 400) * 86400
+        self.start_at = float(int(start_at))
+
+        self._build_sides(prefix)
+        self.innings = []
+        self.delivered = 0
+        self.result = {"winner": None, "result_type": None, "win_by": None, "msg": ""}
+        self.cut = None
+        if outcome != "not_started":
+            self._play()
+        if outcome == "live":
+            total = len(self.deliveries())
+            self.cut = self.rng.randint(1, total - 1) if total > 1 else total
+
+    # teams, squads and the surrounding tournament
+
+    def _build_sides(self, prefix):
+        rng = self.rng
+        names = rng.sample(TEAM_NAMES, 2)
+        self.teams = {}
+        self.players = {}
+        self.squads = {}
+        for side, name in zip(("a", "b"), names):
+            code = "".join(word[0] for word in name.split()).upper() + name[-1].upper()
+            self.teams[side] = {
+                "key": f"{prefix}--cricket--{code.lower()}-{rng.randrange(16 ** 4):04x}",
+                "code": code,
+                "name": name,
+                "alternate_name": name,
+                "alternate_code": code,
+                "gender_name": "Men",
+                "country_code": COUNTRY["code"],
+            }
+            keys = []
+            for number in range(1, 16):
+                player_key = f"{code.lower()}_{rng.randrange(16 ** 6):06x}"
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                role = "batsman" if number <= 5 else "keeper" if number == 6 else "all_rounder" if number <= 8 else "bowler"
+                self.players[player_key] = {
+                    "key": player_key,
+                    "name": name,
+                    "jersey_name": name.split()[-1],
+                    "legal_name": name,
+                    "gender": "male",
+                    "nationality": COUNTRY,
+                    "date_of_birth": float(rng.randint(600_000_000, 1_000_000_000)),
+                    "seasonal_role": role,
+                    "roles": [role],
+                    "batting_style": rng.choice(("right_hand", "left_hand")),
+                    "bowling_style": {"arm": rng.choice(("right_arm", "left_arm")),
+                                      "pace": rng.choice(("fast", "medium", "slow")), "bowling_type": None},
+                    "skills": ["bat"] if number <= 6 else ["bat", "bowl"] if number <= 8 else ["bowl"],
+                    "legal_name_v2": None,
+                    "jersey_name_v2": None,
+                }
+                keys.append(player_key)
+            self.squads[side] = {
+                "player_keys": keys,
+                "captain": keys[0],
+                "keeper": keys[5],
+                "playing_xi": keys[:11],
+                "replacements": [],
+            }
+
+        self.tournament = {
+            "key": f"{prefix}--cricket--league-{self.format}",
+            "name": f"Synthetic {self.format.upper()} League",
+            "short_name": f"SYN {self.format.upper()}",
+            "alternate_name": f"Synthetic {self.format.upper()} League",
+            "alternate_short_name": f"SYN {self.format.upper()}",
+        }
+        self.venue = {
+            "key": f"{prefix}--venue-{rng.randrange(100):02d}",
+            "name": f"{rng.choice(LAST_NAMES)} Oval",
+            "city": "Synthetic City",
+            "country": COUNTRY,
+            "geolocation": f"{rng.uniform(-40, 40):.4f},{rng.uniform(-120, 120):.4f}",
+        }
+        self.association = {"key": f"{prefix}--assoc", "code": "SYN", "name": "Synthetic Cricket Board",
+                            "country": COUNTRY, "parent": None}
+        self.toss = {"winner": rng.choice("ab"), "elected": rng.choice(("bat", "bowl"))}
+        if self.toss["elected"] == "bat":
+            self.first = self.toss["winner"]
+        else:
+            self.first = "b" if self.toss["winner"] == "a" else "a"
+        self.second = "b" if self.first == "a" else "a"
+
+    def _new_innings(self, batting, number):
+        bowling = "b" if batting == "a" else "a"
+        xi = self.squads[batting]["playing_xi"]
+        attack = self.squads[bowling]["playing_xi"][6:11]
+        innings = _Innings(f"{batting}_{number}", batting, bowling, list(xi), list(attack))
+        self.innings.append(innings)
+        return innings
+
+    # one innings; the keyword arguments decide when it stops
+    #   target   - chase, stop once runs >= target
+    #   exact    - steer the innings to end on exactly this total (ties and draws)
+    #   declare  - declare once runs >= declare
+    #   legal    - stop after this many legal balls (abandoned or out of time)
+    # With `exact` and a ball limit the innings blocks out the remaining balls once the total is reached.
+    def _bat(self, innings, max_balls=None, max_wickets=10, target=None, exact=None, declare=None, legal=None):
+        limit = min(x for x in (max_balls, legal) if x is not None) if (max_balls or legal) else None
+        while True:
+            if innings.wickets >= max_wickets or (limit is not None and innings.legal >= limit):
+                break
+            if target is not None and innings.runs >= target:
+                break
+            if declare is not None and innings.runs >= declare:
+                break
+            if exact is not None and innings.runs == exact and limit is None:
+                break
+            self._deliver(innings, limit, max_wickets, exact)
+
+    def _deliver(self, innings, max_balls, max_wickets, exact):
+        rng = self.rng
+        over_index, ball_in_over = divmod(innings.legal, 6)
+        if not innings.balls or innings.balls[-1]["overs"][0] != over_index:
+            # new over from the other end; five bowlers in turn never bowl consecutive overs
+            bowler = innings.bowlers[over_index % len(innings.bowlers)]
+            innings.sequence = 0
+        else:
+            bowler = innings.balls[-1]["bowler"]["player_key"]
+        innings.sequence += 1
+
+        ball_type = "normal"
+        if exact is None:
+            roll = rng.random()
+            for name, chance in EXTRAS:
+                if roll < chance:
+                    ball_type = name
+                    break
+                roll -= chance
+
+        bat_runs = rng.choices(BAT_RUNS, self.weights)[0] if ball_type in ("normal", "no_ball") else 0
+        extra_runs = 1 if ball_type in ("wide", "no_ball") else 0
+        if ball_type in ("bye", "leg_bye"):
+            extra_runs = rng.choice((1, 1, 1, 2, 4))
+
+        wicket = None
+        legal = ball_type not in ("wide", "no_ball")
+        if ball_type == "normal" and innings.wickets < max_wickets and rng.random() < self.wicket_chance:
+            wicket_type = rng.choices([w for w, _ in WICKET_TYPES], [c for _, c in WICKET_TYPES])[0]
+            out = innings.striker
+            if wicket_type == "run_out" and rng.random() < 0.3:
+                out = innings.non_striker
+            wicket = {"player_key": out, "wicket_type": wicket_type}
+            bat_runs = 0
+        if exact is not None:
+            # a steered innings keeps its last wicket and only loses one when a dot ball fits the plan
+            if wicket and (innings.wickets + 1 >= max_wickets or self._steer(innings, 0, exact, max_balls)):
+                wicket = None
+                bat_runs = rng.choices(BAT_RUNS, self.weights)[0]
+            bat_runs = self._steer(innings, bat_runs, exact, max_balls)
+
+        total = bat_runs + extra_runs
+        fielders = []
+        if wicket and wicket["wicket_type"] in ("caught", "run_out", "stumping"):
+            xi = self.squads[innings.bowling]["playing_xi"]
+            fielder = xi[5] if wicket["wicket_type"] == "stumping" else rng.choice(xi)
+            fielders.append({"player_key": fielder, "is_catch": wicket["wicket_type"] == "caught",
+                             "is_run_out": wicket["wicket_type"] == "run_out",
+                             "is_stumps": wicket["wicket_type"] == "stumping", "is_assists": False})
+
+        over_number = over_index + 1
+        moment = self.start_at + self.delivered * SECONDS_PER_BALL
+        ball = {
+            "key": f"{innings.key}_{over_number}_{innings.sequence}",
+            "ball_type": ball_type,
+            "batting_team": innings.batting,
+            "comment": _comment(self.players, bowler, innings.striker, ball_type, bat_runs, extra_runs, wicket),
+            "innings": innings.key,
+            "overs": [over_index, min(ball_in_over + 1, 6)],
+            "batsman": {
+                "player_key": innings.striker,
+                "ball_count": 0 if ball_type == "wide" else 1,
+                "runs": bat_runs,
+                "is_dot_ball": legal and total == 0,
+                "is_four": bat_runs == 4,
+                "is_six": bat_runs == 6,
+            },
+            "bowler": {
+                "player_key": bowler,
+                "ball_count": 1 if legal else 0,
+                "runs": total if ball_type in ("normal", "wide", "no_ball") else 0,
+                "extras": extra_runs if ball_type in ("wide", "no_ball") else 0,
+                "is_wicket": bool(wicket) and wicket["wicket_type"] != "run_out",
+            },
+            "team_score": {"ball_count": 1 if legal else 0, "runs": total, "extras": extra_runs,
+                           "is_wicket": bool(wicket)},
+            "fielders": fielders,
+            "non_striker_key": innings.non_striker,
+            "entry_time": moment,
+            "ball_play_status": "played",
+            "ball_tags": [],
+            "updated_time": moment,
+            "repr": _repr(ball_type, bat_runs, extra_runs, wicket),
+        }
+        if wicket:
+            ball["wicket"] = wicket
+        innings.balls.append(ball)
+        self.delivered += 1
+        innings.runs += total
+        innings.legal += 1 if legal else 0
+
+        # running between the wickets, then the new batter and the change of ends
+        ran = bat_runs if ball_type in ("normal", "no_ball") else extra_runs - (1 if ball_type == "wide" else 0)
+        if ran % 2:
+            innings.striker, innings.non_striker = innings.non_striker, innings.striker
+        if wicket:
+            innings.wickets += 1
+            if innings.next_batter < len(innings.batters) and innings.wickets < 10:
+                incoming = innings.batters[innings.next_batter]
+                innings.next_batter += 1
+                if wicket["player_key"] == innings.striker:
+                    innings.striker = incoming
+                else:
+                    innings.non_striker = incoming
+        if legal and innings.legal % 6 == 0:
+            innings.striker, innings.non_striker = innings.non_striker, innings.striker
+
+    def _steer(self, innings, runs, exact, max_balls):
+        # keep the remaining deficit reachable and never overshoot the total
+        deficit = exact - innings.runs
+        high = min(6, deficit)
+        low = 0
+        if max_balls is not None:
+            low = max(0, deficit - 6 * (max_balls - innings.legal - 1))
+        if low <= runs <= high and runs != 5:
+            return runs
+        options = [r for r in BAT_RUNS if low <= r <= high]
+        if not options:
+            return low
+        return min(options, key=lambda r: abs(r - runs))
+
+    def _play(self):
+        rng = self.rng
+        first, second = self.first, self.second
+        if self.outcome == "abandoned":
+            self._bat(self._new_innings(first, 1), self.max_balls, legal=rng.randint(2, 60))
+            self.result = {"winner": None, "result_type": "no_result", "win_by": None,
+                           "msg": "Match abandoned without a result"}
+            return
+
+        if self.format != "test":
+            a = self._new_innings(first, 1)
+            self._bat(a, self.max_balls)
+            b = self._new_innings(second, 1)
+            if self.outcome in ("super_over", "drawn"):
+                self._bat(b, self.max_balls, exact=a.runs)
+            else:
+                self._bat(b, self.max_balls, target=a.runs + 1)
+            if b.runs > a.runs:
+                self._won(second, f"{10 - b.wickets} wickets")
+            elif a.runs > b.runs:
+                self._won(first, f"{a.runs - b.runs} runs")
+            elif self.outcome == "super_over":
+                self._super_over()
+            else:
+                self.result = {"winner": None, "result_type": "draw", "win_by": None, "msg": "Match tied"}
+            return
+
+        # Test: first innings each, then the second innings unless someone wins by an innings
+        a1 = self._new_innings(first, 1)
+        self._bat(a1)
+        b1 = self._new_innings(second, 1)
+        if self.outcome == "drawn":
+            self._bat(b1, exact=a1.runs)
+        else:
+            self._bat(b1)
+        a2 = self._new_innings(first, 2)
+        self._bat(a2, declare=b1.runs - a1.runs + rng.randint(250, 400))
+        lead = a1.runs + a2.runs - b1.runs
+        if lead < 0:
+            self._won(second, f"an innings and {-lead} runs")
+            return
+        b2 = self._new_innings(second, 2)
+        if self.outcome == "drawn":
+            # bat out the clock: the chase stalls short of the target
+            played = sum(i.legal for i in self.innings)
+            self._bat(b2, legal=max(6, 5 * BALLS_PER_DAY - played), exact=max(0, lead - 1))
+            self.result = {"winner": None, "result_type": "draw", "win_by": None, "msg": "Match drawn"}
+            return
+        self._bat(b2, target=lead + 1)
+        if b2.runs > lead:
+            self._won(second, f"{10 - b2.wickets} wickets")
+        elif b2.runs == lead:
+            self.result = {"winner": None, "result_type": "draw", "win_by": None, "msg": "Match tied"}
+        else:
+            self._won(first, f"{lead - b2.runs} runs")
+
+    def _super_over(self):
+        # the side batting second in the match bats first in the super over
+        first, second = self.second, self.first
+        a = self._new_innings(first, "superover")
+        self._bat(a, 6, max_wickets=2)
+        b = self._new_innings(second, "superover")
+        self._bat(b, 6, max_wickets=2, target=a.runs + 1)
+        if b.runs > a.runs:
+            winner = second
+        elif a.runs > b.runs:
+            winner = first
+        else:
+            boundaries = {side: sum(1 for i in self.innings if i.batting == side for ball in i.balls
+                                    if ball["batsman"]["is_four"] or ball["batsman"]["is_six"]) for side in "ab"}
+            winner = "a" if boundaries["a"] >= boundaries["b"] else "b"
+        self.result = {"winner": winner, "result_type": "tie_breaker", "win_by": "super_over",
+                       "msg": f"{self.teams[winner]['name']} won the super over"}
+
+    def _won(self, side, margin):
+        self.result = {"winner": side, "result_type": "win", "win_by": margin,
+                       "msg": f"{self.teams[side]['name']} won by {margin}"}
+
+    def deliveries(self):
+        return [ball for innings in self.innings for ball in innings.balls]
+
+    # ------------------------
+    # RENDERING
+    # ------------------------
+
+    def render(self, upto=None):
+        """Fixture documents for the match after its first `upto` deliveries (all by default)."""
+        if upto is None:
+            upto = self.cut
+        return _render(self, upto)
+
+
+def _comment(players, bowler, striker, ball_type, bat_runs, extra_runs, wicket):
+    line = f"{players[bowler]['name']} to {players[striker]['name']}, "
+    if wicket:
+        return line + f"OUT, {wicket['wicket_type'].replace('_', ' ')}"
+    if ball_type == "wide":
+        return line + "wide"
+    if ball_type in ("bye", "leg_bye"):
+        return line + f"{extra_runs} {ball_type.replace('_', ' ')}"
+    if bat_runs == 0:
+        return line + "no run"
+    return line + (f"{bat_runs} run" if bat_runs == 1 else f"{bat_runs} runs")
+
+
+def _repr(ball_type, bat_runs, extra_runs, wicket):
+    if wicket:
+        return "w"
+    if ball_type == "wide":
+        return f"{extra_runs}wd"
+    if ball_type == "no_ball":
+        return f"{bat_runs + extra_runs}nb"
+    if ball_type == "bye":
+        return f"{extra_runs}b"
+    if ball_type == "leg_bye":
+        return f"{extra_runs}lb"
+    return f"b{bat_runs}"
+
+
+# ------------------------
+# AGGREGATES
+# ------------------------
+
+def _rate(runs, balls, per=100):
+    return round(runs * per / balls, 2) if balls else 0
+
+
+def _overs(balls):
+    return list(divmod(balls, 6))
+
+
+def _batting():
+    return {"runs": 0, "balls": 0, "fours": 0, "sixes": 0, "dot_balls": 0, "strike_rate": 0,
+            "ones": 0, "twos": 0, "threes": 0, "fives": 0}
+
+
+def _bowling():
+    return {"balls": 0, "runs": 0, "economy": 0, "wickets": 0, "extras": 0, "maiden_overs": 0, "overs": [0, 0],
+            "balls_breakup": {"dot_balls": 0, "wides": 0, "no_balls": 0, "fours": 0, "sixes": 0},
+            "wickets_breakup": {"bowled": 0, "caught": 0, "lbw": 0, "stumping": 0}}
+
+
+def _batting_stats(score):
+    boundaries = score["fours"] + score["sixes"]
+    return {
+        "boundary_percentage": _rate(boundaries, score["balls"]),
+        "boundary_frequency": round(score["balls"] / boundaries, 2) if boundaries else 0,
+        "dot_ball_percentage": _rate(score["dot_balls"], score["balls"]),
+        "dot_ball_frequency": round(score["balls"] / score["dot_balls"], 2) if score["dot_balls"] else 0,
+    }
+
+
+def _bowling_stats(score):
+    return {
+        "economy": score["economy"],
+        "strike_rate": round(score["balls"] / score["wickets"], 2) if score["wickets"] else 0,
+        "dot_ball_percentage": _rate(score["balls_breakup"]["dot_balls"], score["balls"]),
+    }
+
+
+class _Tally:
+    """Running totals of one innings, updated delivery by delivery."""
+
+    def __init__(self, key):
+        self.key = key
+        self.runs = self.wickets = self.legal = 0
+        self.fours = self.sixes = self.dot_balls = 0
+        self.extras = {"extra": 0, "bye": 0, "leg_bye": 0, "wide": 0, "no_ball": 0, "penalty": 0}
+        self.wides = self.no_balls = 0
+        self.batting = {}
+        self.bowling = {}
+        self.fielding = {}
+        self.dismissals = {}
+        self.batting_order = []
+        self.bowling_order = []
+        self.wicket_order = []
+        self.partnerships = []
+        self.overs = []  # one dict per over: number, balls, runs, wickets, extras breakdown, bowler runs
+
+    def _partnership(self, pair, ball):
+        current = self.partnerships[-1] if self.partnerships else None
+        if current is None or current["is_completed"]:
+            a, b = pair
+            current = {
+                "begin_overs": list(ball["overs"]),
+                "end_overs": list(ball["overs"]),
+                "player_a_key": a,
+                "player_a_score": {"runs": 0, "balls": 0, "fours": 0, "sixes": 0},
+                "player_b_key": b,
+                "player_b_score": {"runs": 0, "balls": 0, "fours": 0, "sixes": 0},
+                "score": {"runs": 0, "balls": 0, "fours": 0, "sixes": 0, "run_rate": 0},
+                "is_completed": False,
+            }
+            self.partnerships.append(current)
+        return current
+
+    def add(self, ball):
+        batsman, bowler, team = ball["batsman"], ball["bowler"], ball["team_score"]
+        striker, non_striker = batsman["player_key"], ball["non_striker_key"]
+        for player in (striker, non_striker):
+            if player not in self.batting:
+                self.batting[player] = _batting()
+                self.batting_order.append(player)
+        if bowler["player_key"] not in self.bowling:
+            self.bowling[bowler["player_key"]] = _bowling()
+            self.bowling_order.append(bowler["player_key"])
+
+        over_index = ball["overs"][0]
+        if not self.overs or self.overs[-1]["number"] != over_index + 1:
+            self.overs.append({"number": over_index + 1, "balls": [], "runs": 0, "wickets": 0, "fours": 0,
+                               "sixes": 0, "extras": 0, "wides": 0, "no_balls": 0, "byes": 0, "leg_byes": 0,
+                               "bowler_runs": 0})
+        over = self.overs[-1]
+        over["balls"].append(ball)
+
+        ball_type = ball["ball_type"]
+        runs = team["runs"]
+        self.runs += runs
+        self.legal += team["ball_count"]
+        over["runs"] += runs
+        over["bowler_runs"] += bowler["runs"]
+        over["extras"] += team["extras"]
+        if ball_type == "wide":
+            self.extras["wide"] += team["extras"]
+            self.wides += 1
+            over["wides"] += 1
+        elif ball_type == "no_ball":
+            self.extras["no_ball"] += team["extras"]
+            self.no_balls += 1
+            over["no_balls"] += 1
+        elif ball_type == "bye":
+            self.extras["bye"] += team["extras"]
+            over["byes"] += team["extras"]
+        elif ball_type == "leg_bye":
+            self.extras["leg_bye"] += team["extras"]
+            over["leg_byes"] += team["extras"]
+        self.extras["extra"] += team["extras"]
+        if batsman["is_dot_ball"]:
+            self.dot_balls += 1
+        if batsman["is_four"]:
+            self.fours += 1
+            over["fours"] += 1
+        if batsman["is_six"]:
+            self.sixes += 1
+            over["sixes"] += 1
+
+        score = self.batting[striker]
+        score["balls"] += batsman["ball_count"]
+        score["runs"] += batsman["runs"]
+        score["fours"] += batsman["is_four"]
+        score["sixes"] += batsman["is_six"]
+        if batsman["ball_count"] and batsman["runs"] == 0:
+            score["dot_balls"] += 1
+        name = {1: "ones", 2: "twos", 3: "threes", 5: "fives"}.get(batsman["runs"])
+        if name:
+            score[name] += 1
+        score["strike_rate"] = _rate(score["runs"], score["balls"])
+
+        figures = self.bowling[bowler["player_key"]]
+        figures["balls"] += bowler["ball_count"]
+        figures["runs"] += bowler["runs"]
+        figures["extras"] += bowler["extras"]
+        figures["overs"] = _overs(figures["balls"])
+        figures["economy"] = _rate(figures["runs"], figures["balls"], per=6)
+        breakup = figures["balls_breakup"]
+        breakup["dot_balls"] += batsman["is_dot_ball"]
+        breakup["wides"] += ball_type == "wide"
+        breakup["no_balls"] += ball_type == "no_ball"
+        breakup["fours"] += batsman["is_four"]
+        breakup["sixes"] += batsman["is_six"]
+
+        pair = (striker, non_striker) if not self.partnerships or self.partnerships[-1]["is_completed"] else None
+        partnership = self._partnership(pair or (striker, non_striker), ball)
+        side = "player_a_score" if partnership["player_a_key"] == striker else "player_b_score"
+        partnership[side]["runs"] += batsman["runs"]
+        partnership[side]["balls"] += batsman["ball_count"]
+        partnership[side]["fours"] += batsman["is_four"]
+        partnership[side]["sixes"] += batsman["is_six"]
+        total = partnership["score"]
+        total["runs"] += runs
+        total["balls"] += team["ball_count"]
+        total["fours"] += batsman["is_four"]
+        total["sixes"] += batsman["is_six"]
+        total["run_rate"] = _rate(total["runs"], total["balls"], per=6)
+        partnership["end_overs"] = list(ball["overs"])
+
+        if team["is_wicket"]:
+            wicket = ball["wicket"]
+            self.wickets += 1
+            over["wickets"] += 1
+            partnership["is_completed"] = True
+            self.wicket_order.append(wicket["player_key"])
+            self.dismissals[wicket["player_key"]] = {
+                "overs": list(ball["overs"]),
+                "team_runs": self.runs,
+                "wicket_number": self.wickets,
+                "msg": ball["comment"],
+                "ball_key": ball["key"],
+            }
+            if bowler["is_wicket"]:
+                figures["wickets"] += 1
+                kind = wicket["wicket_type"]
+                if kind in figures["wickets_breakup"]:
+                    figures["wickets_breakup"][kind] += 1
+            for fielder in ball["fielders"]:
+                record = self.fielding.setdefault(fielder["player_key"], {"catches": 0, "stumpings": 0, "runouts": 0})
+                record["catches"] += fielder["is_catch"]
+                record["stumpings"] += fielder["is_stumps"]
+                record["runouts"] += fielder["is_run_out"]
+
+    def close_over(self):
+        # called once an over is complete: credit maidens
+        over = self.overs[-1]
+        bowler = over["balls"][0]["bowler"]["player_key"]
+        legal = sum(b["bowler"]["ball_count"] for b in over["balls"])
+        if legal == 6 and over["bowler_runs"] == 0:
+            self.bowling[bowler]["maiden_overs"] += 1
+
+    def title(self):
+        return f"{self.runs}/{self.wickets} in {self.legal // 6}.{self.legal % 6}"
+
+    def innings_doc(self, completed):
+        return {
+            "index": self.key,
+            "overs": _overs(self.legal),
+            "is_completed": completed,
+            "score_str": self.title(),
+            "score": {"runs": self.runs, "balls": self.legal, "fours": self.fours, "sixes": self.sixes,
+                      "dot_balls": self.dot_balls, "run_rate": _rate(self.runs, self.legal, per=6)},
+            "score_breakup_detail": {},
+            "wickets": self.wickets,
+            "extra_runs": dict(self.extras),
+            "balls_breakup": {"balls": self.legal, "dot_balls": self.dot_balls, "wides": self.wides,
+                              "no_balls": self.no_balls},
+            "batting_order": list(self.batting_order),
+            "bowling_order": list(self.bowling_order),
+            "wicket_order": list(self.wicket_order),
+            "partnerships": [json.loads(json.dumps(p)) for p in self.partnerships],
+        }
+
+
+# ------------------------
+# DOCUMENTS
+# ------------------------
+
+def _index(innings, over_number):
+    return {"innings": innings, "over_number": over_number}
+
+
+def _render(match, upto):
+    key = match.key
+    base = f"match/{key}/"
+    deliveries = match.deliveries()
+    if upto is None:
+        upto = len(deliveries)
+    live = upto < len(deliveries)
+
+    # walk the deliveries once, collecting per-innings tallies and per-over snapshots
+    tallies = []
+    summaries = {}
+    overs = []  # (innings key, over number, balls)
+    seen = 0
+    for innings in match.innings:
+        if seen >= upto:
+            break
+        tally = _Tally(innings.key)
+        tallies.append(tally)
+        summaries[innings.key] = []
+        for ball in innings.balls:
+            if seen >= upto:
+                break
+            seen += 1
+            tally.add(ball)
+            over_done = ball is innings.balls[-1] or (ball["overs"][1] == 6 and ball["team_score"]["ball_count"])
+            if over_done:
+                tally.close_over()
+            if over_done or seen == upto:
+                over = tally.overs[-1]
+                overs.append((innings.key, over["number"], list(over["balls"])))
+                summaries[innings.key].append(_over_summary(match, tally, over, tallies))
+
+    docs = {}
+    innings_done = {}
+    for tally, innings in zip(tallies, match.innings):
+        innings_done[tally.key] = len(tally.overs) and tally.overs[-1]["balls"][-1] is innings.balls[-1]
+
+    docs[base] = _match_doc(match, tallies, overs, innings_done, live, upto)
+    docs.update(_ball_by_ball_docs(base, overs))
+    docs.update(_over_summary_docs(base, summaries))
+    if tallies:
+        for name, doc in _graph_docs(match, tallies).items():
+            docs[f"{base}{name}/"] = doc
+    status = docs[base]["status"]
+    if status == "started":
+        docs[f"{base}live-match-odds/"] = _odds(match, tallies)
+    elif status == "not_started":
+        docs[f"{base}pre-match-odds/"] = _odds(match, tallies)
+    return docs
+
+
+def _over_summary(match, tally, over, tallies):
+    strikers = []
+    for player in dict.fromkeys(b["batsman"]["player_key"] for b in over["balls"]):
+        score = dict(tally.batting[player])
+        score["stats"] = _batting_stats(score)
+        strikers.append({"player_key": player, "score": score, "is_dismissed": player in tally.dismissals})
+    bowlers = []
+    for player in dict.fromkeys(b["bowler"]["player_key"] for b in over["balls"]):
+        score = json.loads(json.dumps(tally.bowling[player]))
+        score["stats"] = _bowling_stats(score)
+        bowlers.append({"player_key": player, "score": score})
+
+    required = _required(match, tally, tallies)
+    return {
+        "index": _index(tally.key, over["number"]),
+        "runs": over["runs"],
+        "wickets": over["wickets"],
+        "strikers": strikers,
+        "bowlers": bowlers,
+        "match_score": {
+            "runs": tally.runs,
+            "wickets": tally.wickets,
+            "run_rate": _rate(tally.runs, tally.legal, per=6),
+            "title": tally.title(),
+            "req_runs": required["runs"] if required else None,
+            "req_balls": required["balls"] if required else None,
+            "req_run_rate": required["run_rate"] if required else None,
+        },
+        "sixes": over["sixes"],
+        "fours": over["fours"],
+        "extras": over["extras"],
+        "wides": over["wides"],
+        "no_balls": over["no_balls"],
+        "leg_byes": over["leg_byes"],
+        "byes": over["byes"],
+    }
+
+
+def _target(match, tallies, tally):
+    # runs needed to win for the side batting last, None when nobody is chasing
+    position = tallies.index(tally)
+    if match.format != "test":
+        if tally.key.endswith("_1") and position == 1:
+            return tallies[0].runs + 1, match.max_balls
+        if tally.key.endswith("superover") and position == 3:
+            return tallies[2].runs + 1, 6
+        return None
+    if position == 3:
+        batting = sum(t.runs for t in tallies[:3] if t.key[0] == tally.key[0])
+        bowling = sum(t.runs for t in tallies[:3] if t.key[0] != tally.key[0])
+        return bowling - batting + 1, None
+    return None
+
+
+def _required(match, tally, tallies):
+    target = _target(match, tallies, tally)
+    if target is None:
+        return None
+    runs, balls = target
+    need = max(0, runs - tally.runs)
+    left = balls - tally.legal if balls else None
+    return {
+        "runs": need,
+        "balls": left,
+        "run_rate": _rate(need, left, per=6) if left else None,
+        "title": f"Need {need} runs" + (f" in {left} balls" if left is not None else ""),
+    }
+
+
+def _match_doc(match, tallies, overs, innings_done, live, upto):
+    teams = match.teams
+    started = bool(tallies)
+    if match.outcome == "not_started":
+        status, play_status = "not_started", "scheduled"
+    elif live:
+        status, play_status = "started", "in_play"
+    else:
+        status = "completed"
+        play_status = "abandoned" if match.outcome == "abandoned" else "result"
+    result = match.result if status == "completed" else {"winner": None, "result_type": None, "win_by": None,
+                                                         "msg": ""}
+    pom = None
+    if result["winner"]:
+        # best batting performance of the winning side
+        runs = {}
+        for tally in tallies:
+            if tally.key[0] == result["winner"]:
+                for player, score in tally.batting.items():
+                    runs[player] = runs.get(player, 0) + score["runs"]
+        pom = max(runs, key=runs.get) if runs else None
+
+    players = {}
+    for side in "ab":
+        for player in match.squads[side]["player_keys"]:
+            players[player] = {"player": match.players[player], "score": {}}
+    for tally in tallies:
+        number = tally.key.split("_", 1)[1]
+        for player, score in tally.batting.items():
+            entry = players[player]["score"].setdefault(number, {"batting": None, "bowling": None, "fielding": None})
+            entry["batting"] = {"score": dict(score), "dismissal": tally.dismissals.get(player)}
+        for player, score in tally.bowling.items():
+            entry = players[player]["score"].setdefault(number, {"batting": None, "bowling": None, "fielding": None})
+            entry["bowling"] = {"score": json.loads(json.dumps(score))}
+        for player, record in tally.fielding.items():
+            entry = players[player]["score"].setdefault(number, {"batting": None, "bowling": None, "fielding": None})
+            entry["fielding"] = dict(record)
+
+    target = {"balls": None, "runs": None, "dl_applied": False}
+    chase = tallies[-1] if tallies else None
+    if chase is not None and _target(match, tallies, chase):
+        target["runs"], target["balls"] = _target(match, tallies, chase)
+
+    legal = sum(t.legal for t in tallies if not t.key.endswith("superover"))
+    name = f"{teams['a']['name']} vs {teams['b']['name']}"
+    short_name = f"{teams['a']['code']} vs {teams['b']['code']}"
+    return {
+        "key": match.key,
+        "name": name,
+        "short_name": short_name,
+        "sub_title": f"Synthetic {match.format} match",
+        "status": status,
+        "start_at": match.start_at,
+        "tournament": match.tournament,
+        "metric_group": "MG100",
+        "sport": "cricket",
+        "winner": result["winner"],
+        "teams": teams,
+        "venue": match.venue,
+        "association": match.association,
+        "messages": [],
+        "gender": "male",
+        "format": match.format,
+        "title": f"{short_name} - {match.tournament['short_name']}",
+        "play_status": play_status,
+        "toss": {
+            "called": match.toss["winner"] if started else None,
+            "winner": match.toss["winner"] if started else None,
+            "elected": match.toss["elected"] if started else None,
+            "squad_announced": started,
+        },
+        "play": {
+            "first_batting": match.first if started else None,
+            "day_number": min(5, legal // BALLS_PER_DAY + 1) if match.format == "test" else 1,
+            "overs_per_innings": [match.max_balls // 6] * 2 if match.max_balls else None,
+            "reduced_overs": None,
+            "target": target,
+            "result": {"pom": [pom] if pom else [], "winner": result["winner"], "result_type": result["result_type"],
+                       "win_by": result["win_by"], "msg": result["msg"]},
+            "innings_order": [t.key for t in tallies],
+            "innings": {t.key: t.innings_doc(bool(innings_done[t.key]) and not (live and t is tallies[-1]))
+                        for t in tallies},
+            "live": _live(match, tallies, overs, upto),
+            "related_balls": _related_balls(tallies, overs),
+        },
+        "players": players,
+        "notes": [],
+        "data_review": {"schedule": True, "venue": True, "result": status == "completed", "pom": bool(pom),
+                        "score": status == "completed", "players": True, "playing_xi": started,
+                        "score_reviewed_ball_index": None, "team_a": True, "team_b": True,
+                        "good_to_close": status == "completed", "note": None},
+        "squad": match.squads,
+    }
+
+
+def _recent(tallies, overs):
+    if not tallies:
+        return []
+    current = tallies[-1].key
+    return [over for over in overs if over[0] == current][-RECENT_OVERS:]
+
+
+def _related_balls(tallies, overs):
+    return {ball["key"]: ball for _, _, balls in _recent(tallies, overs) for ball in balls}
+
+
+def _player_card(match, tally, player, bowling=False):
+    if player is None:
+        return None
+    score = tally.bowling.get(player) if bowling else tally.batting.get(player)
+    stats = json.loads(json.dumps(score)) if score else (_bowling() if bowling else _batting())
+    return {"key": player, "name": match.players[player]["name"], "stats": stats}
+
+
+def _live(match, tallies, overs, upto):
+    empty = {"runs": 0, "balls": 0, "wickets": 0, "run_rate": 0, "title": "", "overs": [0, 0],
+             "msg_lead_by": None, "msg_trail_by": None}
+    if not tallies:
+        return {"innings": None, "batting_team": None, "bowling_team": None, "last_ball_key": None,
+                "striker_key": None, "non_striker_key": None, "bowler_key": None, "match_break": None,
+                "score": empty, "required_score": None, "recent_overs": [], "recent_overs_repr": [],
+                "recent_players": {"striker": None, "non_striker": None, "bowler": None, "prev_over_bowler": None},
+                "session": None, "remaining_day_overs": None}
+
+    tally = tallies[-1]
+    deliveries = match.deliveries()
+    last = deliveries[upto - 1]
+    following = deliveries[upto] if upto < len(deliveries) else None
+    if following is not None and following["innings"] == tally.key:
+        striker, non_striker = following["batsman"]["player_key"], following["non_striker_key"]
+    else:
+        striker, non_striker = last["batsman"]["player_key"], last["non_striker_key"]
+    bowler = last["bowler"]["player_key"]
+    bowlers = [o[2][0]["bowler"]["player_key"] for o in overs if o[0] == tally.key]
+    previous_bowler = bowlers[-2] if len(bowlers) > 1 else None
+
+    batting_total = sum(t.runs for t in tallies if t.key[0] == tally.key[0] and not t.key.endswith("superover"))
+    bowling_total = sum(t.runs for t in tallies if t.key[0] != tally.key[0] and not t.key.endswith("superover"))
+    batting_name = match.teams[tally.key[0]]["name"]
+    lead = batting_total - bowling_total
+    recent = _recent(tallies, overs)
+    legal = sum(t.legal for t in tallies if not t.key.endswith("superover"))
+    return {
+        "innings": tally.key,
+        "batting_team": tally.key[0],
+        "bowling_team": "b" if tally.key[0] == "a" else "a",
+        "last_ball_key": last["key"],
+        "striker_key": striker,
+        "non_striker_key": non_striker,
+        "bowler_key": bowler,
+        "match_break": None,
+        "score": {
+            "runs": tally.runs,
+            "balls": tally.legal,
+            "wickets": tally.wickets,
+            "run_rate": _rate(tally.runs, tally.legal, per=6),
+            "title": tally.title(),
+            "overs": _overs(tally.legal),
+            "msg_lead_by": f"{batting_name} lead by {lead} runs" if lead > 0 else None,
+            "msg_trail_by": f"{batting_name} trail by {-lead} runs" if lead < 0 else None,
+        },
+        "required_score": _required(match, tally, tallies),
+        "recent_overs": [{"overnumber": number, "over_key": f"{innings}_{number}",
+                          "ball_keys": [b["key"] for b in balls]} for innings, number, balls in recent],
+        "recent_overs_repr": [{"overnumber": number, "ball_repr": [b["repr"] for b in balls]}
+                              for _, number, balls in recent],
+        "recent_players": {
+            "striker": _player_card(match, tally, striker),
+            "non_striker": _player_card(match, tally, non_striker),
+            "bowler": _player_card(match, tally, bowler, bowling=True),
+            "prev_over_bowler": _player_card(match, tally, previous_bowler, bowling=True),
+        },
+        "session": f"day {legal // BALLS_PER_DAY + 1}" if match.format == "test" else None,
+        "remaining_day_overs": (BALLS_PER_DAY - legal % BALLS_PER_DAY) // 6 if match.format == "test" else None,
+    }
+
+
+def _ball_by_ball_docs(base, overs):
+    docs = {}
+    for position, (innings, number, balls) in enumerate(overs):
+        previous = overs[position - 1] if position else None
+        following = overs[position + 1] if position + 1 < len(overs) else None
+        doc = {
+            "over": {"index": _index(innings, number), "balls": balls},
+            "previous_over_index": _index(previous[0], previous[1]) if previous else None,
+            "next_over_index": _index(following[0], following[1]) if following else None,
+            "previous_over_key": f"{previous[0]}_{previous[1]}" if previous else None,
+            "next_over_key": f"{following[0]}_{following[1]}" if following else None,
+        }
+        docs[f"{base}ball-by-ball/{innings}_{number}/"] = doc
+        if position == 0:
+            docs[f"{base}ball-by-ball/FIRST-OVER/"] = doc
+        if following is None:
+            docs[f"{base}ball-by-ball/"] = doc
+    return docs
+
+
+def _over_summary_docs(base, summaries):
+    # pages never span innings, so "<innings>_1" always opens an innings
+    pages = []
+    for innings, items in summaries.items():
+        for start in range(0, len(items), OVERS_PER_PAGE):
+            pages.append(items[start:start + OVERS_PER_PAGE])
+    docs = {}
+    for position, page in enumerate(pages):
+        previous = pages[position - 1][0]["index"] if position else None
+        following = pages[position + 1][0]["index"] if position + 1 < len(pages) else None
+        doc = {
+            "summaries": page,
+            "previous_page_index": previous,
+            "next_page_index": following,
+            "previous_page_key": f"{previous['innings']}_{previous['over_number']}" if previous else None,
+            "next_page_key": f"{following['innings']}_{following['over_number']}" if following else None,
+        }
+        first = page[0]["index"]
+        docs[f"{base}over-summary/{first['innings']}_{first['over_number']}/"] = doc
+        if following is None:
+            docs[f"{base}over-summary/"] = doc
+    return docs
+
+
+def _graph_docs(match, tallies):
+    teams = match.teams
+    regular = [t for t in tallies if not t.key.endswith("superover")]
+    runs = [[over["runs"] for over in t.overs] for t in regular]
+    wickets = [[over["wickets"] for over in t.overs] for t in regular]
+    while len(runs) < 2:
+        runs.append([])
+        wickets.append([])
+    worm = []
+    rate = []
+    for series, tally in zip(runs, regular + [None] * (len(runs) - len(regular))):
+        total, cumulative, rates = 0, [], []
+        for number, value in enumerate(series, 1):
+            total += value
+            cumulative.append(total)
+            balls = min(number * 6, tally.legal) if tally else number * 6
+            rates.append(_rate(total, balls, per=6))
+        worm.append(cumulative)
+        rate.append(rates)
+
+    first = match.first
+    common = {
+        "first_bat_team": {k: teams[first][k] for k in ("key", "code", "name")},
+        "first_bowl_team": {k: teams[match.second][k] for k in ("key", "code", "name")},
+        "x": list(range(1, max(len(s) for s in runs) + 1)),
+        "y2_wickets": wickets,
+        "x_axis_label": "Overs",
+        "data_label": [f"{teams[t.key[0]]['code']} {t.key.split('_', 1)[1]}" for t in regular],
+        "y_colors": ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"][:len(runs)],
+    }
+    return {
+        "worm": dict(common, y=worm, y_axis_label="Runs", chart_type="line"),
+        "manhattan": dict(common, y=runs, y_axis_label="Runs", chart_type="bar"),
+        "run-rate": dict(common, y=rate, y_axis_label="Run rate", chart_type="line"),
+    }
+
+
+def _odds(match, tallies):
+    rng = random.Random(f"{match.key}:odds:{sum(t.runs for t in tallies)}")
+    share = rng.uniform(0.25, 0.75)
+    decimal, fractional, percentage = [], [], []
+    for side, chance in (("a", share), ("b", 1 - share)):
+        value = round(1 / chance, 2)
+        decimal.append({"team_key": side, "value": value})
+        fractional.append({"team_key": side, "numerator": int(round((value - 1) * 100)), "denominator": 100})
+        percentage.append({"team_key": side, "value": round(chance * 100, 1)})
+    status = "started" if tallies else "not_started"
+    return {
+        "match": {
+            "bet_odds": {"automatic": {"decimal": decimal, "fractional": fractional}},
+            "result_prediction": {"automatic": {"percentage": percentage}},
+            "teams": match.teams,
+            "meta": {"key": match.key, "status": status, "format": match.format, "start_at": match.start_at},
+        }
+    }
+
+
+# ------------------------
+# BULK GENERATION
+# ------------------------
+
+def generate(count, seed=0, formats=tuple(FORMATS), outcomes=OUTCOMES, prefix="synthetic"):
+    """Yield (match_key, documents) for `count` matches, cycling through formats and outcomes."""
+    rng = random.Random(seed)
+    combos = [(f, o) for f in formats for o in outcomes if not (f == "test" and o == "super_over")]
+    for number in range(count):
+        match_format, outcome = combos[number % len(combos)]
+        key = f"{prefix}--cricket--{seed}-{number:06d}"
+        match = SyntheticMatch(key, match_format, outcome, seed=rng.getrandbits(64), prefix=prefix)
+        yield key, match.render()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic match fixtures for the stand-in API")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", action="append", choices=sorted(FORMATS), help="formats to cycle through")
+    parser.add_argument("--outcome", action="append", choices=OUTCOMES, help="outcomes to cycle through")
+    parser.add_argument("--prefix", default="synthetic", help="key prefix of generated matches")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "fixtures", "synthetic"),
+                        help="directory to write one fixture file per match into")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    documents = deliveries = 0
+    for key, docs in generate(args.count, args.seed, args.format or tuple(FORMATS), args.outcome or OUTCOMES,
+                              args.prefix):
+        with open(os.path.join(args.out, f"{key}.json"), "w") as f:
+            json.dump(docs, f)
+        documents += len(docs)
+        deliveries += sum(len(doc["over"]["balls"]) for path, doc in docs.items()
+                          if "/ball-by-ball/" in path and not path.endswith(("/FIRST-OVER/", "/ball-by-ball/")))
+    print(f"Wrote {args.count} matches ({documents} documents, {deliveries} deliveries) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
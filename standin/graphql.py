@@ -0,0 +1,359 @@
+import re
+from functools import lru_cache
+
+# GraphQL endpoint of the stand-in API
+# Executes the operations stored under data/ against the same FixtureStore the
+# REST routes use. Only the subset of GraphQL those queries need is supported:
+# named or anonymous operations (picked by operationName), aliases, arguments
+# (variables, literals, lists, objects) and nested selection sets; no fragments
+# or directives.
+# Parsed documents are cached by query text, so repeated operations only pay
+# for resolving and projecting the data.
+#
+# REST payloads are reshaped while projecting: when a selection only asks for
+# `key` and `value`, a REST dict such as teams {"a": ..., "b": ...} is returned
+# as the GraphQL list [{"key": "a", "value": ...}, ...].
+
+TOKEN = re.compile(r'\s+|#[^\n]*|,|(\.\.\.|[{}()\[\]:!$=@|])|("(?:\\.|[^"\\])*")|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|([_A-Za-z][_0-9A-Za-z]*)')
+KEY_VALUE = {"key", "value", "__typename"}
+
+
+class GraphQLError(Exception):
+    pass
+
+
+class Field:
+    __slots__ = ("name", "alias", "args", "selections")
+
+    def __init__(self, name, alias, args, selections):
+        self.name = name
+        self.alias = alias or name
+        self.args = args
+        self.selections = selections
+
+
+class Variable:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+# ------------------------
+# PARSER
+# ------------------------
+
+def _tokenize(query):
+    tokens = []
+    pos = 0
+    while pos < len(query):
+        match = TOKEN.match(query, pos)
+        if match is None:
+            raise GraphQLError(f"Unexpected character {query[pos]!r} at {pos}")
+        pos = match.end()
+        punct, string, number, name = match.groups()
+        if punct:
+            tokens.append(("punct", punct))
+        elif string:
+            tokens.append(("string", string[1:-1].encode().decode("unicode_escape")))
+        elif number:
+            tokens.append(("number", float(number) if "." in number or "e" in number.lower() else int(number)))
+        elif name:
+            tokens.append(("name", name))
+    return tokens
+
+
+class _Parser:
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or (value is not None and token[1] != value):
+            raise GraphQLError(f"Expected {value!r}, got {token[1]!r}")
+        self.pos += 1
+        return token
+
+    def skip_balanced(self, opening, closing):
+        depth = 0
+        while True:
+            _, value = self.take()
+            if value == opening:
+                depth += 1
+            elif value == closing:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def document(self):
+        operations = {}
+        while self.peek()[0] is not None:
+            name, fields = self.operation()
+            operations[name] = fields
+        return operations
+
+    def operation(self):
+        name = None
+        kind, value = self.peek()
+        if kind == "name" and value in ("query", "mutation", "subscription"):
+            self.take()
+            if self.peek()[0] == "name":
+                name = self.take()[1]
+            if self.peek()[1] == "(":
+                self.skip_balanced("(", ")")
+        return name, self.selection_set()
+
+    def selection_set(self):
+        self.take("{")
+        fields = []
+        while self.peek()[1] != "}":
+            if self.peek()[1] == "...":
+                raise GraphQLError("Fragments are not supported by the stand-in")
+            fields.append(self.field())
+        self.take("}")
+        return fields
+
+    def field(self):
+        _, name = self.take()
+        alias = None
+        if self.peek()[1] == ":":
+            self.take(":")
+            alias, (_, name) = name, self.take()
+        args = {}
+        if self.peek()[1] == "(":
+            self.take("(")
+            while self.peek()[1] != ")":
+                _, arg = self.take()
+                self.take(":")
+                args[arg] = self.value()
+            self.take(")")
+        selections = self.selection_set() if self.peek()[1] == "{" else None
+        return Field(name, alias, args, selections)
+
+    def value(self):
+        kind, value = self.take()
+        if value == "$":
+            return Variable(self.take()[1])
+        if value == "[":
+            items = []
+            while self.peek()[1] != "]":
+                items.append(self.value())
+            self.take("]")
+            return items
+        if value == "{" and kind == "punct":
+            obj = {}
+            while self.peek()[1] != "}":
+                _, key = self.take()
+                self.take(":")
+                obj[key] = self.value()
+            self.take("}")
+            return obj
+        if kind == "name":
+            return {"true": True, "false": False, "null": None}.get(value, value)
+        return value
+
+
+@lru_cache(maxsize=256)
+def parse(query):
+    return _Parser(_tokenize(query)).document()
+
+
+def _resolve_args(value, variables):
+    if isinstance(value, Variable):
+        return variables.get(value.name)
+    if isinstance(value, list):
+        return [_resolve_args(item, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: _resolve_args(item, variables) for key, item in value.items()}
+    return value
+
+
+# ------------------------
+# EXECUTION
+# ------------------------
+
+def _typename(name):
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_"))
+
+
+def project(value, selections, typename):
+    if value is None or selections is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, selections, typename) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    result = {}
+    for field in selections:
+        if field.name == "__typename":
+            result[field.alias] = typename
+            continue
+        child = value.get(field.name)
+        if (isinstance(child, dict) and field.selections
+                and {f.name for f in field.selections} <= KEY_VALUE
+                and any(f.name == "value" for f in field.selections)):
+            child = [{"key": key, "value": item} for key, item in child.items()]
+        result[field.alias] = project(child, field.selections, _typename(field.name))
+    return result
+
+
+def execute(store, query, variables=None, operation_name=None):
+    try:
+        operations = parse(query)
+        if operation_name in operations:
+            fields = operations[operation_name]
+        elif len(operations) == 1:
+            fields = next(iter(operations.values()))
+        else:
+            raise GraphQLError(f"Unknown operation {operation_name!r}")
+    except GraphQLError as exc:
+        return {"data": None, "errors": [{"message": str(exc)}]}
+
+    variables = variables or {}
+    data, errors = {}, []
+    for field in fields:
+        resolver = RESOLVERS.get(field.name)
+        if resolver is None:
+            errors.append({"message": f"Cannot query field '{field.name}' on type 'Query'", "path": [field.alias]})
+            data[field.alias] = None
+            continue
+        try:
+            value = resolver(store, _resolve_args(field.args, variables))
+        except LookupError as exc:
+            errors.append({"message": str(exc), "path": [field.alias]})
+            data[field.alias] = None
+            continue
+        data[field.alias] = project(value, field.selections, _typename(field.name))
+
+    response = {"data": data}
+    if errors:
+        response["errors"] = errors
+    return response
+
+
+# ------------------------
+# RESOLVERS
+# ------------------------
+
+def _doc(store, path):
+    data = store.get(path)
+    if data is None:
+        raise LookupError(f"Requested resource not found: {path}")
+    return data
+
+
+def rest(template):
+    # resolver that serves the REST payload at `template` formatted with the arguments
+    def resolver(store, args):
+        return _doc(store, template.format(**args))
+    return resolver
+
+
+def _page_path(base, key_arg):
+    def resolver(store, args):
+        page = args.get(key_arg)
+        key = args.get("match_key")
+        return _doc(store, f"match/{key}/{base}/{page}/" if page else f"match/{key}/{base}/")
+    return resolver
+
+
+def _featured_tournaments(store, args):
+    if args.get("association_key"):
+        return _doc(store, f"association/{args['association_key']}/featured-tournaments/")
+    return _doc(store, "featured-tournaments/")
+
+
+def _featured_matches(store, args):
+    if args.get("tournament_key"):
+        return _doc(store, f"tournament/{args['tournament_key']}/featured-matches-2/")
+    return _doc(store, "featured-matches-2/")
+
+
+def _resource(key):
+    return {"account": None, "key": key, "_hashkey": key}
+
+
+def _association_read(store, args):
+    key = (args.get("resource") or {}).get("_hashkey")
+    associations = _doc(store, "association/list/").get("associations") or []
+    association = next((a for a in associations if a.get("key") == key), None)
+    if association is None:
+        raise LookupError(f"Association {key} not found")
+    parent = association.get("parent")
+    parent_key = parent.get("key") if isinstance(parent, dict) else parent
+    country = association.get("country") or {}
+    return {
+        "item": {
+            "resource": _resource(key),
+            "association": {
+                "code": association.get("code"),
+                "name": association.get("name"),
+                "region": {"_hashkey": country.get("code")} if country.get("code") else None,
+                "parent": {"_hashkey": parent_key} if parent_key else None,
+            },
+        },
+        "history": None,
+    }
+
+
+def _region_read(store, args):
+    key = (args.get("resource") or {}).get("_hashkey")
+    countries = _doc(store, "country/list/").get("countries") or []
+    # region hashkeys end with the lowercase country code, e.g. "...--can-OxoY"
+    country = next((c for c in countries if f"--{str(c.get('code', '')).lower()}-" in (key or "")), None)
+    if country is None:
+        raise LookupError(f"Region {key} not found")
+    return {
+        "item": {
+            "resource": _resource(key),
+            "region": {**country, "kind": "country", "country": country.get("code"), "state": None,
+                       "internal_name": country.get("name")},
+            "status": {"published": True, "notes": None},
+        },
+        "history": None,
+    }
+
+
+def _stadium_search(store, args):
+    venues = (store.get("venue/list/1/") or store.get("venue/list/") or {}).get("venues") or []
+    search = (args.get("search") or "").lower()
+    items = []
+    for venue in venues:
+        if search and search not in (venue.get("name") or "").lower():
+            continue
+        items.append({
+            "resource": _resource(venue.get("key")),
+            "stadium": {"name": venue.get("name"), "internal_name": venue.get("name"), "sport": "cricket",
+                        "multi_sports": False, "region": None},
+            "locale": {"timezone": None, "address": venue.get("city"), "geo_location": venue.get("geolocation")},
+        })
+    return {"items": items, "page": {"next_page_key": None, "count": len(items), "prev_page_key": None}}
+
+
+RESOLVERS = {
+    "cricket_match": rest("match/{match_key}/"),
+    "cricket_match_ball_by_ball": _page_path("ball-by-ball", "over_key"),
+    "cricket_match_over_summary": _page_path("over-summary", "page_key"),
+    "cricket_match_worm": rest("match/{match_key}/worm/"),
+    "cricket_match_manhattan": rest("match/{match_key}/manhattan/"),
+    "cricket_match_run_rate": rest("match/{match_key}/run-rate/"),
+    "cricket_match_live_match_odds": rest("match/{match_key}/live-match-odds/"),
+    "cricket_match_pre_match_odds": rest("match/{match_key}/pre-match-odds/"),
+    "cricket_news_aggregation": rest("news-aggregation/"),
+    "cricket_featured_tournaments": _featured_tournaments,
+    "cricket_featured_matches": _featured_matches,
+    "cricket_tournament_detail": rest("tournament/{tournament_key}/"),
+    "cricket_tournament_featured_matches": rest("tournament/{tournament_key}/featured-matches-2/"),
+    "cricket_tournament_fixtures": rest("tournament/{tournament_key}/fixtures/"),
+    "cricket_tournament_points": rest("tournament/{tournament_key}/points/"),
+    "cricket_tournament_team": rest("tournament/{tournament_key}/team/{team_key}/"),
+    "sports_association_read": _association_read,
+    "sports_region_read": _region_read,
+    "sports_stadium_search": _stadium_search,
+}
@@ -0,0 +1,228 @@
+import re
+import time
+from collections import namedtuple
+
+# REST routes of the stand-in API
+# Each route maps a path pattern below /v5/cricket/{project_key}/ to a handler.
+# Handlers return (status, body) where body is a dict (sent as JSON), an Image
+# (sent as is, with its content type) or a str (sent as text/plain). Resource payloads come from the fixture store; the
+# error envelopes mirror what the real API returns for the same situation.
+
+SCHEMA = {"major_version": "5.0", "minor_version": "5.0.0"}
+DEFAULT_MAX_AGE = 60
+
+INVALID_TOKEN_ERROR = {"code": "A-401-0", "http_status_code": 401, "msg": "Invalid access token to process"}
+NOT_FOUND_ERROR = {"code": "A-404-0", "http_status_code": 404, "msg": "Requested resource not found"}
+INVALID_INPUT_ERROR = {"code": "A-400-0", "http_status_code": 400, "msg": "Invalid input to process"}
+MATCH_COMPLETED_ERROR = {"code": "DNA-404-1", "http_status_code": 404, "msg": "Data not available, match completed"}
+ODDS_NOT_PREPARED_ERROR = {"code": "DNA-404-2", "http_status_code": 404, "msg": "Data not available, odds not prepared yet"}
+MATCH_STARTED_ERROR = {"code": "DNA-404-5", "http_status_code": 404, "msg": "Data not available, match has started"}
+THROTTLED_ERROR = {"code": "A-429-0", "http_status_code": 429, "msg": "Too many requests"}
+
+PLAIN_NOT_FOUND = "404: Not Found"
+PLAIN_METHOD_NOT_ALLOWED = "405: Method Not Allowed"
+PLAIN_SERVER_ERROR = "500 Internal Server Error\n\nServer got itself in trouble"
+PLAIN_BAD_GATEWAY = "502 Bad Gateway"
+PLAIN_UNAVAILABLE = "503 Service Unavailable"
+
+# flags are images, not envelopes; the stand-in draws a placeholder for every listed country
+Image = namedtuple("Image", "content content_type")
+FLAG_SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="60" height="40" viewBox="0 0 60 40">'
+            '<rect width="60" height="40" fill="#d9d9d9"/>'
+            '<text x="30" y="25" font-size="12" text-anchor="middle">{code}</text></svg>')
+
+# pre-match odds are only prepared for matches starting within this window
+PRE_MATCH_ODDS_WINDOW = 10 * 24 * 60 * 60
+
+
+def envelope(path, data, etag, max_age=None):
+    max_age = max_age or DEFAULT_MAX_AGE
+    return {
+        "data": data,
+        "cache": {"key": path, "expires": time.time() + max_age, "etag": etag, "max_age": max_age},
+        "schema": SCHEMA,
+        "error": None,
+        "http_status_code": 200,
+    }
+
+
+def error(err):
+    return err["http_status_code"], {
+        "data": None,
+        "cache": None,
+        "schema": SCHEMA,
+        "error": err,
+        "http_status_code": err["http_status_code"],
+    }
+
+
+def _serve(store, path):
+    data = store.get(path)
+    if data is None:
+        return error(NOT_FOUND_ERROR)
+    return 200, envelope(path, data, store.etag(path), store.max_age(path))
+
+
+def _match(store, match_key):
+    return store.get(f"match/{match_key}/")
+
+
+def _has_innings(match):
+    play = match.get("play") or {}
+    return bool(play.get("innings"))
+
+
+# ------------------------
+# HANDLERS
+# ------------------------
+
+def resource(store, path, **_):
+    return _serve(store, path)
+
+
+def paged(zero_status, negative_status):
+    # list endpoints: page 1 is the stored document, later pages are empty
+    def handler(store, path, page, base, **_):
+        page = int(page)
+        if page == 0:
+            return zero_status
+        if page < 0:
+            return negative_status
+        stored = store.get(path)
+        if stored is not None:
+            return 200, envelope(path, stored, store.etag(path))
+        first = store.get(base) or store.get(f"{base}1/")
+        if first is None:
+            return error(NOT_FOUND_ERROR)
+        data = {key: ([] if isinstance(value, list) else value) for key, value in first.items()}
+        data["previous_page_key"] = str(page - 1)
+        data["next_page_key"] = None
+        return 200, envelope(path, data, store.etag(base))
+    return handler
+
+
+def association_page(store, path, page, **_):
+    # association/list/<page>/ never errors; pages outside the list just have no neighbours
+    stored = store.get(path)
+    if stored is None:
+        stored = dict(store.get("association/list/") or {})
+        if not stored:
+            return error(NOT_FOUND_ERROR)
+        stored["previous_page_key"] = None
+        stored["next_page_key"] = None
+    return 200, envelope(path, stored, store.etag("association/list/"))
+
+
+def match_graph(not_started):
+    def handler(store, path, match_key, **_):
+        match = _match(store, match_key)
+        if match is None:
+            return error(NOT_FOUND_ERROR)
+        if match.get("status") == "not_started":
+            return not_started
+        if not _has_innings(match):
+            return 500, PLAIN_SERVER_ERROR
+        return _serve(store, path)
+    return handler
+
+
+def live_match_odds(store, path, match_key, **_):
+    match = _match(store, match_key)
+    if match is None:
+        return error(NOT_FOUND_ERROR)
+    if match.get("status") == "completed":
+        return error(MATCH_COMPLETED_ERROR)
+    if match.get("status") == "not_started":
+        return error(ODDS_NOT_PREPARED_ERROR)
+    return _serve(store, path)
+
+
+def pre_match_odds(store, path, match_key, **_):
+    match = _match(store, match_key)
+    if match is None:
+        return error(NOT_FOUND_ERROR)
+    if match.get("status") == "completed":
+        return error(MATCH_COMPLETED_ERROR)
+    if match.get("status") == "started":
+        return error(MATCH_STARTED_ERROR)
+    if (match.get("start_at") or 0) - time.time() > PRE_MATCH_ODDS_WINDOW:
+        return error(INVALID_INPUT_ERROR)
+    return _serve(store, path)
+
+
+def ball_by_ball(store, path, match_key, over_key=None, **_):
+    # FIRST-OVER is an alias of the first over, with or without a trailing over key
+    if over_key == "FIRST-OVER" or path.endswith("/FIRST-OVER/"):
+        path = f"match/{match_key}/ball-by-ball/FIRST-OVER/"
+    return _serve(store, path)
+
+
+MANHATTAN_NOT_STARTED = (200, {"status": False, "data": None, "status_code": 404})
+
+def country_flag(store, path, country_code, **_):
+    countries = (store.get("country/list/") or {}).get("countries")
+    if countries is not None and country_code not in {country.get("code") for country in countries}:
+        return error(NOT_FOUND_ERROR)
+    return 200, Image(FLAG_SVG.format(code=country_code).encode(), "image/svg+xml")
+
+
+KEY = r"(?P<{}>[^/]+)"
+PAGE = r"(?P<page>-?\d+)"
+
+ROUTES = [
+    (r"association/list/", resource),
+    (rf"association/list/{PAGE}/", association_page),
+    (rf"association/list-by-country/{KEY.format('country_code')}/", resource),
+    (rf"association/{KEY.format('key')}/featured-tournaments/", resource),
+    (r"country/list/", resource),
+    (rf"country/list/{PAGE}/", paged((500, PLAIN_SERVER_ERROR), (500, PLAIN_SERVER_ERROR))),
+    (rf"country/{KEY.format('country_code')}/flags/", country_flag),
+    (rf"venue/list/{PAGE}/", paged((500, PLAIN_SERVER_ERROR), (404, PLAIN_NOT_FOUND))),
+    (r"featured-tournaments/", resource),
+    (r"featured-matches-2/", resource),
+    (r"fixtures/", resource),
+    (r"news-aggregation/", resource),
+    (rf"tournament/{KEY.format('tournament_key')}/", resource),
+    (rf"tournament/{KEY.format('tournament_key')}/featured-matches-2/", resource),
+    (rf"tournament/{KEY.format('tournament_key')}/fixtures/", resource),
+    (rf"tournament/{KEY.format('tournament_key')}/points/", resource),
+    (rf"tournament/{KEY.format('tournament_key')}/stats/", resource),
+    (rf"tournament/{KEY.format('tournament_key')}/team/{KEY.format('team_key')}/", resource),
+    (rf"tournament/{KEY.format('tournament_key')}/player/{KEY.format('player_key')}/stats/", resource),
+    (rf"match/{KEY.format('match_key')}/", resource),
+    (rf"match/{KEY.format('match_key')}/ball-by-ball/", ball_by_ball),
+    (rf"match/{KEY.format('match_key')}/ball-by-ball/{KEY.format('over_key')}/", ball_by_ball),
+    (rf"match/{KEY.format('match_key')}/ball-by-ball/FIRST-OVER/{KEY.format('over_key')}/", ball_by_ball),
+    (rf"match/{KEY.format('match_key')}/over-summary/", resource),
+    (rf"match/{KEY.format('match_key')}/over-summary/{KEY.format('page_key')}/", resource),
+    (rf"match/{KEY.format('match_key')}/worm/", match_graph(error(INVALID_INPUT_ERROR))),
+    (rf"match/{KEY.format('match_key')}/manhattan/", match_graph(MANHATTAN_NOT_STARTED)),
+    (rf"match/{KEY.format('match_key')}/run-rate/", match_graph(error(INVALID_INPUT_ERROR))),
+    (rf"match/{KEY.format('match_key')}/innings/{KEY.format('inning_key')}/wagon-zone/", resource),
+    (rf"match/{KEY.format('match_key')}/innings/{KEY.format('inning_key')}/wagon-zone/bowlers/", resource),
+    (rf"match/{KEY.format('match_key')}/insights/", resource),
+    (rf"match/{KEY.format('match_key')}/live-match-odds/", live_match_odds),
+    (rf"match/{KEY.format('match_key')}/pre-match-odds/", pre_match_odds),
+    (rf"fantasy-match-credits/{KEY.format('match_key')}/", resource),
+    (rf"fantasy-match-points/{KEY.format('match_key')}/", resource),
+]
+
+_COMPILED = [(re.compile(pattern + "$"), handler) for pattern, handler in ROUTES]
+
+
+def resolve(path):
+    for pattern, handler in _COMPILED:
+        match = pattern.match(path)
+        if match:
+            return handler, match.groupdict()
+    return None
+
+
+def handle(store, path):
+    found = resolve(path)
+    if found is None:
+        return 404, PLAIN_NOT_FOUND
+    handler, params = found
+    # parent path, e.g. "venue/list/" for "venue/list/3/"
+    base = path.rsplit("/", 2)[0] + "/"
+    return handler(store, path, base=base, **params)
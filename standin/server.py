@@ -0,0 +1,243 @@
+import json
+import asyncio
+import threading
+from urllib.parse import unquote, urlsplit
+from standin import rest, graphql
+from standin.store import REST_PREFIX, FixtureStore, normalize_path
+
+# Stand-in Roanuz API server
+# A small asyncio HTTP/1.1 server (keep-alive, Content-Length bodies) that
+# answers the REST paths under /v5/cricket/{project_key}/ from a FixtureStore,
+# plus GraphQL POSTs on /v5/gql/ and /graphql/ resolved from the same store.
+# Token handling follows the real API: a request whose rs-token is not one of
+# `tokens` gets the A-401-0 envelope; GraphQL checks rztoken against
+# `graphql_tokens`.
+# An optional FaultProfile (standin/faults.py) delays, fails, throttles, drips
+# or drops requests before they reach the routes, and an optional
+# LiveSimulator (standin/simulator.py) ticks live matches on the server's loop.
+
+GRAPHQL_PATHS = ("/v5/gql/", "/graphql/")
+
+STATUS_TEXT = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 401: "Unauthorized",
+    404: "Not Found", 405: "Method Not Allowed", 429: "Too Many Requests",
+    500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable",
+}
+
+
+class Request:
+
+    def __init__(self, method, target, headers, body):
+        self.method = method
+        self.target = target
+        self.path = unquote(urlsplit(target).path)
+        self.headers = headers
+        self.body = body
+
+    def header(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class StandinServer:
+
+    def __init__(self, store=None, tokens=(), graphql_tokens=(), host="127.0.0.1", port=0, faults=None,
+                 simulator=None):
+        self.store = store if store is not None else FixtureStore()
+        self.faults = faults
+        self.simulator = simulator
+        self._ticker = None
+        self.tokens = {token for token in tokens if token}
+        self.graphql_tokens = {token for token in graphql_tokens if token}
+        self.host = host
+        self.port = port
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._writers = set()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def rest_url(self, project_key):
+        return f"{self.url}{REST_PREFIX}{project_key}/"
+
+    def graphql_url(self, path=GRAPHQL_PATHS[0]):
+        return f"{self.url}{path}"
+
+    # ------------------------
+    # ROUTING
+    # ------------------------
+
+    async def dispatch(self, request):
+        if request.path.startswith(REST_PREFIX):
+            return self.dispatch_rest(request)
+        if request.path in GRAPHQL_PATHS:
+            return self.dispatch_graphql(request)
+        return 404, rest.PLAIN_NOT_FOUND
+
+    def dispatch_rest(self, request):
+        parts = request.path[len(REST_PREFIX):].split("/", 1)
+        path = normalize_path(parts[1] if len(parts) > 1 else "")
+        if rest.resolve(path) is None:
+            return 404, rest.PLAIN_NOT_FOUND
+        if request.method != "GET":
+            return 405, rest.PLAIN_METHOD_NOT_ALLOWED
+        if request.header("rs-token") not in self.tokens:
+            return rest.error(rest.INVALID_TOKEN_ERROR)
+        return rest.handle(self.store, path)
+
+    def dispatch_graphql(self, request):
+        if request.method != "POST":
+            return 405, rest.PLAIN_METHOD_NOT_ALLOWED
+        if request.header("rztoken") not in self.graphql_tokens:
+            return 401, {"data": None, "errors": [{"message": rest.INVALID_TOKEN_ERROR["msg"]}]}
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            return 400, {"data": None, "errors": [{"message": "Request body is not valid JSON"}]}
+        return 200, graphql.execute(self.store, payload.get("query") or "",
+                                    payload.get("variables"), payload.get("operationName"))
+
+    def fault_response(self, fault):
+        if fault.status == 429:
+            return rest.error(rest.THROTTLED_ERROR)
+        if fault.status == 502:
+            return 502, rest.PLAIN_BAD_GATEWAY
+        if fault.status == 503:
+            return 503, rest.PLAIN_UNAVAILABLE
+        return fault.status, rest.PLAIN_SERVER_ERROR
+
+    # ------------------------
+    # HTTP
+    # ------------------------
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), target, headers, body)
+
+    def _encode(self, request, status, body):
+        headers = {}
+        if isinstance(body, (dict, list)):
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json; charset=utf-8"
+            cache = body.get("cache") if isinstance(body, dict) else None
+            if status == 200 and cache and cache.get("etag"):
+                headers["ETag"] = cache["etag"]
+                if request.header("if-none-match") == cache["etag"]:
+                    status, payload = 304, b""
+        elif isinstance(body, rest.Image):
+            payload = body.content
+            headers["Content-Type"] = body.content_type
+        else:
+            payload = str(body).encode()
+            headers["Content-Type"] = "text/plain; charset=utf-8"
+        headers["Content-Length"] = str(len(payload))
+        return status, headers, payload
+
+    async def write_response(self, writer, status, headers, payload, keep_alive, drip=None):
+        headers = dict(headers)
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        if not drip:
+            writer.write(head.encode("latin-1") + b"\r\n" + payload)
+            await writer.drain()
+            return
+        writer.write(head.encode("latin-1") + b"\r\n")
+        await writer.drain()
+        chunk, interval = drip.get("chunk", 512), drip.get("interval_ms", 10) / 1000
+        for start in range(0, len(payload), chunk):
+            await asyncio.sleep(interval)
+            writer.write(payload[start:start + chunk])
+            await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                fault = self.faults.decide(request.method, request.path) if self.faults else None
+                if fault is not None and fault.delay:
+                    await asyncio.sleep(fault.delay)
+                if fault is not None and fault.reset:
+                    writer.transport.abort()
+                    break
+                if fault is not None and fault.status:
+                    status, body = self.fault_response(fault)
+                else:
+                    status, body = await self.dispatch(request)
+                status, headers, payload = self._encode(request, status, body)
+                if fault is not None and fault.retry_after is not None:
+                    headers["Retry-After"] = str(fault.retry_after)
+                keep_alive = request.header("connection", "").lower() != "close"
+                await self.write_response(writer, status, headers, payload, keep_alive,
+                                          drip=fault.drip if fault is not None else None)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    # ------------------------
+    # LIFECYCLE
+    # ------------------------
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.simulator is not None:
+            self._ticker = asyncio.ensure_future(self.simulator.run())
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self):
+        # used by conftest.py: the suite keeps its own event loop, the server gets another
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="standin", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        async def shutdown():
+            if self._ticker is not None:
+                self._ticker.cancel()
+            self._server.close()
+            # idle keep-alive connections would otherwise hold wait_closed() open
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
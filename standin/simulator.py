@@ -0,0 +1,81 @@
+import math
+import time
+import asyncio
+from standin.generator import SyntheticMatch
+
+# Live-match simulator for the stand-in API
+# Plays synthetic matches (standin/generator.py) forward one delivery per tick
+# and republishes every document of the match at once: match detail with
+# play.live and related_balls, ball-by-ball, over summaries, graphs and odds.
+# Each document gets a fresh etag whenever its content changes. While a match
+# is live, its documents are served with max_age equal to the tick interval, so
+# cache.expires tracks the next update. Documents that no longer apply (e.g.
+# pre-match odds once the first ball is bowled) are removed from the store.
+# When the last delivery is reached the match is published as completed and
+# drops out of the rotation.
+#
+# The clock is the tick interval in seconds; advance() and fast_forward() move
+# matches without waiting, for tests and for polling clients that want to
+# catch up.
+
+
+class LiveSimulator:
+
+    def __init__(self, store, interval=6.0, balls_per_tick=1):
+        self.store = store
+        self.interval = interval
+        self.balls_per_tick = balls_per_tick
+        self._matches = {}  # key -> [match, delivered, published paths]
+
+    @property
+    def max_age(self):
+        return max(1, math.ceil(self.interval))
+
+    def add(self, match, upto=None):
+        # `upto` deliveries are already bowled; by default where the match's own cut left it, else before ball one
+        if upto is None:
+            upto = match.cut or 0
+        # documents already in the store (fixtures, an earlier run) are replaced by the simulated ones
+        stale = {path for path in self.store.paths() if path.startswith(f"match/{match.key}/")}
+        self._matches[match.key] = [match, upto, stale]
+        self._publish(match.key)
+        return match
+
+    def add_key(self, key, match_format="t20", upto=None, seed=None):
+        return self.add(SyntheticMatch(key, match_format, "completed", seed=seed, start_at=time.time()), upto)
+
+    def is_live(self, key):
+        match, delivered, _ = self._matches[key]
+        return delivered < len(match.deliveries())
+
+    def live_keys(self):
+        return [key for key in self._matches if self.is_live(key)]
+
+    def position(self, key):
+        return self._matches[key][1]
+
+    def advance(self, key=None, balls=None):
+        """Bowl `balls` more deliveries (default: one tick) in one match, or every live match."""
+        balls = self.balls_per_tick if balls is None else balls
+        for match_key in [key] if key else self.live_keys():
+            entry = self._matches[match_key]
+            entry[1] = min(entry[1] + balls, len(entry[0].deliveries()))
+            self._publish(match_key)
+
+    def fast_forward(self, key, balls):
+        self.advance(key, balls)
+
+    def _publish(self, key):
+        match, delivered, published = self._matches[key]
+        total = len(match.deliveries())
+        docs = match.render(delivered)
+        self.store.update(docs, self.max_age if delivered < total else None)
+        for path in published - docs.keys():
+            self.store.discard(path)
+        self._matches[key][2] = set(docs)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.live_keys():
+                self.advance()
@@ -0,0 +1,127 @@
+import os
+import json
+import hashlib
+import threading
+from urllib.parse import urlsplit
+
+# Fixture store
+# Holds the `data` payload of every REST resource the stand-in serves, keyed by
+# the path below /v5/cricket/{project_key}/ (e.g. "match/<key>/worm/").
+# Fixture files are JSON objects mapping such paths to payloads; recorded
+# cassettes (see utils/cassette.py) can be imported as well, so a --record run
+# against the real API doubles as fixture data.
+
+REST_PREFIX = "/v5/cricket/"
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def normalize_path(path):
+    path = path.strip("/")
+    return f"{path}/" if path else ""
+
+
+def rest_path(url):
+    # "https://host/v5/cricket/<project>/match/k/" -> "match/k/"
+    path = urlsplit(url).path
+    if not path.startswith(REST_PREFIX):
+        return None
+    parts = path[len(REST_PREFIX):].split("/", 1)
+    if len(parts) < 2:
+        return None
+    return normalize_path(parts[1])
+
+
+class FixtureStore:
+
+    def __init__(self):
+        self._docs = {}
+        self._etags = {}
+        self._max_ages = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, path):
+        return normalize_path(path) in self._docs
+
+    def __len__(self):
+        return len(self._docs)
+
+    def paths(self):
+        return list(self._docs)
+
+    def get(self, path):
+        return self._docs.get(normalize_path(path))
+
+    def etag(self, path):
+        return self._etags.get(normalize_path(path))
+
+    def max_age(self, path):
+        # None means the API default; live documents are published with shorter ones
+        return self._max_ages.get(normalize_path(path))
+
+    def put(self, path, data, max_age=None):
+        path = normalize_path(path)
+        body = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+        with self._lock:
+            self._docs[path] = data
+            self._etags[path] = hashlib.sha1(body).hexdigest()
+            if max_age is None:
+                self._max_ages.pop(path, None)
+            else:
+                self._max_ages[path] = max_age
+
+    def discard(self, path):
+        path = normalize_path(path)
+        with self._lock:
+            self._docs.pop(path, None)
+            self._etags.pop(path, None)
+            self._max_ages.pop(path, None)
+
+    def update(self, docs, max_age=None):
+        for path, data in docs.items():
+            self.put(path, data, max_age)
+
+    def load_file(self, filename):
+        with open(filename) as f:
+            self.update(json.load(f))
+
+    def load_dir(self, directory):
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    self.load_file(os.path.join(root, name))
+
+    def load_cassettes(self, directory):
+        # only successful REST GETs carry reusable data; errors are reproduced by the routes
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(directory, name)) as f:
+                entry = json.load(f)
+            request, response = entry["request"], entry["response"]
+            if request["method"] != "GET" or response["status_code"] != 200 or "body" not in response:
+                continue
+            path = rest_path(request["url"])
+            if path is None:
+                continue
+            try:
+                body = json.loads(response["body"])
+            except ValueError:
+                continue
+            if isinstance(body, dict) and "data" in body:
+                self.put(path, body["data"])
+
+    def dump(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self._docs, f)
+
+
+def build_store(fixtures=(), cassettes=()):
+    # fixtures are loaded last so hand-written data wins over recordings
+    store = FixtureStore()
+    for directory in cassettes:
+        if os.path.isdir(directory):
+            store.load_cassettes(directory)
+    for directory in fixtures:
+        if os.path.isdir(directory):
+            store.load_dir(directory)
+    return store
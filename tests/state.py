@@ -1,4 +1,17 @@
 # tests/state.py
+#
+# Keys the tests run against. Every *State object is a frozen instance, so a
+# test module cannot change the keys another module sees. A module that needs
+# different keys declares them instead:
+#
+#     STATE_OVERRIDES = {"match": {"key": "...", "over_key": "b_1_2"}}
+#
+# and reads them from the module-scoped fixtures in conftest.py
+# (match_state, tournament_state, association_state, country_state,
+# stadium_state), which apply that module's overrides to the defaults below.
+
+from dataclasses import dataclass, replace
+from types import MappingProxyType
 
 # class RestAuthState:
 #     rzaccountkey: str = ""
@@ -16,24 +29,66 @@
 #     graphql_admin_user_key: str = ""
 
 
-class AssociationState:
-    key: str="a-intern-test--bcci-OFJF"
-    parent_key: str = "a-intern-test--icc-aJRI"
-    child_key: str = "a-intern-test--asso-68q5"
-    regional_key: str = "a-intern-test--cwi-mcgp"
+@dataclass(frozen=True)
+class AssociationKeys:
+    key: str
+    parent_key: str
+    child_key: str
+    regional_key: str
+
+
+@dataclass(frozen=True)
+class CountryKeys:
+    code: str
+
+
+@dataclass(frozen=True)
+class StadiumKeys:
+    key: str
+
+
+@dataclass(frozen=True)
+class TournamentKeys:
+    key: str
+    team_key: str
+
+
+@dataclass(frozen=True)
+class MatchKeys:
+    key: str
+    over_key: str
+
+
+AssociationState = AssociationKeys(
+    key="a-intern-test--bcci-OFJF",
+    parent_key="a-intern-test--icc-aJRI",
+    child_key="a-intern-test--asso-68q5",
+    regional_key="a-intern-test--cwi-mcgp",
+)
+
+CountryState = CountryKeys(code="AUS")
+
+StadiumState = StadiumKeys(key="a-intern-test--chep-yvDg")
 
-    
-class CountryState:
-    code: str = "AUS"
+TournamentState = TournamentKeys(
+    key="a-intern-test--cricket--isa2j-Srxj--is2j-GrV8--2025-NmJf",
+    team_key="a-intern-test--cricket--csk-a43S",
+)
 
-class StadiumState:
-    key: str='a-intern-test--chep-yvDg'
+MatchState = MatchKeys(
+    key="a-intern-test--cricket--qo1950156409505226755",
+    over_key="b_1_2",
+)
 
-class TournamentState:
-    key: str='a-intern-test--cricket--isa2j-Srxj--is2j-GrV8--2025-NmJf'
-    team_key: str='a-intern-test--cricket--csk-a43S'
+REGISTRY = MappingProxyType({
+    "association": AssociationState,
+    "country": CountryState,
+    "stadium": StadiumState,
+    "tournament": TournamentState,
+    "match": MatchState,
+})
 
-class MatchState:
-    key: str='a-intern-test--cricket--qo1950156409505226755'
-    over_key: str='b_1_2'
 
+def resolve(name, overrides=None):
+    """Keys of `name` with a module's STATE_OVERRIDES applied; returns a new frozen object."""
+    return replace(REGISTRY[name], **(overrides or {}).get(name, {}))
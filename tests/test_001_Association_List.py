@@ -1,5 +1,5 @@
 import pytest,requests,json
-from utils.request_handler import send_get_request,send_post_request,make_graphql_request
+from utils.request_handler import send_get_request,send_memoized_get_request,send_post_request,make_graphql_request,load_graphql_payload
 from tests.state import AssociationState
 from pathlib import Path
 from utils.auth import (
@@ -39,7 +39,7 @@ def test_tc_05_resource_not_found(valid_headers, base_url):
 
 def test_tc_06_get_association_list_valid(base_url, valid_headers):
     url = f"{base_url}{ENDPOINT}"
-    response = send_get_request(url, headers=valid_headers)
+    response = send_memoized_get_request(url, headers=valid_headers)
 
     assert response.status_code == 200, f"Expected 200, got {response.status_code}"
     json_data = response.json()
@@ -60,7 +60,7 @@ def test_tc_07_post_association_list_invalid(base_url, valid_headers):
 
 def test_tc_08_cache_object_present(base_url, valid_headers):
     url = f"{base_url}{ENDPOINT}"
-    response = send_get_request(url, headers=valid_headers)
+    response = send_memoized_get_request(url, headers=valid_headers)
     json_data = response.json()
 
     assert response.status_code == 200
@@ -71,7 +71,7 @@ def test_tc_08_cache_object_present(base_url, valid_headers):
 
 def test_tc_09_required_fields_in_each_association(base_url, valid_headers):
     url = f"{base_url}{ENDPOINT}"
-    response = send_get_request(url, headers=valid_headers)
+    response = send_memoized_get_request(url, headers=valid_headers)
     json_data = response.json()
 
     assert response.status_code == 200
@@ -86,7 +86,7 @@ def test_tc_09_required_fields_in_each_association(base_url, valid_headers):
 
 def test_tc_10_icc_association_structure(valid_headers, base_url):
     url = f"{base_url}{ENDPOINT}"
-    res = requests.get(url,headers=valid_headers)
+    res = send_memoized_get_request(url, headers=valid_headers)
     assert res.status_code == 200
 
     data = res.json()
@@ -105,7 +105,7 @@ def test_tc_10_icc_association_structure(valid_headers, base_url):
 
 def test_tc_11_international_association_structure(valid_headers, base_url):
     url = f"{base_url}{ENDPOINT}"
-    res = requests.get(url,headers=valid_headers)
+    res = send_memoized_get_request(url, headers=valid_headers)
     assert res.status_code == 200
 
     data = res.json()
@@ -122,7 +122,7 @@ def test_tc_11_international_association_structure(valid_headers, base_url):
 
 def test_tc_12_regional_association_structure(valid_headers, base_url):
     url = f"{base_url}{ENDPOINT}"
-    res = requests.get(url,headers=valid_headers)
+    res = send_memoized_get_request(url, headers=valid_headers)
     assert res.status_code == 200
 
     data = res.json()
@@ -140,7 +140,7 @@ def test_tc_12_regional_association_structure(valid_headers, base_url):
 def test_tc_13_negetive_page_number(valid_headers, base_url):
     PAGE = "-100/"
     url = f"{base_url}{ENDPOINT}{PAGE}"
-    res = requests.get(url, headers=valid_headers)
+    res = send_get_request(url, headers=valid_headers)
     assert res.status_code == 200
 
     data = res.json()
@@ -157,7 +157,7 @@ def test_tc_13_negetive_page_number(valid_headers, base_url):
 def test_tc_14_zero_page_number(valid_headers, base_url):
     PAGE= "0/"
     url = f"{base_url}{ENDPOINT}{PAGE}"
-    res = requests.get(url,headers=valid_headers)
+    res = send_get_request(url, headers=valid_headers)
     assert res.status_code == 200
 
     data = res.json()
@@ -168,7 +168,7 @@ def test_tc_14_zero_page_number(valid_headers, base_url):
 def test_tc_15_graphql_matches_rest(valid_headers, graphql_headers, base_url, graphql_url):
 
     rest_url = f"{base_url}{ENDPOINT}"
-    rest_res = requests.get(rest_url, headers=valid_headers)
+    rest_res = send_memoized_get_request(rest_url, headers=valid_headers)
     assert rest_res.status_code == 200
 
     rest_data = rest_res.json()["data"]["associations"]
@@ -176,8 +176,7 @@ def test_tc_15_graphql_matches_rest(valid_headers, graphql_headers, base_url, gr
     assert rest_entry is not None, f"Association with key {CHILD_ASSOCIATION_KEY} not found in REST"
 
     graphql_file_path = Path("data/association/association_read_query.json")
-    with open(graphql_file_path, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(graphql_file_path)
 
     gql_payload["variables"]["resource"]["_hashkey"] = CHILD_ASSOCIATION_KEY
 
@@ -1,6 +1,6 @@
 import pytest,requests,json
-from utils.request_handler import send_get_request,make_graphql_request
-from state import CountryState
+from utils.request_handler import send_get_request,make_graphql_request,load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
@@ -42,8 +42,8 @@ def test_tc_05_get_country_list_valid(base_url, valid_headers):
         assert "is_region" in country, "'is_region' missing in country"
 
 
-def test_tc_06_filter_associations_by_country(valid_headers, base_url):
-    country_code = CountryState.code
+def test_tc_06_filter_associations_by_country(valid_headers, base_url, country_state):
+    country_code = country_state.code
     country_url = f"{base_url}{ENDPOINT}"
     association_url = f"{base_url}association/list/"
 
@@ -131,31 +131,20 @@ def test_tc_11_first_page_number(valid_headers, base_url):
 
 
 
-def test_tc_12_graphql_rest_country_match(graphql_headers, valid_headers,base_url,graphql_url):
+async def test_tc_12_graphql_rest_country_match(graphql_headers, valid_headers,base_url,graphql_url):
 
     GRAPHQL_ENDPOINT = f"{graphql_url}"
     REST_COUNTRY_ENDPOINT = f"{base_url}{ENDPOINT}"
     GRAPHQL_PAYLOAD_FILE = "data/association/region_read_query.json"
 
-    with open(GRAPHQL_PAYLOAD_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_PAYLOAD_FILE)
 
-    graphql_response = make_graphql_request(
-        url=GRAPHQL_ENDPOINT,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert graphql_response.status_code == 200
+    gql_body, rest_body = await async_parity_fetch(REST_COUNTRY_ENDPOINT, valid_headers, GRAPHQL_ENDPOINT, graphql_headers, gql_payload)
 
-    graphql_data = graphql_response.json()["data"]["sports_region_read"]["item"]["region"]
+    graphql_data = gql_body["data"]["sports_region_read"]["item"]["region"]
     code_country = graphql_data["code"]
 
-    rest_response = send_get_request(REST_COUNTRY_ENDPOINT, headers=valid_headers)
-    assert rest_response.status_code == 200
-
-    countries = rest_response.json()["data"]["countries"]
+    countries = rest_body["data"]["countries"]
     matched_country = next((c for c in countries if c["code"] == code_country), None)
     assert matched_country is not None, f"Country with code {code_country} not found in REST response"
 
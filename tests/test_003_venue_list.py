@@ -1,6 +1,6 @@
 import pytest,requests,json
-from utils.request_handler import send_get_request,make_graphql_request
-from state import StadiumState
+from utils.request_handler import send_get_request,make_graphql_request,load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
@@ -9,6 +9,8 @@ from utils.auth import (
 )
 page=1
 ENDPOINT = "venue/list/{page}/"
+AUTH_ENDPOINTS = dict.fromkeys(("valid_headers", "invalid_headers", "no_token_headers", "empty_token_headers"),
+                               ENDPOINT.format(page=1))
 
 def test_tc_01_valid_token_authentication(base_url, valid_headers):
     run_valid_token_authentication(ENDPOINT.format(page=1), base_url, valid_headers)
@@ -53,27 +55,16 @@ def test_tc_05_get_venue_list_valid(base_url, valid_headers):
         assert "official_name" in country, "'official_name' missing in country"
         assert "is_region" in country, "'is_region' missing in country"
 
-def test_tc_06_graphql_rest_stadium_match_by_key(graphql_headers, valid_headers, base_url, graphql_url):
+async def test_tc_06_graphql_rest_stadium_match_by_key(graphql_headers, valid_headers, base_url, graphql_url, stadium_state):
     GRAPHQL_PAYLOAD_FILE="data/association/stadium_search_query.json"
-    with open(GRAPHQL_PAYLOAD_FILE, "r") as f:
-        gql_payload = json.load(f)
-
-    graphql_response = make_graphql_request(
-        url=graphql_url,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert graphql_response.status_code == 200
-    graphql_items = graphql_response.json()["data"]["sports_stadium_search"]["items"]
+    gql_payload = load_graphql_payload(GRAPHQL_PAYLOAD_FILE)
 
     rest_url = f"{base_url}{ENDPOINT.format(page=1)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200
-    rest_items = rest_response.json()["data"]["venues"]
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, graphql_url, graphql_headers, gql_payload)
+    graphql_items = gql_body["data"]["sports_stadium_search"]["items"]
+    rest_items = rest_body["data"]["venues"]
 
-    target_key = StadiumState.key
+    target_key = stadium_state.key
 
     gql_obj = next((item for item in graphql_items if item["resource"]["hashkey"] == target_key), None)
     rest_obj = next((item for item in rest_items if item["key"] == target_key), None)
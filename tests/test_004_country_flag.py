@@ -12,7 +12,7 @@ ENDPOINT = "country/{country_code}/flags/"
 
 def test_tc_01_valid_token_authentication(base_url, valid_headers):
     url = f"{base_url}" + ENDPOINT.format(country_code=country_code)
-    response = requests.get(url, headers=valid_headers)
+    response = send_get_request(url, headers=valid_headers)
     assert response.status_code == 200
     assert "image" in response.headers.get("Content-Type", ""), "Response is not an image"
 
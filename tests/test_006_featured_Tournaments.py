@@ -1,7 +1,7 @@
 
 import pytest,requests,json
-from utils.request_handler import send_get_request,send_post_request,make_graphql_request
-from tests.state import AssociationState
+from utils.request_handler import send_get_request,send_post_request,make_graphql_request,load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from pathlib import Path
 from utils.auth import (
     run_valid_token_authentication,
@@ -12,10 +12,10 @@ from utils.auth import (
 
 ENDPOINT = "association/{key}/featured-tournaments/"
 
-def test_valid_token_authentication(base_url, valid_headers):
+def test_valid_token_authentication(base_url, valid_headers, association_state):
     print(valid_headers)
     print(ENDPOINT)
-    run_valid_token_authentication(ENDPOINT.format(key=AssociationState.key), base_url, valid_headers)
+    run_valid_token_authentication(ENDPOINT.format(key=association_state.key), base_url, valid_headers)
 
 def test_invalid_token(base_url, invalid_headers):
     run_invalid_token(ENDPOINT, base_url, invalid_headers)
@@ -26,9 +26,9 @@ def test_missing_token(base_url, no_token_headers):
 def test_empty_token(base_url, empty_token_headers):
     run_empty_token(ENDPOINT, base_url, empty_token_headers)
 
-def test_tc_05_get_featured_tournaments_valid(base_url, valid_headers):
+def test_tc_05_get_featured_tournaments_valid(base_url, valid_headers, association_state):
 
-    url = f"{base_url}{ENDPOINT.format(key=AssociationState.key)}"
+    url = f"{base_url}{ENDPOINT.format(key=association_state.key)}"
 
     response = send_get_request(url, headers=valid_headers)
 
@@ -98,36 +98,23 @@ def test_tc_06_no_featured_tournaments_returns_empty_list(base_url, valid_header
 
 
 
-def test_tc_07_graphql_rest_featured_tournaments_match(graphql_headers, valid_headers, base_url):
+async def test_tc_07_graphql_rest_featured_tournaments_match(graphql_headers, valid_headers, base_url, gql_url, association_state):
     
     GRAPHQL_PAYLOAD_FILE = "data/association/featured_tournaments_query.json"
-    graphql_url = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+    graphql_url = gql_url
 
-    with open(GRAPHQL_PAYLOAD_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_PAYLOAD_FILE)
 
     gql_payload["variables"] = {
-        "associationKey": AssociationState.key}
-
-    graphql_response = make_graphql_request(
-        url=graphql_url,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-
-    assert graphql_response.status_code == 200, f"Failed with status {graphql_response.status_code}, response: {graphql_response.text}"
-    graphql_tournaments = graphql_response.json()["data"]["cricket_featured_tournaments"]["tournaments"]
+        "associationKey": association_state.key}
+
+    rest_url = f"{base_url}{ENDPOINT.format(key=association_state.key)}"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, graphql_url, graphql_headers, gql_payload)
+    graphql_tournaments = gql_body["data"]["cricket_featured_tournaments"]["tournaments"]
+    rest_tournaments = rest_body["data"]["tournaments"]
     assert isinstance(graphql_tournaments, list)
     assert len(graphql_tournaments) > 0, "GraphQL response should contain tournaments"
 
-    # REST 
-    rest_url =f"{base_url}{ENDPOINT.format(key=AssociationState.key)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200
-    rest_tournaments = rest_response.json()["data"]["tournaments"]
-
     rest_dict = {item["key"]: item for item in rest_tournaments}
 
 
@@ -1,5 +1,6 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import normalize_string
 from tests.state import AssociationState
 from utils.auth import (
@@ -61,33 +62,21 @@ def test_tc_05_get_featured_tournaments_valid(base_url, valid_headers):
                 assert field in country, f"'{field}' missing in country"
 
 
-def test_tc_06_featured_tournament_keys_match(graphql_headers, valid_headers, base_url):
+async def test_tc_06_featured_tournament_keys_match(graphql_headers, valid_headers, base_url, gql_url):
     GRAPHQL_PAYLOAD_FILE = "data/tournament/featured_query.json"
 
-    with open(GRAPHQL_PAYLOAD_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_PAYLOAD_FILE)
 
     gql_payload["variables"] = {}
 
-    graphql_url = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+    graphql_url = gql_url
 
-    graphql_response = make_graphql_request(
-        url=graphql_url,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-
-    assert graphql_response.status_code == 200, f"GraphQL error: {graphql_response.text}"
-    graphql_data = graphql_response.json()["data"]["cricket_featured_tournaments"]["tournaments"]
+    rest_url = f"{base_url}{ENDPOINT}"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, graphql_url, graphql_headers, gql_payload)
+    graphql_data = gql_body["data"]["cricket_featured_tournaments"]["tournaments"]
+    rest_data = rest_body["data"]["tournaments"]
     assert isinstance(graphql_data, list) and graphql_data, "GraphQL: Tournament list empty"
 
-    rest_url = url = f"{base_url}{ENDPOINT}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST error: {rest_response.text}"
-    rest_data = rest_response.json()["data"]["tournaments"]
-
     rest_dict = {item["key"]: item for item in rest_data}
 
         # Check for unprecedented times (off-season, pandemic, etc.)
@@ -1,22 +1,25 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
-from tests.state import TournamentState
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
     run_missing_token,
     run_empty_token
 )
+from utils.schema import list_of, assert_schema, MATCH
 
 ENDPOINT = "tournament/{tournament_key}/fixtures/"
+STATE_OVERRIDES = {"tournament": {"key": "a-intern-test--cricket--samp-xu3D--tour-ta-6K43-tb-W9Df-T20--2025-hG3R"}}
+MATCHES = list_of(MATCH.extend("gender"))
 
 
 
-def test_valid_token_authentication(base_url, valid_headers):
+def test_valid_token_authentication(base_url, valid_headers, tournament_state):
     print(valid_headers)
     print(ENDPOINT)
-    run_valid_token_authentication(ENDPOINT.format(tournament_key=TournamentState.key), base_url, valid_headers)
+    run_valid_token_authentication(ENDPOINT.format(tournament_key=tournament_state.key), base_url, valid_headers)
 
 def test_invalid_token(base_url, invalid_headers):
     run_invalid_token(ENDPOINT, base_url, invalid_headers)
@@ -31,8 +34,8 @@ def test_empty_token(base_url, empty_token_headers):
 
 
 
-def test_tc_05_get_tournament_fixtures_valid(base_url, valid_headers):
-    url = f"{base_url}{ENDPOINT.format(tournament_key=TournamentState.key)}"
+def test_tc_05_get_tournament_fixtures_valid(base_url, valid_headers, tournament_state):
+    url = f"{base_url}{ENDPOINT.format(tournament_key=tournament_state.key)}"
     response = send_get_request(url, headers=valid_headers)
 
     assert response.status_code == 200, f"Expected 200, got {response.status_code}"
@@ -43,41 +46,9 @@ def test_tc_05_get_tournament_fixtures_valid(base_url, valid_headers):
     assert "matches" in json_data["data"], "'matches' key missing in data"
 
     matches = json_data["data"]["matches"]
-    assert isinstance(matches, list), "'matches' should be a list"
+    assert_schema(matches, MATCHES, path="matches")
 
     for match in matches:
-        for field in ["key", "name", "short_name", "sub_title", "status", "start_at", "tournament",
-                      "metric_group", "sport", "teams", "venue", "association", "format", "gender"]:
-            assert field in match, f"'{field}' missing in match"
-
-        # tournament details
-        tournament = match["tournament"]
-        assert isinstance(tournament, dict), "'tournament' should be a dict"
-        for field in ["key", "name", "short_name", "alternate_name", "alternate_short_name"]:
-            assert field in tournament, f"'{field}' missing in tournament"
-
-        # team structure
-        teams = match["teams"]
-        for side in ["a", "b"]:
-            assert side in teams, f"'{side}' team missing"
-            team = teams[side]
-            for field in ["key", "code", "name", "alternate_name", "alternate_code", "gender_name", "country_code"]:
-                assert field in team, f"'{field}' missing in team {side}"
-
-        # venue structure
-        venue = match["venue"]
-        for field in ["key", "name", "city", "country"]:
-            assert field in venue, f"'{field}' missing in venue"
-
-        country = venue["country"]
-        for field in ["short_code", "code", "name", "official_name", "is_region"]:
-            assert field in country, f"'{field}' missing in venue.country"
-
-        # association
-        association = match["association"]
-        for field in ["key", "code", "name"]:
-            assert field in association, f"'{field}' missing in association"
-
         status = normalize_string(match["status"])
         assert status in ["completed", "started", "notstarted"], f"Invalid status: {match['status']}"
 
@@ -99,11 +70,11 @@ def test_tc_05_get_tournament_fixtures_valid(base_url, valid_headers):
 
 
 
-def test_tc_06_check_tbd_venue_from_fixtures(base_url, valid_headers):
+def test_tc_06_check_tbd_venue_from_fixtures(base_url, valid_headers, tournament_state):
     match_key = "a-intern-test--cricket--0Q1949781585960280066"
-    url = f"{base_url}{ENDPOINT.format(tournament_key=TournamentState.key)}"
+    url = f"{base_url}{ENDPOINT.format(tournament_key=tournament_state.key)}"
     
-    response = requests.get(url, headers=valid_headers)
+    response = send_get_request(url, headers=valid_headers)
     assert response.status_code == 200, f"Expected 200, got {response.status_code}"
 
     matches = response.json().get("data", {}).get("matches", [])
@@ -127,35 +98,21 @@ def test_tc_06_check_tbd_venue_from_fixtures(base_url, valid_headers):
     assert venue.get("geolocation") is None, "Venue geolocation should be None"
 
 
-def test_tc_07_rest_match_graphql(valid_headers, graphql_headers, base_url):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+async def test_tc_07_rest_match_graphql(valid_headers, graphql_headers, base_url, gql_url, tournament_state):
+    GRAPHQL_URL = gql_url
     GRAPHQL_FIXTURE_QUERY_FILE = "data/tournament/tournament_fixtures_query.json"
     # Load GraphQL fixture payload
-    with open(GRAPHQL_FIXTURE_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
-
-    gql_payload["variables"]["key"] = TournamentState.key
-
-    # GraphQL
-    graphql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-
-    assert graphql_response.status_code == 200, f"GraphQL error: {graphql_response.text}"
-    gql_matches = graphql_response.json()["data"]["cricket_tournament_fixtures"]["matches"]
+    gql_payload = load_graphql_payload(GRAPHQL_FIXTURE_QUERY_FILE)
+
+    gql_payload["variables"]["key"] = tournament_state.key
+
+    rest_url = f"{base_url}{ENDPOINT.format(tournament_key=tournament_state.key)}"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_matches = gql_body["data"]["cricket_tournament_fixtures"]["matches"]
+    rest_matches = rest_body["data"]["matches"]
     assert isinstance(gql_matches, list) and gql_matches, "No matches in GraphQL response"
 
     gql_dict = {match["key"]: match for match in gql_matches}
-
-    # REST
-    rest_url = f"{base_url}{ENDPOINT.format(tournament_key=TournamentState.key)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST error: {rest_response.text}"
-    rest_matches = rest_response.json()["data"]["matches"]
     assert isinstance(rest_matches, list) and rest_matches, "No matches in REST response"
 
     rest_dict = {match["key"]: match for match in rest_matches}
@@ -1,22 +1,24 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
-from tests.state import TournamentState
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
     run_missing_token,
     run_empty_token
 )
+from utils.parity import fields, enum, by_key, entries, unordered, assert_parity, TOURNAMENT_PARITY
 
 ENDPOINT = "tournament/{tournament_key}/"
+STATE_OVERRIDES = {"tournament": {"key": "a-intern-test--cricket--samp-xu3D--tour-ta-6K43-tb-W9Df-T20--2025-hG3R"}}
 
 
 
-def test_valid_token_authentication(base_url, valid_headers):
+def test_valid_token_authentication(base_url, valid_headers, tournament_state):
     print(valid_headers)
     print(ENDPOINT)
-    run_valid_token_authentication(ENDPOINT.format(tournament_key=TournamentState.key), base_url, valid_headers)
+    run_valid_token_authentication(ENDPOINT.format(tournament_key=tournament_state.key), base_url, valid_headers)
 
 def test_invalid_token(base_url, invalid_headers):
     run_invalid_token(ENDPOINT, base_url, invalid_headers)
@@ -30,9 +32,9 @@ def test_empty_token(base_url, empty_token_headers):
     run_empty_token(ENDPOINT, base_url, empty_token_headers)
 
 
-def test_tc_05_tournament_detail_structure(base_url, valid_headers):
+def test_tc_05_tournament_detail_structure(base_url, valid_headers, tournament_state):
 
-    url = f"{base_url}{ENDPOINT.format(tournament_key=TournamentState.key)}"
+    url = f"{base_url}{ENDPOINT.format(tournament_key=tournament_state.key)}"
     response = send_get_request(url, headers=valid_headers)
     
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
@@ -82,72 +84,26 @@ def test_tc_05_tournament_detail_structure(base_url, valid_headers):
 # tours and series are same ,the names can be used to differntiate them 
 # Series will have more number of rounds and groups such as round-robin, knockout 
 
-def test_tc_08_rest_match_graphql(valid_headers, graphql_headers, base_url):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
-    GRAPHQL_FIXTURE_QUERY_FILE = "data/tournament/single_tournament_query.json"
-
-    with open(GRAPHQL_FIXTURE_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
-
-    gql_payload["variables"]["key"] = TournamentState.key
-
-    # Make GraphQL request
-    graphql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert graphql_response.status_code == 200, f"GraphQL error: {graphql_response.text}"
-    graphql_data = graphql_response.json()["data"]["cricket_tournament_detail"]
-
-    url = f"{base_url}{ENDPOINT.format(tournament_key=TournamentState.key)}"
-    rest_response = send_get_request(url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"Unexpected status code: {rest_response.status_code}"
-    rest_data = rest_response.json()["data"]
-
-    gql_tournament = graphql_data["tournament"]
-    rest_tournament = rest_data["tournament"]
-
-    assert gql_tournament["key"] == rest_tournament["key"]
-    assert gql_tournament["name"] == rest_tournament["name"]
-    assert gql_tournament["short_name"] == rest_tournament["short_name"]
-    assert gql_tournament["gender"].lower() == rest_tournament["gender"]
-    gql_point_system = normalize_string(gql_tournament["point_system"])
-    rest_point_system = normalize_string(rest_tournament["point_system"])
-    assert gql_point_system == rest_point_system, f"Mismatch in point_system"        
-    assert gql_tournament["sport"].lower() == rest_tournament["sport"]
 
-    gql_teams = {team["key"]: team["value"]["name"] for team in graphql_data["teams"]}
-    rest_teams = {key: team["name"] for key, team in rest_data["teams"].items()}
-
-    assert gql_teams == rest_teams, f"Team mismatch: GraphQL={gql_teams}, REST={rest_teams}"
-
-    gql_rounds = graphql_data["rounds"]
-    rest_rounds = rest_data["rounds"]
-
-    assert len(gql_rounds) == len(rest_rounds), "Number of rounds mismatch"
-
-    for gql_round, rest_round in zip(gql_rounds, rest_rounds):
-        assert gql_round["key"] == rest_round["key"]
-        assert gql_round["name"] == rest_round["name"]
-        assert gql_round["format"].lower() == rest_round["format"]
+TOURNAMENT_DETAIL_PARITY = fields(
+    tournament=TOURNAMENT_PARITY.extend(gender=enum, point_system=enum, sport=enum),
+    teams=entries(fields("name")),
+    rounds=by_key("key", fields("name", format=enum, groups=by_key(
+        "key", fields("name", team_keys=unordered(), match_keys=unordered())))),
+)
 
-        gql_groups = gql_round["groups"]
-        rest_groups = rest_round["groups"]
-        assert len(gql_groups) == len(rest_groups), f"Group count mismatch in round {gql_round['name']}"
 
-        for gql_group, rest_group in zip(gql_groups, rest_groups):
-            assert gql_group["key"] == rest_group["key"]
-            assert gql_group["name"] == rest_group["name"]
+async def test_tc_08_rest_match_graphql(valid_headers, graphql_headers, base_url, gql_url, tournament_state):
+    GRAPHQL_URL = gql_url
+    GRAPHQL_FIXTURE_QUERY_FILE = "data/tournament/single_tournament_query.json"
 
-            gql_team_keys = sorted(gql_group["team_keys"])
-            rest_team_keys = sorted(rest_group["team_keys"])
-            assert gql_team_keys == rest_team_keys, f"Team keys mismatch in group {gql_group['name']}"
+    gql_payload = load_graphql_payload(GRAPHQL_FIXTURE_QUERY_FILE)
 
-            gql_match_keys = sorted(gql_group["match_keys"])
-            rest_match_keys = sorted(rest_group["match_keys"])
-            assert gql_match_keys == rest_match_keys, f"Match keys mismatch in group {gql_group['name']}"
+    gql_payload["variables"]["key"] = tournament_state.key
 
+    url = f"{base_url}{ENDPOINT.format(tournament_key=tournament_state.key)}"
+    gql_body, rest_body = await async_parity_fetch(url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    graphql_data = gql_body["data"]["cricket_tournament_detail"]
+    rest_data = rest_body["data"]
 
+    assert_parity(graphql_data, rest_data, TOURNAMENT_DETAIL_PARITY)
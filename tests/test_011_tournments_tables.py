@@ -1,21 +1,23 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
-from tests.state import TournamentState
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
     run_missing_token,
     run_empty_token
 )
+from utils.parity import fields, by_key, approx, assert_parity, TEAM_PARITY, TOURNAMENT_PARITY
 
 ENDPOINT = "tournament/{tournament_key}/points/"
+STATE_OVERRIDES = {"tournament": {"key": "a-intern-test--cricket--samp-xu3D--tour-ta-6K43-tb-W9Df-T20--2025-hG3R"}}
 
 
-def test_valid_token_authentication(base_url, valid_headers):
+def test_valid_token_authentication(base_url, valid_headers, tournament_state):
     print(valid_headers)
     print(ENDPOINT)
-    run_valid_token_authentication(ENDPOINT.format(tournament_key=TournamentState.key), base_url, valid_headers)
+    run_valid_token_authentication(ENDPOINT.format(tournament_key=tournament_state.key), base_url, valid_headers)
 
 def test_invalid_token(base_url, invalid_headers):
     run_invalid_token(ENDPOINT, base_url, invalid_headers)
@@ -29,9 +31,9 @@ def test_empty_token(base_url, empty_token_headers):
     run_empty_token(ENDPOINT, base_url, empty_token_headers)
 
 
-def test_tc_05_tournament_detail_structure(base_url, valid_headers):
+def test_tc_05_tournament_detail_structure(base_url, valid_headers, tournament_state):
 
-    url = f"{base_url}{ENDPOINT.format(tournament_key=TournamentState.key)}"
+    url = f"{base_url}{ENDPOINT.format(tournament_key=tournament_state.key)}"
     response = send_get_request(url, headers=valid_headers)
     
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
@@ -78,70 +80,33 @@ def test_tc_05_tournament_detail_structure(base_url, valid_headers):
                 for field in ["position_in_table", "played", "won", "lost", "tied", "draw", "no_result", "points", "net_run_rate"]:
                     assert field in team_data, f"Missing field in points entry: {field}"
 
-def test_tc_09_tournament_points_rest_vs_graphql(base_url, valid_headers, graphql_headers):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
 
-    GRAPHQL_POINTS_QUERY_FILE = "data/tournament/points_query.json"
-
-    with open(GRAPHQL_POINTS_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
-
-    gql_payload["variables"]["key"] = TournamentState.key
-
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_data = gql_response.json()["data"]["cricket_tournament_points"]
-
-    # REST request
-    rest_url =f"{base_url}{ENDPOINT.format(tournament_key=TournamentState.key)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST error: {rest_response.text}"
-    rest_data = rest_response.json()["data"]
-
-    # Tournament Info
-    for field in ["key", "name", "short_name"]:
-        assert gql_data["tournament"][field] == rest_data["tournament"][field], f"Mismatch in tournament.{field}"
+POINTS_FIELDS = ("position_in_table", "played", "won", "lost", "tied", "draw", "no_result", "points")
 
-    gql_rounds = gql_data["rounds"]
-    rest_rounds = rest_data["rounds"]
-    assert len(gql_rounds) == len(rest_rounds), "Mismatch in number of rounds"
-
-    for gql_round, rest_round in zip(gql_rounds, rest_rounds):
-        gql_round_info = gql_round["tournament_round"]
-        rest_round_info = rest_round["tournament_round"]
-
-        assert gql_round_info["key"] == rest_round_info["key"], f"Mismatch in round key"
-        assert gql_round_info["name"] == rest_round_info["name"], f"Mismatch in round name"
+# rounds, groups and table rows are joined on their keys
+POINTS_PARITY = fields(
+    tournament=TOURNAMENT_PARITY,
+    rounds=by_key(lambda rnd: rnd["tournament_round"]["key"], fields(
+        tournament_round=fields("key", "name"),
+        groups=by_key(lambda group: group["group"]["key"], fields(
+            group=fields("key", "name"),
+            points=by_key(lambda row: row["team"]["key"],
+                          fields(*POINTS_FIELDS, team=TEAM_PARITY, net_run_rate=approx())))))),
+)
 
-        gql_groups = gql_round["groups"]
-        rest_groups = rest_round["groups"]
-        assert len(gql_groups) == len(rest_groups), f"Mismatch in number of groups in round {gql_round_info['name']}"
 
-        for gql_group, rest_group in zip(gql_groups, rest_groups):
-            gql_group_info = gql_group["group"]
-            rest_group_info = rest_group["group"]
+async def test_tc_09_tournament_points_rest_vs_graphql(base_url, valid_headers, graphql_headers, gql_url, tournament_state):
+    GRAPHQL_URL = gql_url
 
-            assert gql_group_info["key"] == rest_group_info["key"], f"Group key mismatch"
-            assert gql_group_info["name"] == rest_group_info["name"], f"Group name mismatch"
+    GRAPHQL_POINTS_QUERY_FILE = "data/tournament/points_query.json"
 
-            gql_points = gql_group["points"]
-            rest_points = rest_group["points"]
-            assert len(gql_points) == len(rest_points), f"Mismatch in number of teams in group {gql_group_info['name']}"
+    gql_payload = load_graphql_payload(GRAPHQL_POINTS_QUERY_FILE)
 
-            for gql_team_data, rest_team_data in zip(gql_points, rest_points):
-                gql_team = gql_team_data["team"]
-                rest_team = rest_team_data["team"]
+    gql_payload["variables"]["key"] = tournament_state.key
 
-                # team identity
-                for field in ["key", "code", "name"]:
-                    assert gql_team[field] == rest_team[field], f"Mismatch in team.{field} for {gql_team['key']}"
+    rest_url = f"{base_url}{ENDPOINT.format(tournament_key=tournament_state.key)}"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_data = gql_body["data"]["cricket_tournament_points"]
+    rest_data = rest_body["data"]
 
-                # points data
-                for field in ["position_in_table", "played", "won", "lost", "tied", "draw", "no_result", "points", "net_run_rate"]:
-                    assert gql_team_data[field] == rest_team_data[field], f"Mismatch in points field '{field}' for team {gql_team['key']} in group {gql_group_info['name']}"
+    assert_parity(gql_data, rest_data, POINTS_PARITY)
@@ -1,5 +1,6 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
 from tests.state import TournamentState
 from utils.auth import (
@@ -8,8 +9,15 @@ from utils.auth import (
     run_missing_token,
     run_empty_token
 )
+from utils.schema import obj, list_of, optional, assert_schema, envelope, TOURNAMENT, TEAMS, VENUE, ASSOCIATION
 
 ENDPOINT = "featured-matches-2/"
+FEATURED_MATCHES = envelope(obj(
+    intelligent_order=list,
+    matches=list_of(obj("key", "name", "short_name", "sub_title", "status", "start_at", "sport", "winner",
+                        "gender", "format", "estimated_end_date", "completed_date_approximate",
+                        tournament=TOURNAMENT, teams=TEAMS, venue=optional(VENUE), association=ASSOCIATION)),
+))
 
 def test_valid_token_authentication(base_url, valid_headers):
     print(valid_headers)
@@ -31,86 +39,24 @@ def test_tc_05_featured_matches_detail_structure(base_url, valid_headers):
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
     json_data = response.json()
 
-    for key in ["data", "cache", "schema", "error", "http_status_code"]:
-        assert key in json_data, f"Missing top-level key: {key}"
-
-    matches = json_data["data"].get("matches")
-    assert isinstance(matches, list), "'matches' should be a list"
-
-    for match in matches:
-        for field in [
-            "key", "name", "short_name", "sub_title", "status", "start_at",
-            "tournament", "sport", "winner", "teams", "venue", "association",
-            "gender", "format", "estimated_end_date", "completed_date_approximate"
-        ]:
-            assert field in match, f"Missing field in match: {field}"
-
-        # Tournament details
-        tournament = match["tournament"]
-        assert isinstance(tournament, dict), "'tournament' should be a dict"
-        for field in ["key", "name", "short_name", "alternate_name", "alternate_short_name"]:
-            assert field in tournament, f"Missing field in tournament: {field}"
-
-        # Teams
-        teams = match["teams"]
-        assert isinstance(teams, dict), "'teams' should be a dict"
-        for team_key in ["a", "b"]:
-            assert team_key in teams, f"Missing team key: {team_key}"
-            team = teams[team_key]
-            for field in ["key", "code", "name", "alternate_name", "alternate_code", "gender_name", "country_code"]:
-                assert field in team, f"Missing field in team '{team_key}': {field}"
-
-        # Venue
-        venue = match["venue"]
-        if(venue):
-            assert isinstance(venue, dict), "'venue' should be a dict"
-            for field in ["key", "name", "city", "country"]:
-                assert field in venue, f"Missing field in venue: {field}"
-            country = venue["country"]
-            assert isinstance(country, dict), "'country' in venue should be a dict"
-            for field in ["short_code", "code", "name", "official_name", "is_region"]:
-                assert field in country, f"Missing field in venue country: {field}"
-
-        # Association
-        association = match["association"]
-        assert isinstance(association, dict), "'association' should be a dict"
-        for field in ["key", "code", "name"]:
-            assert field in association, f"Missing field in association: {field}"
-
-    intelligent_order = json_data["data"].get("intelligent_order")
-    assert isinstance(intelligent_order, list), "'intelligent_order' should be a list"
-
-    cache = json_data["cache"]
-    for field in ["key", "expires", "etag", "max_age"]:
-        assert field in cache, f"Missing field in cache: {field}"
+    assert_schema(json_data, FEATURED_MATCHES)
 
     assert json_data["http_status_code"] == 200, "'http_status_code' should be 200"
 
-def test_tc_06_match_featured_rest_vs_graphql(base_url, valid_headers, graphql_headers):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+async def test_tc_06_match_featured_rest_vs_graphql(base_url, valid_headers, graphql_headers, gql_url):
+    GRAPHQL_URL = gql_url
 
     GRAPHQL_POINTS_QUERY_FILE = "data/match/featured_query.json"
 
-    with open(GRAPHQL_POINTS_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_POINTS_QUERY_FILE)
 
 
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_matches = gql_response.json()["data"]["cricket_featured_matches"]["matches"]
+    rest_url = f"{base_url}{ENDPOINT}"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_matches = gql_body["data"]["cricket_featured_matches"]["matches"]
+    rest_matches = rest_body["data"]["matches"]
     gql_match_map = {match["key"]: match for match in gql_matches}
 
-    rest_url =f"{base_url}{ENDPOINT}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST API failed with {rest_response.status_code}"
-    rest_matches = rest_response.json()["data"]["matches"]
-
     for rest_match in rest_matches:
         key = rest_match["key"]
         assert key in gql_match_map, f"Match key '{key}' not found in GraphQL response"
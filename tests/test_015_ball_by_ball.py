@@ -1,25 +1,26 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
+from utils.ball_by_ball import async_iter_innings, async_iter_overs, over_key, parse_over_key
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
-from tests.state import MatchState
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
     run_missing_token,
     run_empty_token
 )
+from utils.parity import fields, enum, by_key, assert_parity
 
-MatchState.over_key="A1_1"
-MatchState.key="a-intern-test--cricket--Z41951155191541829634"
+STATE_OVERRIDES = {"match": {"key": "a-intern-test--cricket--Z41951155191541829634", "over_key": "A1_1"}}
 ENDPOINT = "match/{match_key}/ball-by-ball/"
 FIRST_OVER_ENDPOINT = "match/{match_key}/ball-by-ball/FIRST-OVER/"
 OVER_KEY_ENDPOINT = "match/{match_key}/ball-by-ball/FIRST-OVER/{over_key}/"
 
 
-def test_valid_token_authentication(base_url, valid_headers):
+def test_valid_token_authentication(base_url, valid_headers, match_state):
     print(valid_headers)
     print(ENDPOINT)
-    run_valid_token_authentication(ENDPOINT.format(match_key=MatchState.key), base_url, valid_headers)
+    run_valid_token_authentication(ENDPOINT.format(match_key=match_state.key), base_url, valid_headers)
 
 def test_invalid_token(base_url, invalid_headers):
     run_invalid_token(ENDPOINT, base_url, invalid_headers)
@@ -31,8 +32,8 @@ def test_empty_token(base_url, empty_token_headers):
     run_empty_token(ENDPOINT, base_url, empty_token_headers)
 
 
-def test_tc_06_ball_by_ball_over_structure(base_url, valid_headers):
-    url = f"{base_url}{ENDPOINT.format(match_key=MatchState.key)}"
+def test_tc_06_ball_by_ball_over_structure(base_url, valid_headers, match_state):
+    url = f"{base_url}{ENDPOINT.format(match_key=match_state.key)}"
     response = send_get_request(url, headers=valid_headers)
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
     json_data = response.json()
@@ -107,8 +108,8 @@ def test_tc_06_ball_by_ball_over_structure(base_url, valid_headers):
     assert json_data["http_status_code"] == 200, "Invalid HTTP status"
 
 
-def test_tc_07_validate_first_over(base_url, valid_headers):
-    url = f"{base_url}{FIRST_OVER_ENDPOINT.format(match_key=MatchState.key)}"
+def test_tc_07_validate_first_over(base_url, valid_headers, match_state):
+    url = f"{base_url}{FIRST_OVER_ENDPOINT.format(match_key=match_state.key)}"
     response = send_get_request(url, headers=valid_headers)
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
 
@@ -120,9 +121,9 @@ def test_tc_07_validate_first_over(base_url, valid_headers):
     balls = data["over"]["balls"]
     assert len(balls) == 2, f"Expected 6 balls in the over, but got {len(balls)}"
 
-def test_tc_08_validate__over_key_result(base_url, valid_headers):
+def test_tc_08_validate__over_key_result(base_url, valid_headers, match_state):
 
-    url = f"{base_url}{FIRST_OVER_ENDPOINT.format(match_key=MatchState.key,over_key=MatchState.over_key)}"
+    url = f"{base_url}{FIRST_OVER_ENDPOINT.format(match_key=match_state.key,over_key=match_state.over_key)}"
     response = send_get_request(url, headers=valid_headers)
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
 
@@ -137,61 +138,47 @@ def test_tc_08_validate__over_key_result(base_url, valid_headers):
     assert over_number == 2, f"Expected over number 2, got {over_number}"
 
 
+BALL_BY_BALL_PARITY = fields(over=fields(
+    index=fields("over_number", innings=enum),
+    balls=by_key("key", fields("overs", "non_striker_key", ball_type=enum, batting_team=enum,
+                               batsman=fields("player_key"), bowler=fields("player_key"),
+                               team_score=fields("ball_count", "runs", "extras", "is_wicket"))),
+))
 
-def test_tc_09_graphql_rest_ball_by_ball_match(base_url, valid_headers, graphql_headers):
+
+async def test_tc_09_graphql_rest_ball_by_ball_match(base_url, valid_headers, graphql_headers, gql_url, match_state):
     import json
 
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+    GRAPHQL_URL = gql_url
     GRAPHQL_QUERY_FILE = "data/match/match_query.json"
 
     # Load GraphQL query
-    with open(GRAPHQL_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
-
-    gql_payload["variables"]["key"] = MatchState.key
-    gql_payload["variables"]["overKey"] =MatchState.over_key
-
-
-    # Fetch GraphQL data
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"])
-
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_data = gql_response.json()["data"]["cricket_match_ball_by_ball"]
-
-    #REST
-    rest_endpoint = f"/rest/v5/cricket/match/{MatchState.key}/ball-by-ball/{MatchState.over_key}/"
-    rest_response = send_get_request(f"{base_url}{rest_endpoint}", headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST error: {rest_response.text}"
-    rest_data = rest_response.json()["data"]
-
-    assert gql_data["over"]["index"]["innings"].lower() == rest_data["over"]["index"]["innings"].lower()
-    assert gql_data["over"]["index"]["over_number"] == rest_data["over"]["index"]["over_number"]
-
-    gql_balls = gql_data["over"]["balls"]
-    rest_balls = rest_data["over"]["balls"]
-    assert len(gql_balls) == len(rest_balls), "Mismatch in number of balls"
-
-    for i, (gball, rball) in enumerate(zip(gql_balls, rest_balls)):
-        assert gball["key"] == rball["key"], f"Mismatch at ball {i}: key"
-        assert gball["ball_type"].lower() == rball["ball_type"].lower(), f"Mismatch at ball {i}: ball_type"
-        assert gball["batting_team"].lower() == rball["batting_team"].lower(), f"Mismatch at ball {i}: batting_team"
-        assert gball["overs"] == rball["overs"], f"Mismatch at ball {i}: overs"
-        assert gball["non_striker_key"] == rball["non_striker_key"], f"Mismatch at ball {i}: non_striker_key"
-
-        gb = gball["batsman"]
-        rb = rball["batsman"]
-        assert gb["player_key"] == rb["player_key"], f"Mismatch at ball {i}: batsman.{field}"
-
-        gbw = gball["bowler"]
-        rbw = rball["bowler"]
-        assert gbw["player_key"] == rbw["player_key"], f"Mismatch at ball {i}: bowler.{field}"
-
-        gts = gball["team_score"]
-        rts = rball["team_score"]
-        for field in ["ball_count", "runs", "extras", "is_wicket"]:
-            assert gts[field] == rts[field], f"Mismatch at ball {i}: team_score.{field}"
\ No newline at end of file
+    gql_payload = load_graphql_payload(GRAPHQL_QUERY_FILE)
+
+    gql_payload["variables"]["key"] = match_state.key
+    gql_payload["variables"]["overKey"] =match_state.over_key
+
+
+    rest_endpoint = f"/rest/v5/cricket/match/{match_state.key}/ball-by-ball/{match_state.over_key}/"
+    gql_body, rest_body = await async_parity_fetch(f"{base_url}{rest_endpoint}", valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_data = gql_body["data"]["cricket_match_ball_by_ball"]
+    rest_data = rest_body["data"]
+
+    assert_parity(gql_data, rest_data, BALL_BY_BALL_PARITY)
+
+
+async def test_tc_10_walk_match_and_innings(base_url, valid_headers, match_state):
+    # the match walked over by over, then each innings on its own; both must give the same overs
+    overs = [over async for over in async_iter_overs(base_url, valid_headers, match_state.key)]
+    assert overs and overs[0]["previous_over_key"] is None and overs[-1]["next_over_key"] is None
+
+    latest = send_get_request(f"{base_url}{ENDPOINT.format(match_key=match_state.key)}", headers=valid_headers)
+    assert overs[-1]["over"]["index"] == latest.json()["data"]["over"]["index"]
+
+    walked = []
+    for innings in dict.fromkeys(over["over"]["index"]["innings"] for over in overs):
+        numbers = [over["over"]["index"]["over_number"]
+                   async for over in async_iter_innings(base_url, valid_headers, match_state.key, innings)]
+        assert numbers == list(range(1, len(numbers) + 1)), f"{innings}: overs {numbers}"
+        walked += [(innings, number) for number in numbers]
+    assert walked == [parse_over_key(over_key(over["over"]["index"])) for over in overs]
@@ -1,5 +1,6 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
 from tests.state import MatchState
 from utils.auth import (
@@ -8,6 +9,7 @@ from utils.auth import (
     run_missing_token,
     run_empty_token
 )
+from utils.parity import assert_parity, ODDS_PARITY
 COMPLETED_MATCH="a-intern-test--cricket--KU1950455781946204164"
 LIVE_MATCH="a-intern-test--cricket--Ca1949722003183411201"
 UPCOMING_MATCH="a-intern-test--cricket--qT1950798302987603974"
@@ -15,6 +17,7 @@ UPCOMING_MATCH_AFTER_10_DAYS="a-intern-test--cricket--0Q1949781585960280066"
 
 
 ENDPOINT = "match/{match_key}/pre-match-odds/"
+AUTH_ENDPOINTS = {"valid_headers": ENDPOINT.format(match_key=UPCOMING_MATCH)}
 
 def test_valid_token_authentication(base_url, valid_headers):
     print(valid_headers)
@@ -98,55 +101,17 @@ def test_tc_05_invalid_input_after_10_days(base_url, valid_headers):
     assert json_data["error"]["msg"] == "Invalid input to process", f"Unexpected message: {json_data['error']['msg']}"
     assert json_data["error"]["http_status_code"] == 400, "Incorrect http_status_code in error block"
 
-def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+async def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers, gql_url):
+    GRAPHQL_URL = gql_url
     GRAPHQL_POINTS_QUERY_FILE = "data/match_odds/pre_match_odds_query.json"
 
-    with open(GRAPHQL_POINTS_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_POINTS_QUERY_FILE)
 
     gql_payload["variables"]["matchKey"] = UPCOMING_MATCH
 
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_match = gql_response.json()["data"]["cricket_match_pre_match_odds"]["match"]
-
     rest_url = f"{base_url}{ENDPOINT.format(match_key=UPCOMING_MATCH)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST API failed with {rest_response.status_code}"
-    rest_match = rest_response.json()["data"]["match"]
-
-    # DECIMAL odds
-    gql_decimal = {item["team_key"]: item["value"] for item in gql_match["bet_odds"]["automatic"]["decimal"]}
-    rest_decimal = {item["team_key"]: item["value"] for item in rest_match["bet_odds"]["automatic"]["decimal"]}
-    assert gql_decimal == rest_decimal, f"Mismatch in decimal odds"
-
-    #FRACTIONAL odds
-    gql_fractional = {
-        item["team_key"]: {
-            "value": item["value"],
-            "numerator": item["numerator"],
-            "denominator": item["denominator"]
-        } for item in gql_match["bet_odds"]["automatic"]["fractional"]
-    }
-    rest_fractional = {
-        item["team_key"]: {
-            "value": item["value"],
-            "numerator": item["numerator"],
-            "denominator": item["denominator"]
-        } for item in rest_match["bet_odds"]["automatic"]["fractional"]
-    }
-    assert gql_fractional == rest_fractional, f"Mismatch in fractional odds: {gql_fractional} vs {rest_fractional}"
-
-    #RESULT PREDICTION percentages
-    gql_percentages = {item["team_key"]: item["value"] for item in gql_match["result_prediction"]["automatic"]["percentage"]}
-    rest_percentages = {item["team_key"]: item["value"] for item in rest_match["result_prediction"]["automatic"]["percentage"]}
-    assert gql_percentages == rest_percentages, f"Mismatch in result prediction: {gql_percentages} vs {rest_percentages}"
-
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_match = gql_body["data"]["cricket_match_pre_match_odds"]["match"]
+    rest_match = rest_body["data"]["match"]
 
+    assert_parity(gql_match, rest_match, ODDS_PARITY, path="match")
@@ -13,6 +13,9 @@ ENDPOINT = "tournament/{tournament_key}/stats/"
 PROJECT_KEY ="RS_P_1912493998375911425"
 
 Tournament="a-rz--cricket--icc--icccwclt--2023-27-8JlY"
+AUTH_ENDPOINTS = dict.fromkeys(("invalid_headers", "no_token_headers", "empty_token_headers"),
+                               ENDPOINT.format(tournament_key=Tournament))
+AUTH_ENDPOINTS["valid_headers_1"] = None  # the valid-token test goes to another project (BASE_URL)
 
 def test_valid_token_authentication(valid_headers_1):
     print(valid_headers_1)
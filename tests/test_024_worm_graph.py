@@ -1,5 +1,7 @@
+import asyncio
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_get, async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
 from tests.state import MatchState
 from utils.auth import (
@@ -8,6 +10,9 @@ from utils.auth import (
     run_missing_token,
     run_empty_token
 )
+from utils.parity import assert_parity, GRAPH_PARITY
+from utils.graphs import assert_graphs
+from utils.ball_by_ball import async_check_match
 
 
 live_match_key="a-intern-test--cricket--Ca1949722003183411201"
@@ -16,6 +21,7 @@ upcoming_key="a-intern-test--cricket--0Q1949781585960280066"
 match_without_innings="a-intern-test--cricket--Mh1950826877283381252"
 
 ENDPOINT = "match/{match_key}/worm/"
+AUTH_ENDPOINTS = {"valid_headers": ENDPOINT.format(match_key=completed_match_key)}
 
 def test_valid_token_authentication(base_url, valid_headers):
     print(valid_headers)
@@ -44,6 +50,7 @@ def test_completed_match_worm_graph_response(base_url, valid_headers):
     assert isinstance(data["x"], list), "Expected x to be a list"
     assert isinstance(data["y"], list) and isinstance(data["y2_wickets"], list), "Expected y and y2_wickets to be lists"
     assert data["chart_type"] == "line", "Unexpected chart type"
+    assert_graphs(worm=data, path="worm")
 
 
 def test_live_match_worm_graph_response(base_url, valid_headers):
@@ -56,6 +63,24 @@ def test_live_match_worm_graph_response(base_url, valid_headers):
     assert data is not None, "Expected data in response"
     assert isinstance(data["y"], list) and isinstance(data["y2_wickets"], list), "Expected y and y2_wickets to be lists"
     assert len(data["y"]) == 2, "Expected 2 innings data (even if one is empty)"
+    assert_graphs(worm=data, path="worm")
+
+
+async def test_worm_is_running_sum_of_manhattan(base_url, valid_headers):
+    for match_key in (completed_match_key, live_match_key):
+        worm, manhattan = await asyncio.gather(
+            async_get(f"{base_url}{ENDPOINT.format(match_key=match_key)}", valid_headers),
+            async_get(f"{base_url}match/{match_key}/manhattan/", valid_headers),
+        )
+        assert worm.status_code == 200 and manhattan.status_code == 200, "Expected both graphs"
+        assert_graphs(worm=worm.json()["data"], manhattan=manhattan.json()["data"], path=match_key)
+
+
+async def test_graphs_match_ball_by_ball(base_url, valid_headers):
+    # worm, manhattan and run-rate recomputed from every delivery of the feed
+    for match_key in (completed_match_key, live_match_key):
+        errors = await async_check_match(base_url, valid_headers, match_key)
+        assert not errors, f"{match_key}: {len(errors)} chart/feed difference(s):\n  " + "\n  ".join(errors)
 
 
 def test_live_no_innings_match_worm_graph_response(base_url, valid_headers):
@@ -78,51 +103,16 @@ def test_upcoming_match_worm_graph_response(base_url, valid_headers):
     assert json_data["error"]["msg"] == "Invalid input to process", f"Unexpected error message: {json_data['error']['msg']}"
 
 
-def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+async def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers, gql_url):
+    GRAPHQL_URL = gql_url
     GRAPHQL_POINTS_QUERY_FILE = "data/graph/worm_query.json"
 
-    with open(GRAPHQL_POINTS_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_POINTS_QUERY_FILE)
 
     gql_payload["variables"]["matchKey"] = live_match_key
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_match = gql_response.json()["data"]["cricket_match_worm"]
-
     rest_url = f"{base_url}{ENDPOINT.format(match_key=live_match_key)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST API failed with {rest_response.status_code}"
-    rest_match = rest_response.json()["data"]
-
-    # first_bat_team
-    gql_bat = gql_match["first_bat_team"]
-    rest_bat = rest_match["first_bat_team"]
-    assert gql_bat["key"] == rest_bat["key"], "Mismatch in first_bat_team key"
-    assert gql_bat["code"] == rest_bat["code"], "Mismatch in first_bat_team code"
-    assert gql_bat["name"] == rest_bat["name"], "Mismatch in first_bat_team name"
-
-    # first_bowl_team
-    gql_bowl = gql_match["first_bowl_team"]
-    rest_bowl = rest_match["first_bowl_team"]
-    assert gql_bowl["key"] == rest_bowl["key"], "Mismatch in first_bowl_team key"
-    assert gql_bowl["code"] == rest_bowl["code"], "Mismatch in first_bowl_team code"
-    assert gql_bowl["name"] == rest_bowl["name"], "Mismatch in first_bowl_team name"
-
-    # graph values
-    assert gql_match["x"] == rest_match["x"], "Mismatch in x (overs) values"
-    assert gql_match["y"] == rest_match["y"], "Mismatch in y (runs) values"
-    assert gql_match["y2_wickets"] == rest_match["y2_wickets"], "Mismatch in y2_wickets values"
-    assert gql_match["x_axis_label"] == rest_match["x_axis_label"], "Mismatch in x_axis_label"
-    assert gql_match["y_axis_label"] == rest_match["y_axis_label"], "Mismatch in y_axis_label"
-    assert gql_match["data_label"] == rest_match["data_label"], "Mismatch in data_label"
-    
-    assert gql_match["chart_type"].lower() == rest_match["chart_type"].lower(), "Mismatch in chart_type"
-
-    assert gql_match["y_colors"] == rest_match["y_colors"], "Mismatch in y_colors"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_match = gql_body["data"]["cricket_match_worm"]
+    rest_match = rest_body["data"]
+
+    assert_parity(gql_match, rest_match, GRAPH_PARITY)
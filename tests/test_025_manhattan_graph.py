@@ -1,5 +1,6 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
 from tests.state import MatchState
 from utils.auth import (
@@ -8,6 +9,8 @@ from utils.auth import (
     run_missing_token,
     run_empty_token
 )
+from utils.parity import assert_parity, GRAPH_PARITY
+from utils.graphs import assert_graphs
 
 
 live_match_key="a-intern-test--cricket--Ca1949722003183411201"
@@ -16,6 +19,7 @@ upcoming_key="a-intern-test--cricket--0Q1949781585960280066"
 match_without_innings="a-intern-test--cricket--Mh1950826877283381252"
 
 ENDPOINT = "match/{match_key}/manhattan/"
+AUTH_ENDPOINTS = {"valid_headers": ENDPOINT.format(match_key=completed_match_key)}
 
 def test_valid_token_authentication(base_url, valid_headers):
     print(valid_headers)
@@ -45,6 +49,7 @@ def test_completed_match_manhattan_response(base_url, valid_headers):
     assert isinstance(data["x"], list), "Expected x to be a list"
     assert isinstance(data["y"], list) and isinstance(data["y2_wickets"], list), "Expected y and y2_wickets to be lists"
     assert data["chart_type"] == "bar", "Unexpected chart type"
+    assert_graphs(manhattan=data, path="manhattan")
 
 def test_live_match_manhattan_response(base_url, valid_headers):
     url = f"{base_url}{ENDPOINT.format(match_key=live_match_key)}"
@@ -58,6 +63,7 @@ def test_live_match_manhattan_response(base_url, valid_headers):
     assert len(data["y"]) == 2, "Expected two lists in 'y' (one may be empty)"
     assert isinstance(data["y2_wickets"], list), "Expected y2_wickets to be a list"
     assert data["chart_type"] == "bar", "Expected chart type to be 'bar'"
+    assert_graphs(manhattan=data, path="manhattan")
 
 
 def test_live_no_innings_match_manhattan_response(base_url, valid_headers):
@@ -80,45 +86,16 @@ def test_upcoming_match_worm_graph_response(base_url, valid_headers):
     assert json_data["status_code"] == 404, "Resource not found expected"
    
 
-def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+async def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers, gql_url):
+    GRAPHQL_URL = gql_url
     GRAPHQL_POINTS_QUERY_FILE = "data/graph/manhattan_query.json"
 
-    with open(GRAPHQL_POINTS_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_POINTS_QUERY_FILE)
 
     gql_payload["variables"]["matchKey"] = live_match_key
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_match = gql_response.json()["data"]["cricket_match_manhattan"]
-
     rest_url = f"{base_url}{ENDPOINT.format(match_key=live_match_key)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST API failed with {rest_response.status_code}"
-    rest_match = rest_response.json()["data"]
-
-    # Team 
-    assert gql_match["first_bat_team"]["key"] == rest_match["first_bat_team"]["key"]
-    assert gql_match["first_bat_team"]["code"] == rest_match["first_bat_team"]["code"]
-    assert gql_match["first_bat_team"]["name"] == rest_match["first_bat_team"]["name"]
-
-    assert gql_match["first_bowl_team"]["key"] == rest_match["first_bowl_team"]["key"]
-    assert gql_match["first_bowl_team"]["code"] == rest_match["first_bowl_team"]["code"]
-    assert gql_match["first_bowl_team"]["name"] == rest_match["first_bowl_team"]["name"]
-
-    # Chart fields
-    assert gql_match["x"] == rest_match["x"], "Mismatch in x (Overs)"
-    assert gql_match["y"] == rest_match["y"], "Mismatch in y (Runs)"
-    assert gql_match["y2_wickets"] == rest_match["y2_wickets"], "Mismatch in y2_wickets"
-    assert gql_match["x_axis_label"] == rest_match["x_axis_label"]
-    assert gql_match["y_axis_label"] == rest_match["y_axis_label"]
-    assert gql_match["data_label"] == rest_match["data_label"]
-    assert gql_match["y_colors"] == rest_match["y_colors"]
-
-    assert gql_match["chart_type"].lower() == rest_match["chart_type"].lower()
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_match = gql_body["data"]["cricket_match_manhattan"]
+    rest_match = rest_body["data"]
+
+    assert_parity(gql_match, rest_match, GRAPH_PARITY)
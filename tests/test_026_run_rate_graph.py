@@ -1,5 +1,7 @@
+import asyncio
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_get, async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
 from tests.state import MatchState
 from utils.auth import (
@@ -8,6 +10,8 @@ from utils.auth import (
     run_missing_token,
     run_empty_token
 )
+from utils.parity import assert_parity, GRAPH_PARITY
+from utils.graphs import assert_graphs
 
 
 live_match_key="a-intern-test--cricket--Ca1949722003183411201"
@@ -16,6 +20,7 @@ upcoming_key="a-intern-test--cricket--0Q1949781585960280066"
 match_without_innings="a-intern-test--cricket--Mh1950826877283381252"
 
 ENDPOINT = "match/{match_key}/run-rate/"
+AUTH_ENDPOINTS = {"valid_headers": ENDPOINT.format(match_key=completed_match_key)}
 
 def test_valid_token_authentication(base_url, valid_headers):
     print(valid_headers)
@@ -43,6 +48,7 @@ def test_completed_match_manhattan_response(base_url, valid_headers):
     assert isinstance(data["x"], list)
     assert isinstance(data["y"], list)
     assert isinstance(data["y2_wickets"], list)
+    assert_graphs(run_rate=data, path="run_rate")
 
 def test_live_match_manhattan_response(base_url, valid_headers):
     url = f"{base_url}{ENDPOINT.format(match_key=live_match_key)}"
@@ -55,6 +61,17 @@ def test_live_match_manhattan_response(base_url, valid_headers):
     assert isinstance(data["x"], list)
     assert isinstance(data["y"], list)
     assert isinstance(data["y2_wickets"], list)
+    assert_graphs(run_rate=data, path="run_rate")
+
+
+async def test_run_rate_is_worm_over_overs(base_url, valid_headers):
+    for match_key in (completed_match_key, live_match_key):
+        run_rate, worm = await asyncio.gather(
+            async_get(f"{base_url}{ENDPOINT.format(match_key=match_key)}", valid_headers),
+            async_get(f"{base_url}match/{match_key}/worm/", valid_headers),
+        )
+        assert run_rate.status_code == 200 and worm.status_code == 200, "Expected both graphs"
+        assert_graphs(worm=worm.json()["data"], run_rate=run_rate.json()["data"], path=match_key)
 
 
 def test_live_no_innings_match_manhattan_response(base_url, valid_headers):
@@ -71,44 +88,17 @@ def test_upcoming_match_worm_graph_response(base_url, valid_headers):
     error = response.json()["error"]
 
 
-def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers):
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+async def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers, gql_url):
+    GRAPHQL_URL = gql_url
     GRAPHQL_POINTS_QUERY_FILE = "data/graph/run_rate_query.json"
 
-    with open(GRAPHQL_POINTS_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
+    gql_payload = load_graphql_payload(GRAPHQL_POINTS_QUERY_FILE)
 
     gql_payload["variables"]["matchKey"] = live_match_key
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_data = gql_response.json()["data"]["cricket_match_run_rate"]
-
     rest_url = f"{base_url}{ENDPOINT.format(match_key=live_match_key)}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST API failed with {rest_response.status_code}"
-    rest_data = rest_response.json()["data"]
-
-
-    assert gql_data["first_bat_team"]["key"] == rest_data["first_bat_team"]["key"], "Mismatch in first_bat_team key"
-    assert gql_data["first_bat_team"]["code"] == rest_data["first_bat_team"]["code"], "Mismatch in first_bat_team code"
-    assert gql_data["first_bat_team"]["name"] == rest_data["first_bat_team"]["name"], "Mismatch in first_bat_team name"
-
-    assert gql_data["first_bowl_team"]["key"] == rest_data["first_bowl_team"]["key"], "Mismatch in first_bowl_team key"
-    assert gql_data["first_bowl_team"]["code"] == rest_data["first_bowl_team"]["code"], "Mismatch in first_bowl_team code"
-    assert gql_data["first_bowl_team"]["name"] == rest_data["first_bowl_team"]["name"], "Mismatch in first_bowl_team name"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_data = gql_body["data"]["cricket_match_run_rate"]
+    rest_data = rest_body["data"]
 
-    assert gql_data["x"] == rest_data["x"], "Mismatch in X-axis overs"
-    assert gql_data["y"] == rest_data["y"], "Mismatch in Y-axis run rates"
-    assert gql_data["y2_wickets"] == rest_data["y2_wickets"], "Mismatch in wickets data"
-    assert gql_data["x_axis_label"] == rest_data["x_axis_label"], "Mismatch in X-axis label"
-    assert gql_data["y_axis_label"] == rest_data["y_axis_label"], "Mismatch in Y-axis label"
-    assert gql_data["data_label"] == rest_data["data_label"], "Mismatch in data labels"
-    assert gql_data["y_colors"] == rest_data["y_colors"], "Mismatch in color codes"
 
-    assert gql_data["chart_type"].lower() == rest_data["chart_type"].lower(), "Mismatch in chart type"
+    assert_parity(gql_data, rest_data, GRAPH_PARITY)
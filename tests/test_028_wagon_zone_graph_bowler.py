@@ -13,6 +13,7 @@ inning="B1"
 
 
 ENDPOINT = "match/{match_key}/innings/{inning_key}/wagon-zone/bowlers/"
+AUTH_ENDPOINTS = {"valid_headers": ENDPOINT.format(match_key=match, inning_key=inning)}
 
 def test_valid_token_authentication(base_url, valid_headers):
     print(valid_headers)
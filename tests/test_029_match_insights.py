@@ -1,7 +1,6 @@
 import pytest, requests, json
 from utils.request_handler import send_get_request, make_graphql_request
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
-from tests.state import MatchState
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
@@ -9,11 +8,12 @@ from utils.auth import (
     run_empty_token
 )
 ENDPOINT = "match/{match_key}/insights/"
+STATE_OVERRIDES = {"match": {"key": "a-intern-test--cricket--Z41951155191541829634", "over_key": "A1_1"}}
 
-def test_valid_token_authentication(base_url, valid_headers):
+def test_valid_token_authentication(base_url, valid_headers, match_state):
     print(valid_headers)
     print(ENDPOINT)
-    run_valid_token_authentication(ENDPOINT.format(match_key=MatchState.key), base_url, valid_headers)
+    run_valid_token_authentication(ENDPOINT.format(match_key=match_state.key), base_url, valid_headers)
 
 def test_invalid_token(base_url, invalid_headers):
     run_invalid_token(ENDPOINT, base_url, invalid_headers)
@@ -24,8 +24,8 @@ def test_missing_token(base_url, no_token_headers):
 def test_empty_token(base_url, empty_token_headers):
     run_empty_token(ENDPOINT, base_url, empty_token_headers)
 
-def test_structure(base_url, valid_headers):
-    url = f"{base_url}{ENDPOINT.format(match_key=MatchState.key)}"
+def test_structure(base_url, valid_headers, match_state):
+    url = f"{base_url}{ENDPOINT.format(match_key=match_state.key)}"
     response = send_get_request(url, headers=valid_headers)
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
     
@@ -1,15 +1,17 @@
 import pytest, requests, json
-from utils.request_handler import send_get_request, make_graphql_request
+from utils.request_handler import send_get_request, make_graphql_request, load_graphql_payload
+from utils.async_request_handler import async_parity_fetch
 from utils.common import get_date_from_timestamp,get_todays_date,normalize_string
-from tests.state import MatchState
 from utils.auth import (
     run_valid_token_authentication,
     run_invalid_token,
     run_missing_token,
     run_empty_token
 )
+from utils.parity import fields, in_order, assert_parity
 
 ENDPOINT = "news-aggregation/"
+STATE_OVERRIDES = {"match": {"key": "a-intern-test--cricket--Z41951155191541829634", "over_key": "A1_1"}}
 
 def test_valid_token_authentication(base_url, valid_headers):
     print(valid_headers)
@@ -24,8 +26,8 @@ def test_missing_token(base_url, no_token_headers):
 def test_empty_token(base_url, empty_token_headers):
     run_empty_token(ENDPOINT, base_url, empty_token_headers)
 
-def test_tc_news_aggregation_structure(base_url, valid_headers):
-    url = f"{base_url}{ENDPOINT.format(match_key=MatchState.key)}"
+def test_tc_news_aggregation_structure(base_url, valid_headers, match_state):
+    url = f"{base_url}{ENDPOINT.format(match_key=match_state.key)}"
     response = send_get_request(url, headers=valid_headers)
     assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
     news_data = response.json()
@@ -48,30 +50,16 @@ def test_tc_news_aggregation_structure(base_url, valid_headers):
         assert "updated" in item and isinstance(item["updated"], str), "Missing or invalid 'updated'"
 
 
-def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers):
+async def test_tc_04_rest_graphql_validate(base_url, valid_headers, graphql_headers, gql_url):
 
-    GRAPHQL_URL = "https://ants-api.sports.dev.roanuz.com/v5/gql/"
+    GRAPHQL_URL = gql_url
 
     GRAPHQL_POINTS_QUERY_FILE = "data/new/news_query.json"
 
-    with open(GRAPHQL_POINTS_QUERY_FILE, "r") as f:
-        gql_payload = json.load(f)
-
-    gql_response = make_graphql_request(
-        url=GRAPHQL_URL,
-        headers=graphql_headers,
-        query=gql_payload["query"],
-        variables=gql_payload["variables"],
-        operation_name=gql_payload["operationName"]
-    )
-    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
-    gql_data = gql_response.json()["data"]["cricket_news_aggregation"]["news"]
+    gql_payload = load_graphql_payload(GRAPHQL_POINTS_QUERY_FILE)
 
     rest_url = f"{base_url}{ENDPOINT}"
-    rest_response = send_get_request(rest_url, headers=valid_headers)
-    assert rest_response.status_code == 200, f"REST API failed with {rest_response.status_code}"
-    rest_data = rest_response.json()["data"]["news"]
-    assert len(gql_data) == len(rest_data),"Number of news differs"
-
-    for i in range(len(gql_data)):
-        assert gql_data[i]["title"] == rest_data[i]["title"],f"difference in the title at {i}"
+    gql_body, rest_body = await async_parity_fetch(rest_url, valid_headers, GRAPHQL_URL, graphql_headers, gql_payload)
+    gql_data = gql_body["data"]["cricket_news_aggregation"]["news"]
+    rest_data = rest_body["data"]["news"]
+    assert_parity(gql_data, rest_data, in_order(fields("title")), path="news")
@@ -0,0 +1,84 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from utils.request_handler import POOL_MAXSIZE, send_get_request, send_post_request, make_graphql_request, request_key
+
+# Asyncio counterparts of the helpers in utils/request_handler.py.
+# Each call runs the blocking helper on a worker thread so it shares the same
+# keep-alive pool; the executor is sized to the pool so no connection is dropped.
+
+_executor = None
+_loop = None
+_inflight = {}
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=POOL_MAXSIZE, thread_name_prefix="http")
+    return _executor
+
+
+def get_event_loop():
+    # one loop for the whole run so every async test multiplexes on it
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
+def run(coro):
+    return get_event_loop().run_until_complete(coro)
+
+
+def close_event_loop():
+    global _loop, _executor
+    if _loop is not None and not _loop.is_closed():
+        _loop.close()
+    _loop = None
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+async def _in_executor(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), func, *args)
+
+
+#RestAPI
+
+async def async_get(url, headers, fresh=False):
+    # coroutines asking for the same GET await one shared task; threads are
+    # coalesced again inside send_get_request
+    key = (fresh,) + request_key("GET", url, headers)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_in_executor(send_get_request, url, headers, fresh))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+async def async_post(url, headers, payload=None):
+    return await _in_executor(send_post_request, url, headers, payload)
+
+
+#GraphQL
+
+async def async_graphql(url, headers, query, variables=None, operation_name=None):
+    return await _in_executor(make_graphql_request, url, headers, query, variables, operation_name)
+
+
+#Parity
+
+async def async_parity_fetch(rest_url, rest_headers, gql_url, gql_headers, payload):
+    """Send the GraphQL query and the REST GET at the same time; returns (graphql body, rest body).
+
+    Both go out over the shared pool, so the two snapshots of a live match are
+    taken as close together as possible."""
+    gql_response, rest_response = await asyncio.gather(
+        async_graphql(gql_url, gql_headers, payload["query"], payload.get("variables"), payload.get("operationName")),
+        async_get(rest_url, rest_headers),
+    )
+    assert gql_response.status_code == 200, f"GraphQL error: {gql_response.text}"
+    assert rest_response.status_code == 200, f"REST API failed with {rest_response.status_code}"
+    return gql_response.json(), rest_response.json()
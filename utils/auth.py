@@ -1,5 +1,7 @@
 import json
-from utils.request_handler import send_get_request
+import asyncio
+from utils.request_handler import send_get_request, request_key
+from utils.async_request_handler import run, async_get
 
 # Load expected auth data from JSON file
 with open("data/auth/auth.json") as f:
@@ -7,10 +9,89 @@ with open("data/auth/auth.json") as f:
 
 EXPECTED_INVALID_TOKEN_ERROR = auth_data["EXPECTED_INVALID_TOKEN_ERROR"]
 
+# Auth matrix
+# Every module checks its ENDPOINT with a valid, invalid, missing and empty
+# token through the helpers below. Before the first test runs, conftest.py
+# builds the grid from declared data, without running any test: each selected
+# token test requests its module's ENDPOINT with the header fixtures it takes,
+# filled from the module's state keys for a valid token and as written for
+# the others (which is how the suite calls the helpers). A module whose token
+# tests request something else declares it per header fixture:
+#
+#     AUTH_ENDPOINTS = {"valid_headers": ENDPOINT.format(match_key=LIVE_MATCH)}
+#
+# (None: not prefetched). prefetch() then sends the whole grid at once on the
+# shared pool, and the helpers answer the real test run from those
+# responses. Each case is still its own pytest item with its own assertions;
+# a request that was not prefetched (or failed to fetch) is simply sent
+# again. Auth requests always go to the server (fresh=True): a cached 200
+# would hide a revoked token.
+
+AUTH_HELPERS = ("run_valid_token_authentication", "run_invalid_token", "run_missing_token", "run_empty_token")
+VALID_HEADERS = ("valid_headers", "valid_headers_1")
+
+# ENDPOINT placeholders and the state keys that fill them
+PLACEHOLDERS = {
+    "match_key": ("match", "key"),
+    "over_key": ("match", "over_key"),
+    "tournament_key": ("tournament", "key"),
+    "team_key": ("tournament", "team_key"),
+    "country_code": ("country", "code"),
+    "key": ("association", "key"),
+}
+
+_prefetched = {}  # request_key -> response
+
+
+def uses_auth_helpers(func):
+    code = getattr(func, "__code__", None)
+    return code is not None and any(name in code.co_names for name in AUTH_HELPERS)
+
+
+def planned_endpoint(endpoint, header, states, declared=None):
+    """The path a token test sends with the `header` fixture, or None if it cannot be told in advance.
+
+    `declared` is the module's AUTH_ENDPOINTS; otherwise a valid token goes to
+    ENDPOINT filled from `states` ({"match": MatchKeys, ...}) and the others to
+    ENDPOINT as written."""
+    if declared and header in declared:
+        return declared[header]
+    if header not in VALID_HEADERS:
+        return endpoint
+    values = {name: getattr(states[kind], field) for name, (kind, field) in PLACEHOLDERS.items()}
+    try:
+        return endpoint.format(**values)
+    except (KeyError, IndexError):
+        return None
+
+
+def prefetch(requests):
+    # duplicates are sent once; async_get runs them on the pooled executor
+    pending = {request_key("GET", url, headers): (url, headers) for url, headers in requests}
+
+    async def fetch_all():
+        return await asyncio.gather(*(async_get(url, headers, fresh=True) for url, headers in pending.values()),
+                                    return_exceptions=True)
+
+    for key, res in zip(pending, run(fetch_all())):
+        if not isinstance(res, Exception):
+            _prefetched[key] = res
+    return len(pending)
+
+
+def clear_prefetched():
+    _prefetched.clear()
+
+
+def _get(url, headers):
+    res = _prefetched.get(request_key("GET", url, headers))
+    return res if res is not None else send_get_request(url, headers=headers, fresh=True)
+
+
 def run_valid_token_authentication(endpoint, base_url, valid_headers):
     url = f"{base_url}{endpoint}"
     print(url)
-    res = send_get_request(url, headers=valid_headers)
+    res = _get(url, valid_headers)
     assert res.status_code == 200
     json_data = res.json()
     assert "data" in json_data
@@ -18,7 +99,7 @@ def run_valid_token_authentication(endpoint, base_url, valid_headers):
 
 def run_invalid_token(endpoint, base_url, invalid_headers):
     url = f"{base_url}{endpoint}"
-    res = send_get_request(url, headers=invalid_headers)
+    res = _get(url, invalid_headers)
 
     assert res.status_code == 401
     json_data = res.json()
@@ -29,7 +110,7 @@ def run_invalid_token(endpoint, base_url, invalid_headers):
 
 def run_missing_token(endpoint, base_url, no_token_headers):
     url = f"{base_url}{endpoint}"
-    res = send_get_request(url, headers=no_token_headers)
+    res = _get(url, no_token_headers)
 
     assert res.status_code == 401
     json_data = res.json()
@@ -40,7 +121,7 @@ def run_missing_token(endpoint, base_url, no_token_headers):
 
 def run_empty_token(endpoint, base_url, empty_token_headers):
     url = f"{base_url}{endpoint}"
-    res = send_get_request(url, headers=empty_token_headers)
+    res = _get(url, empty_token_headers)
 
     assert res.status_code == 401
     json_data = res.json()
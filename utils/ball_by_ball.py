@@ -0,0 +1,209 @@
+import asyncio
+import numpy as np
+from utils.async_request_handler import async_get
+from utils.graphs import Series, KINDS, RATE_TOLERANCE
+
+# Charts recomputed from the ball-by-ball feed
+# iter_overs() walks match/<key>/ball-by-ball/ from FIRST-OVER along
+# next_over_key. Over keys are "<innings>_<over number>" ("b_1_2", "A1_1"),
+# parsed into a compact (innings, over_number) pair, so while one over is
+# awaited the next PREFETCH overs of the same innings are already requested.
+# Once an over arrives, the first of the following ones goes out before it is
+# handed to the consumer; only innings boundaries cost a serial hop.
+# feed_charts() turns the overs into the series the worm, manhattan and
+# run-rate endpoints publish, one per innings, super overs left out:
+#   manhattan y  - runs per over (team_score.runs, extras included)
+#   worm y       - running sum of those
+#   run-rate y   - cumulative runs * 6 / cumulative legal balls (team_score.ball_count)
+#   y2_wickets   - team_score.is_wicket per over
+# Charts also list innings without a ball bowled (not started yet, forfeited)
+# as empty series; the feed never mentions those, so only innings with overs
+# are compared, in order.
+# Every ball is reduced with bincount/cumsum over flat arrays, so a Test
+# match with hundreds of overs aggregates in milliseconds.
+
+BALL_BY_BALL = "match/{match_key}/ball-by-ball/{over_key}/"
+CHART = "match/{match_key}/{kind}/"
+FIRST_OVER = "FIRST-OVER"
+PREFETCH = 8
+SUPER_OVER = "superover"
+
+
+def over_key(index):
+    return f"{index['innings']}_{index['over_number']}"
+
+
+def parse_over_key(key):
+    """(innings, over_number) of an over key like "b_1_2" or "A1_1"; None for FIRST-OVER and other keys."""
+    innings, _, number = (key or "").rpartition("_")
+    if not innings or not number.isdigit():
+        return None
+    return innings, int(number)
+
+
+def following_keys(key, count, step=1):
+    # the next `count` keys of the same innings, `step` overs apart, assuming the feed does not skip overs
+    parsed = parse_over_key(key)
+    if parsed is None:
+        return []
+    innings, number = parsed
+    numbers = [number + step * n for n in range(1, count + 1)]
+    return [f"{innings}_{n}" for n in numbers if n >= 1]
+
+
+async def async_iter_overs(base_url, headers, match_key, start=FIRST_OVER, innings=None, prefetch=PREFETCH):
+    """Over documents from `start` along next_over_key, yielded one at a time while the next ones download.
+
+    With `innings`, stops before the first over of another innings. Raises
+    AssertionError on a broken chain."""
+    requested = {}
+
+    def request(key):
+        if key not in requested:
+            url = f"{base_url}{BALL_BY_BALL.format(match_key=match_key, over_key=key)}"
+            requested[key] = asyncio.ensure_future(async_get(url, headers))
+        return requested[key]
+
+    def window(key):
+        for ahead in [key] + following_keys(key, prefetch):
+            request(ahead)
+
+    seen, key = set(), start
+    try:
+        while key is not None:
+            window(key)
+            response = await requested.pop(key)
+            assert response.status_code == 200, f"ball-by-ball {key}: HTTP {response.status_code}"
+            data = response.json()["data"]
+            index = data["over"]["index"]
+            current = (index["innings"], index["over_number"])
+            assert parse_over_key(key) in (None, current), f"ball-by-ball {key}: serves over {over_key(index)}"
+            assert current not in seen, f"ball-by-ball {key}: over {over_key(index)} comes round again"
+            seen.add(current)
+            key = data["next_over_key"]
+            following = parse_over_key(key)
+            if innings is not None and (following is None or following[0] != innings):
+                key = None
+            if key is not None:
+                # in flight while the consumer works on this over
+                window(key)
+            yield data
+    finally:
+        # speculative requests past the end of an innings are simply dropped
+        await asyncio.gather(*requested.values(), return_exceptions=True)
+
+
+def async_iter_innings(base_url, headers, match_key, innings, prefetch=PREFETCH):
+    """Over documents of one innings ("a_1", "b_2", "a_superover"), first over first."""
+    return async_iter_overs(base_url, headers, match_key, f"{innings}_1", innings, prefetch)
+
+
+async def async_fetch_feed(base_url, headers, match_key, prefetch=PREFETCH):
+    """Every over document of a match in feed order; raises AssertionError on a broken chain."""
+    return [over async for over in async_iter_overs(base_url, headers, match_key, prefetch=prefetch)]
+
+
+def stored_feed(store, match_key):
+    """Over documents of a match from a stand-in fixture store in feed order, None when it has none."""
+    overs, seen = [], set()
+    over = store.get(BALL_BY_BALL.format(match_key=match_key, over_key=FIRST_OVER))
+    while isinstance(over, dict) and "over" in over:
+        key = over["next_over_key"]
+        overs.append(over)
+        if key is None or key in seen:
+            break
+        seen.add(key)
+        over = store.get(BALL_BY_BALL.format(match_key=match_key, over_key=key))
+    return overs or None
+
+
+def feed_charts(overs):
+    """{"worm": ..., "manhattan": ..., "run-rate": ...} series recomputed from over documents."""
+    innings_order, overs_of = [], {}
+    runs, wickets, legal, slot = [], [], [], []
+    for over in overs:
+        index = over["over"]["index"]
+        innings = index["innings"]
+        if SUPER_OVER in str(innings):
+            continue
+        if innings not in overs_of:
+            innings_order.append(innings)
+            overs_of[innings] = 0
+        overs_of[innings] = max(overs_of[innings], index["over_number"])
+        balls = over["over"]["balls"]
+        position = (innings_order.index(innings), index["over_number"] - 1)
+        slot.extend([position] * len(balls))
+        runs.extend(ball["team_score"]["runs"] for ball in balls)
+        wickets.extend(ball["team_score"]["is_wicket"] for ball in balls)
+        legal.extend(ball["team_score"]["ball_count"] for ball in balls)
+
+    lengths = np.array([overs_of[innings] for innings in innings_order], dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    slots = np.array(slot, dtype=np.int64).reshape(-1, 2)
+    flat = starts[slots[:, 0]] + slots[:, 1] if len(slots) else np.zeros(0, dtype=np.int64)
+    total = int(lengths.sum())
+    per_over = np.bincount(flat, weights=np.array(runs, dtype=float), minlength=total)
+    fallen = np.bincount(flat, weights=np.array(wickets, dtype=float), minlength=total)
+    balls = np.bincount(flat, weights=np.array(legal, dtype=float), minlength=total)
+
+    segment = np.repeat(np.arange(len(lengths)), lengths)
+    cumulative = np.cumsum(per_over) - np.concatenate(([0.0], np.cumsum(per_over)))[starts][segment]
+    cumulative_balls = np.cumsum(balls) - np.concatenate(([0.0], np.cumsum(balls)))[starts][segment]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(cumulative_balls > 0, np.round(cumulative * 6 / cumulative_balls, 2), 0.0)
+
+    def split(values):
+        return [chunk.tolist() for chunk in np.split(values, np.cumsum(lengths)[:-1])] if len(lengths) else []
+
+    common = {"x": list(range(1, int(lengths.max(initial=0)) + 1)), "y2_wickets": split(fallen)}
+    return {
+        "worm": dict(common, y=split(cumulative)),
+        "manhattan": dict(common, y=split(per_over)),
+        "run-rate": dict(common, y=split(rate)),
+    }
+
+
+def _diff(chart, feed, kind, field, tolerance, errors):
+    kept = [i for i, series in enumerate(chart["y"]) if series]
+    published = Series([{field: [chart[field][i] for i in kept]}], field)
+    derived = Series([feed], field)
+    if len(published.lengths) != len(derived.lengths):
+        errors.append(f"{kind}.{field}: {len(published.lengths)} innings with overs in the chart, "
+                      f"{len(derived.lengths)} in the feed")
+        return
+    uneven = published.lengths != derived.lengths
+    for segment in np.flatnonzero(uneven):
+        errors.append(f"{kind}.{field}[{kept[segment]}]: {published.lengths[segment]} overs in the chart, "
+                      f"{derived.lengths[segment]} in the feed")
+    if uneven.any():
+        return
+    # 1e-9: a tie like 5.475 may round either way, landing exactly one tolerance apart
+    off = ~(np.abs(published.values - derived.values) <= tolerance + 1e-9)
+    for index in np.flatnonzero(off):
+        errors.append(f"{kind}.{field}[{kept[published.segment[index]]}][{published.over[index] - 1}]: "
+                      f"chart {published.values[index]:g} != feed {derived.values[index]:g}")
+
+
+def compare_charts(overs, charts):
+    """Differences between published charts ({kind: data}, any subset) and the ones the feed implies."""
+    derived = feed_charts(overs)
+    errors = []
+    for kind in KINDS:
+        chart = charts.get(kind)
+        if chart is None:
+            continue
+        _diff(chart, derived[kind], kind, "y", RATE_TOLERANCE if kind == "run-rate" else 0, errors)
+        _diff(chart, derived[kind], kind, "y2_wickets", 0, errors)
+    return errors
+
+
+async def async_check_match(base_url, headers, match_key, prefetch=PREFETCH):
+    """Fetch the feed and the three charts of a match together and return every divergence."""
+    urls = [f"{base_url}{CHART.format(match_key=match_key, kind=kind)}" for kind in KINDS]
+    overs, *responses = await asyncio.gather(
+        async_fetch_feed(base_url, headers, match_key, prefetch),
+        *(async_get(url, headers) for url in urls),
+    )
+    for kind, response in zip(KINDS, responses):
+        assert response.status_code == 200, f"{kind}: HTTP {response.status_code}"
+    return compare_charts(overs, {kind: response.json()["data"] for kind, response in zip(KINDS, responses)})
@@ -0,0 +1,139 @@
+import os
+import json
+import base64
+import hashlib
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Record/replay cassettes
+# In "record" mode every request made through utils/request_handler.py is saved
+# with its response under CASSETTE_DIR, one JSON file per request fingerprint.
+# In "replay" mode the same fingerprints are answered from disk with no network.
+# A fingerprint is built from the method, URL, normalized payload (operationName
+# + variables for GraphQL) and the role of the auth token headers, so valid,
+# invalid, missing and empty token calls to one URL are stored separately.
+# Tokens and the project key read from the environment are recorded by variable
+# name rather than value, so a replay machine without the real secrets matches.
+
+CASSETTE_DIR = "cassettes"
+TOKEN_HEADERS = ("rs-token", "rztoken")
+TOKEN_ENV_VARS = ("REST_TOKEN", "REST_TOKEN_1", "GRAPHQL_TOKEN")
+URL_ENV_VARS = ("PROJECT_KEY",)
+# headers describing the wire encoding no longer apply to the decoded body we store
+DROPPED_RESPONSE_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection")
+
+mode = None
+directory = CASSETTE_DIR
+
+
+class CassetteNotFound(LookupError):
+    pass
+
+
+def configure(new_mode=None, new_directory=None):
+    global mode, directory
+    mode = new_mode
+    directory = new_directory or CASSETTE_DIR
+    if mode == "record":
+        os.makedirs(directory, exist_ok=True)
+    elif mode == "replay":
+        for name in TOKEN_ENV_VARS + URL_ENV_VARS:
+            os.environ.setdefault(name, f"replay-{name}")
+
+
+def normalize_payload(payload):
+    if payload is None:
+        return None
+    if isinstance(payload, dict) and "query" in payload:
+        # GraphQL: the query text is fixed per operation, variables select the data
+        return {"operationName": payload.get("operationName"), "variables": payload.get("variables") or {}}
+    return payload
+
+
+def _token_role(value):
+    if value is None:
+        return "missing"
+    if value == "":
+        return "empty"
+    for name in TOKEN_ENV_VARS:
+        if value == os.getenv(name):
+            return name
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _token_roles(headers):
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    return [[name, _token_role(headers.get(name))] for name in TOKEN_HEADERS]
+
+
+def _normalize_url(url):
+    for name in URL_ENV_VARS:
+        value = os.getenv(name)
+        if value:
+            url = url.replace(value, "{" + name + "}")
+    return url
+
+
+def fingerprint(method, url, headers=None, payload=None):
+    parts = [method.upper(), _normalize_url(url), normalize_payload(payload), _token_roles(headers)]
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def _path(key):
+    return os.path.join(directory, f"{key}.json")
+
+
+def record(method, url, headers, payload, response):
+    content = response.content
+    body = {}
+    try:
+        body["body"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        body["body_base64"] = base64.b64encode(content).decode("ascii")
+
+    entry = {
+        "request": {
+            "method": method.upper(),
+            "url": _normalize_url(url),
+            "payload": normalize_payload(payload),
+        },
+        "response": {
+            "status_code": response.status_code,
+            "headers": stored_headers(response),
+            **body,
+        },
+    }
+    with open(_path(fingerprint(method, url, headers, payload)), "w") as f:
+        json.dump(entry, f, indent=2)
+
+
+def load(method, url, headers=None, payload=None):
+    path = _path(fingerprint(method, url, headers, payload))
+    if not os.path.exists(path):
+        raise CassetteNotFound(f"No cassette recorded for {method.upper()} {url} ({path})")
+    with open(path) as f:
+        return json.load(f)
+
+
+def stored_headers(response):
+    return {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_RESPONSE_HEADERS}
+
+
+def build_response(method, url, status_code, headers, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+    response.url = url
+    response.request = requests.Request(method.upper(), url).prepare()
+    return response
+
+
+def replay(method, url, headers=None, payload=None):
+    recorded = load(method, url, headers, payload)["response"]
+    if "body_base64" in recorded:
+        content = base64.b64decode(recorded["body_base64"])
+    else:
+        content = recorded["body"].encode("utf-8")
+    return build_response(method, url, recorded["status_code"], recorded["headers"], content)
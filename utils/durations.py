@@ -0,0 +1,52 @@
+import os
+import json
+
+# Test durations persisted between runs
+# conftest.py records how long every test took (setup + call + teardown) into
+# DURATIONS_FILE, merged with what earlier runs recorded. run.py reads it back
+# to split the suite into shards of roughly equal wall time.
+
+DURATIONS_FILE = ".test_durations.json"
+
+
+def load_durations(path=DURATIONS_FILE):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def save_durations(durations, path=DURATIONS_FILE):
+    merged = load_durations(path)
+    merged.update(durations)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(merged, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def module_costs(durations, modules):
+    # seconds per test module; modules never timed get the average so they are not all lumped last
+    costs = {}
+    for node_id, seconds in durations.items():
+        module = node_id.split("::", 1)[0]
+        costs[module] = costs.get(module, 0) + seconds
+    known = [costs[m] for m in modules if m in costs]
+    default = sum(known) / len(known) if known else 1.0
+    return {module: costs.get(module, default) for module in modules}
+
+
+def lpt_shards(costs, workers, first=()):
+    """Longest-processing-time-first: hand each module, longest first, to the least loaded shard.
+
+    Modules in `first` are placed before the rest and run first within their shard."""
+    shards = [{"modules": [], "cost": 0.0} for _ in range(max(1, workers))]
+    ordered = sorted(costs, key=lambda module: (module not in first, -costs[module], module))
+    for module in ordered:
+        shard = min(shards, key=lambda s: s["cost"])
+        shard["modules"].append(module)
+        shard["cost"] += costs[module]
+    return [shard for shard in shards if shard["modules"]]
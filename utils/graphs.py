@@ -0,0 +1,238 @@
+import sys
+import argparse
+import time
+import numpy as np
+
+# Semantic checks for the worm, manhattan and run-rate charts
+# All three carry one series per innings: y[i][k] is innings i after over k+1,
+# y2_wickets[i][k] the wickets that fell in that over, and x the over numbers.
+#   worm      - cumulative runs, never decreasing, equal to the running sum of the manhattan bars
+#   manhattan - runs per over, never negative
+#   run-rate  - cumulative runs / overs (two decimals); the last over of an
+#               innings may be unfinished, so there it lies between runs/n and runs/(n-1)
+#   y2_wickets - non-negative, at most MAX_WICKETS per innings
+# Every innings series of every chart in a batch is laid end to end in one
+# flat array, so a crawled corpus is checked with a handful of array
+# operations instead of Python loops over overs.
+#
+# python -m utils.graphs --fixtures standin/fixtures --cassettes cassettes
+
+MAX_WICKETS = 10
+RATE_TOLERANCE = 0.01
+KINDS = ("worm", "manhattan", "run-rate")
+
+
+class Series:
+    """The `field` series of many charts, concatenated: values plus where each innings starts."""
+
+    def __init__(self, charts, field):
+        lengths, values = [], []
+        for chart in charts:
+            for series in chart[field]:
+                lengths.append(len(series))
+                values.extend(series)
+        self.counts = np.array([len(chart[field]) for chart in charts], dtype=np.int64)
+        self.lengths = np.array(lengths, dtype=np.int64)
+        self.values = np.array(values, dtype=float)
+        self.starts = np.cumsum(self.lengths) - self.lengths
+        # innings (segment) of every value and its over number within the innings
+        self.segment = np.repeat(np.arange(len(self.lengths)), self.lengths)
+        self.over = np.arange(len(self.values)) - np.repeat(self.starts, self.lengths) + 1
+        self.last = self.over == np.repeat(self.lengths, self.lengths)
+        # chart and innings index of every segment, for error paths
+        self.chart = np.repeat(np.arange(len(charts)), self.counts)
+        self.innings = np.arange(len(self.lengths)) - np.repeat(np.cumsum(self.counts) - self.counts, self.counts)
+
+    def running_sum(self):
+        total = np.cumsum(self.values)
+        before = np.concatenate(([0.0], total))[self.starts]
+        return total - np.repeat(before, self.lengths)
+
+    def per_innings_sum(self):
+        return np.bincount(self.segment, weights=self.values, minlength=len(self.lengths))
+
+    def path(self, names, field, index):
+        segment = self.segment[index]
+        return f"{names[self.chart[segment]]}.{field}[{self.innings[segment]}][{self.over[index] - 1}]"
+
+    def innings_path(self, names, field, segment):
+        return f"{names[self.chart[segment]]}.{field}[{self.innings[segment]}]"
+
+
+def _report(errors, mask, describe):
+    for index in np.flatnonzero(mask):
+        errors.append(describe(index))
+
+
+def _numbers(values, nullable=True):
+    # what np.array(..., dtype=float) accepts without raising; None becomes NaN and is reported by _numeric
+    return all((nullable and value is None) or (isinstance(value, (int, float)) and not isinstance(value, bool))
+               for value in values)
+
+
+def _shape(chart, name, errors):
+    """Check that a chart's series line up, before the array checks run on them.
+
+    y[i][k] is over k + 1 of innings i, so x must number the overs 1, 2, 3, ...
+    x may run past the longest innings (a chart can list overs not bowled
+    yet), but an innings may never have more overs than x."""
+    before = len(errors)
+    x, y, wickets = chart.get("x"), chart.get("y"), chart.get("y2_wickets")
+    if not all(isinstance(value, list) for value in (x, y, wickets)):
+        errors.append(f"{name}: x, y and y2_wickets must be lists")
+        return False
+    if len(y) != len(wickets):
+        errors.append(f"{name}: {len(y)} innings in y, {len(wickets)} in y2_wickets")
+        return False
+    if not _numbers(x, nullable=False):
+        errors.append(f"{name}.x: over numbers must be numbers")
+        return False
+    for i, (runs, fallen) in enumerate(zip(y, wickets)):
+        if not isinstance(runs, list) or not isinstance(fallen, list):
+            errors.append(f"{name}.y[{i}]: each innings must be a list")
+            return False
+        for field, values in (("y", runs), ("y2_wickets", fallen)):
+            if not _numbers(values):
+                errors.append(f"{name}.{field}[{i}]: values must be numbers or null")
+        if len(runs) != len(fallen):
+            errors.append(f"{name}.y[{i}]: {len(runs)} overs in y, {len(fallen)} in y2_wickets")
+        if len(runs) > len(x):
+            errors.append(f"{name}.y[{i}]: {len(runs)} overs but x has {len(x)}")
+    wrong = next((k for k, number in enumerate(x) if number != k + 1), None)
+    if wrong is not None:
+        errors.append(f"{name}.x[{wrong}]: over number {x[wrong]!r}, expected {wrong + 1}")
+    return len(errors) == before
+
+
+def _numeric(series, names, field, errors):
+    bad = ~np.isfinite(series.values) | (series.values < 0)
+    _report(errors, bad, lambda i: f"{series.path(names, field, i)}: {series.values[i]:g} is not a non-negative number")
+    return not bad.any()
+
+
+def _check_wickets(charts, names, errors):
+    wickets = Series(charts, "y2_wickets")
+    if not _numeric(wickets, names, "y2_wickets", errors):
+        return
+    totals = wickets.per_innings_sum()
+    _report(errors, totals > MAX_WICKETS,
+            lambda s: f"{wickets.innings_path(names, 'y2_wickets', s)}: {int(totals[s])} wickets in one innings")
+
+
+def _check_worm(worm, names, errors):
+    falling = np.zeros(len(worm.values), dtype=bool)
+    falling[1:] = (np.diff(worm.values) < 0) & (worm.over[1:] > 1)
+    _report(errors, falling, lambda i: f"{worm.path(names, 'y', i)}: cumulative runs drop "
+                                       f"from {worm.values[i - 1]:g} to {worm.values[i]:g}")
+
+
+def _check_worm_manhattan(worm, manhattan, names, errors):
+    uneven = worm.lengths != manhattan.lengths
+    _report(errors, uneven, lambda s: f"{worm.innings_path(names, 'y', s)}: worm has {worm.lengths[s]} overs, "
+                                      f"manhattan {manhattan.lengths[s]}")
+    if uneven.any():
+        return
+    expected = manhattan.running_sum()
+    _report(errors, worm.values != expected,
+            lambda i: f"{worm.path(names, 'y', i)}: worm {worm.values[i]:g} != running sum of manhattan {expected[i]:g}")
+
+
+def _check_run_rate(rate, worm, names, errors):
+    uneven = rate.lengths != worm.lengths
+    _report(errors, uneven, lambda s: f"{rate.innings_path(names, 'y', s)}: run rate has {rate.lengths[s]} overs, "
+                                      f"worm {worm.lengths[s]}")
+    if uneven.any():
+        return
+    overs = rate.over.astype(float)
+    low = worm.values / overs - RATE_TOLERANCE
+    high = np.where(rate.last & (rate.over > 1), worm.values / np.maximum(overs - 1, 1), worm.values / overs)
+    # an unfinished first over can be anything from runs/1 up; only the lower bound applies
+    high = np.where(rate.last & (rate.over == 1), np.inf, high) + RATE_TOLERANCE
+    off = (rate.values < low) | (rate.values > high)
+    _report(errors, off, lambda i: f"{rate.path(names, 'y', i)}: run rate {rate.values[i]:g} != "
+                                   f"{worm.values[i]:g} runs / {rate.over[i]} overs")
+
+
+def validate_corpus(matches):
+    """Check many matches at once; `matches` yields (name, {"worm": ..., "manhattan": ..., "run-rate": ...}).
+
+    Any chart may be missing from a match. Returns every problem found, with its path."""
+    errors = []
+    charts = {kind: ([], []) for kind in KINDS}
+    pairs = {("worm", "manhattan"): ([], []), ("run-rate", "worm"): ([], [])}
+    for name, graphs in matches:
+        shaped = {}
+        for kind in KINDS:
+            chart = graphs.get(kind)
+            if chart is not None and _shape(chart, f"{name}.{kind}", errors):
+                shaped[kind] = chart
+                charts[kind][0].append(chart)
+                charts[kind][1].append(f"{name}.{kind}")
+        for (a, b), (found, labels) in pairs.items():
+            if a in shaped and b in shaped:
+                found.append((shaped[a], shaped[b]))
+                labels.append(f"{name}.{a}")
+
+    numeric = {}
+    for kind, (found, names) in charts.items():
+        if not found:
+            continue
+        _check_wickets(found, names, errors)
+        series = Series(found, "y")
+        numeric[kind] = _numeric(series, names, "y", errors)
+        if kind == "worm" and numeric[kind]:
+            _check_worm(series, names, errors)
+
+    found, names = pairs[("worm", "manhattan")]
+    if found and numeric.get("worm") and numeric.get("manhattan"):
+        _check_worm_manhattan(Series([w for w, _ in found], "y"), Series([m for _, m in found], "y"), names, errors)
+    found, names = pairs[("run-rate", "worm")]
+    if found and numeric.get("run-rate") and numeric.get("worm"):
+        _check_run_rate(Series([r for r, _ in found], "y"), Series([w for _, w in found], "y"), names, errors)
+    return errors
+
+
+def validate_graphs(worm=None, manhattan=None, run_rate=None, path="match"):
+    graphs = {"worm": worm, "manhattan": manhattan, "run-rate": run_rate}
+    return validate_corpus([(path, {kind: chart for kind, chart in graphs.items() if chart is not None})])
+
+
+def assert_graphs(worm=None, manhattan=None, run_rate=None, path="match"):
+    """Assert that the charts of one match are consistent, listing every problem in the failure message."""
+    errors = validate_graphs(worm, manhattan, run_rate, path)
+    assert not errors, f"{len(errors)} graph problem(s):\n  " + "\n  ".join(errors)
+
+
+def corpus(store):
+    # (match key, {kind: chart}) for every match in a stand-in fixture store with at least one chart
+    matches = {}
+    for path in store.paths():
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "match" and parts[2] in KINDS:
+            chart = store.get(path)
+            if isinstance(chart, dict):
+                matches.setdefault(parts[1], {})[parts[2]] = chart
+    return sorted(matches.items())
+
+
+def main():
+    from standin.store import build_store
+
+    parser = argparse.ArgumentParser(description="Check worm, manhattan and run-rate charts of a crawled corpus")
+    parser.add_argument("--fixtures", action="append", default=[], help="stand-in fixture directory")
+    parser.add_argument("--cassettes", action="append", default=[], help="recorded cassette directory")
+    args = parser.parse_args()
+
+    matches = corpus(build_store(args.fixtures, args.cassettes))
+    started = time.perf_counter()
+    errors = validate_corpus(matches)
+    seconds = time.perf_counter() - started
+    for error in errors[:200]:
+        print(error)
+    rate = len(matches) / seconds if seconds else float("inf")
+    print(f"{len(matches)} matches checked in {seconds:.3f}s ({rate:.0f}/s), {len(errors)} problem(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+import sys
+import argparse
+import time
+from utils.async_request_handler import async_get
+from utils.ball_by_ball import async_fetch_feed, stored_feed, PREFETCH
+
+# Invariants of the match detail (match/<key>/)
+# For every innings in play.innings, with the players' figures looked up as
+# players[<key>].score[<innings number>] ("a_1" -> "1", "b_superover" -> "superover"):
+#   score.runs          = batters' runs + extra_runs.extra = partnerships' runs
+#                         = bowlers' runs + byes + leg byes + penalties
+#   score.fours/sixes   = batters' fours/sixes
+#   score.balls         = bowlers' balls = balls_breakup.balls
+#   extra_runs.extra    = wide + no_ball + bye + leg_bye + penalty
+#   wickets             = len(wicket_order) >= bowlers' wickets (run outs are nobody's)
+#   wicket_order        - no repeats, all in batting_order, exactly the batters with a dismissal
+#   partnerships        - at most wickets + 1; an innings without them skips the partnerships' runs check
+# play.live is held to the innings it names: its score, recent_overs ball
+# keys all in related_balls, each ball in the right innings and over.
+# Given the ball-by-ball feed too, each innings' runs, wickets and legal balls
+# must equal the sums over its deliveries, and wicket_order their dismissals.
+# Everything is one pass over the innings with dict lookups into players and
+# related_balls, so a crawled tournament is checked in milliseconds:
+#
+# python -m utils.match_invariants --fixtures standin/fixtures --cassettes cassettes
+
+MATCH = "match/{match_key}/"
+EXTRAS = ("wide", "no_ball", "bye", "leg_bye", "penalty")
+
+
+def _figures(players, order, number, side):
+    # the batting or bowling score of each listed player in one innings
+    for player in order:
+        entry = ((players.get(player) or {}).get("score") or {}).get(number) or {}
+        yield player, entry.get(side) or {}
+
+
+def _feed_totals(overs):
+    # {innings: [runs, wickets, legal balls, dismissed players in order]} summed over the deliveries
+    totals = {}
+    for over in overs:
+        for ball in over["over"]["balls"]:
+            team = ball["team_score"]
+            total = totals.setdefault(ball["innings"], [0, 0, 0, []])
+            total[0] += team["runs"]
+            total[1] += team["is_wicket"]
+            total[2] += team["ball_count"]
+            if ball.get("wicket"):
+                total[3].append(ball["wicket"]["player_key"])
+    return totals
+
+
+def _check_equal(errors, path, value, expected, what):
+    if value != expected:
+        errors.append(f"{path}: {value!r} != {expected!r} {what}")
+
+
+def _check_innings(key, innings, players, feed, path, errors):
+    number = key.split("_", 1)[1]
+    score = innings.get("score") or {}
+    runs = score.get("runs")
+    extras = innings.get("extra_runs") or {}
+    wicket_order = innings.get("wicket_order") or []
+    batting_order = innings.get("batting_order") or []
+
+    _check_equal(errors, f"{path}.extra_runs.extra", extras.get("extra"),
+                 sum(extras.get(name) or 0 for name in EXTRAS), "sum of " + " + ".join(EXTRAS))
+
+    bat_runs = fours = sixes = 0
+    dismissed = set()
+    for player, batting in _figures(players, batting_order, number, "batting"):
+        figures = batting.get("score") or {}
+        bat_runs += figures.get("runs") or 0
+        fours += figures.get("fours") or 0
+        sixes += figures.get("sixes") or 0
+        if batting.get("dismissal"):
+            dismissed.add(player)
+    _check_equal(errors, f"{path}.score.runs", runs, bat_runs + (extras.get("extra") or 0),
+                 f"batters' runs {bat_runs} + extras {extras.get('extra')}")
+    _check_equal(errors, f"{path}.score.fours", score.get("fours"), fours, "batters' fours")
+    _check_equal(errors, f"{path}.score.sixes", score.get("sixes"), sixes, "batters' sixes")
+
+    bowl_runs = bowl_balls = bowl_wickets = 0
+    for _, bowling in _figures(players, innings.get("bowling_order") or [], number, "bowling"):
+        figures = bowling.get("score") or {}
+        bowl_runs += figures.get("runs") or 0
+        bowl_balls += figures.get("balls") or 0
+        bowl_wickets += figures.get("wickets") or 0
+    not_bowler = sum(extras.get(name) or 0 for name in ("bye", "leg_bye", "penalty"))
+    _check_equal(errors, f"{path}.score.runs", runs, bowl_runs + not_bowler,
+                 f"bowlers' runs {bowl_runs} + byes, leg byes and penalties {not_bowler}")
+    _check_equal(errors, f"{path}.score.balls", score.get("balls"), bowl_balls, "bowlers' balls")
+    _check_equal(errors, f"{path}.balls_breakup.balls", (innings.get("balls_breakup") or {}).get("balls"),
+                 score.get("balls"), "score.balls")
+
+    wickets = innings.get("wickets")
+    _check_equal(errors, f"{path}.wickets", wickets, len(wicket_order), "entries in wicket_order")
+    if isinstance(wickets, int) and bowl_wickets > wickets:
+        errors.append(f"{path}.wickets: bowlers took {bowl_wickets} of {wickets}")
+    batted = set(batting_order)
+    repeated = len(wicket_order) - len(set(wicket_order))
+    if repeated:
+        errors.append(f"{path}.wicket_order: {repeated} player(s) out twice")
+    missing = [player for player in wicket_order if player not in batted]
+    if missing:
+        errors.append(f"{path}.wicket_order: {missing} never in batting_order")
+    if dismissed != set(wicket_order):
+        errors.append(f"{path}.wicket_order: dismissed batters {sorted(dismissed - set(wicket_order))} missing, "
+                      f"{sorted(set(wicket_order) - dismissed)} without a dismissal")
+
+    # an innings published without partnerships is not checked against them
+    partnerships = innings.get("partnerships") or []
+    if partnerships:
+        _check_equal(errors, f"{path}.score.runs", runs,
+                     sum((p.get("score") or {}).get("runs") or 0 for p in partnerships), "partnerships' runs")
+    if isinstance(wickets, int) and len(partnerships) > wickets + 1:
+        errors.append(f"{path}.partnerships: {len(partnerships)} partnerships for {wickets} wickets")
+
+    if feed is not None:
+        total = feed.get(key)
+        if total is None:
+            if score.get("balls"):
+                errors.append(f"{path}: no deliveries in the ball-by-ball feed")
+            return
+        _check_equal(errors, f"{path}.score.runs", runs, total[0], "runs off the deliveries")
+        _check_equal(errors, f"{path}.wickets", wickets, total[1], "wickets off the deliveries")
+        _check_equal(errors, f"{path}.score.balls", score.get("balls"), total[2], "legal deliveries")
+        _check_equal(errors, f"{path}.wicket_order", wicket_order, total[3], "dismissals in the feed")
+
+
+def _check_live(play, path, errors):
+    live = play.get("live") or {}
+    key = live.get("innings")
+    if key is None:
+        return
+    innings = (play.get("innings") or {}).get(key)
+    if innings is None:
+        errors.append(f"{path}.live.innings: {key!r} is not in play.innings")
+        return
+    score, live_score = innings.get("score") or {}, live.get("score") or {}
+    for name in ("runs", "balls"):
+        _check_equal(errors, f"{path}.live.score.{name}", live_score.get(name), score.get(name),
+                     f"play.innings[{key}].score.{name}")
+    _check_equal(errors, f"{path}.live.score.wickets", live_score.get("wickets"), innings.get("wickets"),
+                 f"play.innings[{key}].wickets")
+
+    related = play.get("related_balls") or {}
+    last = live.get("last_ball_key")
+    if last is not None and last not in related:
+        errors.append(f"{path}.live.last_ball_key: {last!r} not in related_balls")
+    for over in live.get("recent_overs") or []:
+        number = over.get("overnumber")
+        for ball_key in over.get("ball_keys") or []:
+            ball = related.get(ball_key)
+            where = f"{path}.live.recent_overs[{number}]"
+            if ball is None:
+                errors.append(f"{where}: ball {ball_key!r} not in related_balls")
+            elif ball.get("innings") != key:
+                errors.append(f"{where}: ball {ball_key!r} is in innings {ball.get('innings')!r}, live is {key!r}")
+            elif isinstance(number, int) and (ball.get("overs") or [None])[0] != number - 1:
+                errors.append(f"{where}: ball {ball_key!r} is in over {ball['overs'][0] + 1}")
+
+
+def validate_match(match, overs=None, path="match"):
+    """Every broken invariant of a match detail document; `overs` (the ball-by-ball feed) adds the per-ball sums."""
+    errors = []
+    play = match.get("play") or {}
+    innings = play.get("innings") or {}
+    order = play.get("innings_order") or []
+    if sorted(order) != sorted(innings):
+        errors.append(f"{path}.play.innings_order: {order} but play.innings has {list(innings)}")
+    players = match.get("players") or {}
+    feed = _feed_totals(overs) if overs is not None else None
+    for key, doc in innings.items():
+        _check_innings(key, doc, players, feed, f"{path}.play.innings[{key}]", errors)
+    _check_live(play, path, errors)
+    return errors
+
+
+def assert_match(match, overs=None, path="match"):
+    """Assert that a match detail document is consistent, listing every problem in the failure message."""
+    errors = validate_match(match, overs, path)
+    assert not errors, f"{len(errors)} match invariant(s) broken:\n  " + "\n  ".join(errors)
+
+
+async def async_validate_match(base_url, headers, match_key, feed=True, prefetch=PREFETCH):
+    """Fetch a match detail and check it; with `feed`, also against the ball-by-ball feed of its innings."""
+    url = f"{base_url}{MATCH.format(match_key=match_key)}"
+    response = await async_get(url, headers)
+    assert response.status_code == 200, f"{match_key}: HTTP {response.status_code}"
+    match = response.json()["data"]
+    overs = None
+    if feed and (match.get("play") or {}).get("innings"):
+        # a match with no innings has no feed to fetch
+        overs = await async_fetch_feed(base_url, headers, match_key, prefetch)
+    return validate_match(match, overs, path=match_key)
+
+
+def corpus(store):
+    # (match key, match detail, ball-by-ball feed or None) for every match detail in a stand-in fixture store
+    for path in sorted(store.paths()):
+        parts = path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "match":
+            match = store.get(path)
+            if isinstance(match, dict):
+                yield parts[1], match, stored_feed(store, parts[1])
+
+
+def main():
+    from standin.store import build_store
+
+    parser = argparse.ArgumentParser(description="Check the invariants of every match detail in a crawled corpus")
+    parser.add_argument("--fixtures", action="append", default=[], help="stand-in fixture directory")
+    parser.add_argument("--cassettes", action="append", default=[], help="recorded cassette directory")
+    parser.add_argument("--no-feed", action="store_true", help="skip the sums over ball-by-ball deliveries")
+    args = parser.parse_args()
+
+    matches = list(corpus(build_store(args.fixtures, args.cassettes)))
+    started = time.perf_counter()
+    errors = []
+    for key, match, overs in matches:
+        errors += validate_match(match, None if args.no_feed else overs, path=key)
+    seconds = time.perf_counter() - started
+    for error in errors[:200]:
+        print(error)
+    rate = len(matches) / seconds if seconds else float("inf")
+    print(f"{len(matches)} matches checked in {seconds:.3f}s ({rate:.0f}/s), {len(errors)} problem(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+import sys
+import argparse
+import asyncio
+import time
+from utils.async_request_handler import async_get
+from utils.ball_by_ball import async_fetch_feed, stored_feed, following_keys, over_key, PREFETCH
+from utils.graphs import RATE_TOLERANCE
+
+# Over summaries reconciled with the ball-by-ball feed
+# The over-summary pages and the ball-by-ball feed of a match are fetched
+# together. The feed is then folded, delivery by delivery, into what every
+# summary should say:
+#   runs, wickets, fours, sixes, extras  - per over (team_score, batsman.is_four/is_six)
+#   wides, no_balls                      - deliveries of that ball_type in the over, counted like
+#                                          the bowlers' balls_breakup; a wide that runs for 5 is one wide
+#   leg_byes, byes                       - extra runs of that ball_type in the over (as extra_runs.bye)
+#   strikers[]                           - every batter who faced a ball in the over, with the
+#                                          innings figures up to the end of it: runs, balls,
+#                                          dot_balls, strike_rate, stats.dot_ball_percentage, is_dismissed
+#   bowlers[]                            - every bowler of the over, same cumulative figures: balls, runs,
+#                                          wickets, balls_breakup (delivery counts), wickets_breakup
+# Each over is one flat list of counters and each (innings, player) another,
+# so a Test match is aggregated in a single walk over its deliveries. Rates are
+# derived from the counters and compared within RATE_TOLERANCE, counts exactly.
+#
+# The pages form a doubly linked list: over-summary/ is the latest page, and
+# each page links to its neighbours by previous/next_page_key (the key of
+# their first over) and previous/next_page_index. async_walk_pages() follows
+# the links one way and checks that every page links back, that its keys and
+# indexes agree, and that overs neither skip nor repeat across pages. Pages of
+# an innings hold the same number of overs, so their keys are predictable: the
+# next `prefetch` of them are requested while the current page is awaited.
+#
+# Recorded pairs (pytest --record) are reconciled offline with:
+#
+# python -m utils.over_summary --cassettes cassettes
+
+OVER_SUMMARY = "match/{match_key}/over-summary/"
+OVER_SUMMARY_PAGE = "match/{match_key}/over-summary/{page_key}/"
+
+OVER_FIELDS = ("runs", "wickets", "fours", "sixes", "extras", "wides", "no_balls", "leg_byes", "byes")
+EXTRA_FIELDS = {"wide": "wides", "no_ball": "no_balls", "leg_bye": "leg_byes", "bye": "byes"}
+COUNTED = ("wide", "no_ball")  # counted per delivery; the other extras are summed as runs
+WICKET_KINDS = ("bowled", "caught", "lbw", "stumping")
+STRIKER_FIELDS = ("runs", "balls", "dot_balls")
+BOWLER_FIELDS = ("balls", "runs", "wickets", "balls_breakup.dot_balls", "balls_breakup.wides",
+                 "balls_breakup.no_balls", "balls_breakup.fours", "balls_breakup.sixes",
+                 *(f"wickets_breakup.{kind}" for kind in WICKET_KINDS))
+RATES = ("strike_rate", "stats.dot_ball_percentage")
+
+_EXTRA = {ball_type: OVER_FIELDS.index(name) for ball_type, name in EXTRA_FIELDS.items()}
+_WICKET = {kind: BOWLER_FIELDS.index(f"wickets_breakup.{kind}") for kind in WICKET_KINDS}
+
+
+def _rate(runs, balls):
+    return round(runs * 100 / balls, 2) if balls else 0
+
+
+def _field(item, name):
+    for part in name.split("."):
+        if not isinstance(item, dict) or part not in item:
+            return None
+        item = item[part]
+    return item
+
+
+def _follows(earlier, later):
+    # later is the next over after earlier: same innings one over on, or the first over of another innings
+    if later["innings"] == earlier["innings"]:
+        return later["over_number"] == earlier["over_number"] + 1
+    return later["over_number"] == 1
+
+
+def _check_page(key, data):
+    summaries = data.get("summaries") or []
+    assert summaries, f"over-summary {key}: page has no summaries"
+    assert over_key(summaries[0]["index"]) == key, (
+        f"over-summary {key}: page starts at over {over_key(summaries[0]['index'])}")
+    for side in ("previous", "next"):
+        link, index = data[f"{side}_page_key"], data[f"{side}_page_index"]
+        assert (link is None) == (index is None) and (index is None or over_key(index) == link), (
+            f"over-summary {key}: {side}_page_key {link!r} disagrees with {side}_page_index {index!r}")
+    for earlier, later in zip(summaries, summaries[1:]):
+        assert _follows(earlier["index"], later["index"]), (
+            f"over-summary {key}: over {over_key(later['index'])} follows {over_key(earlier['index'])}")
+
+
+async def async_walk_pages(base_url, headers, match_key, start=None, forward=True, prefetch=PREFETCH):
+    """Over-summary pages as (page key, data), from `start` (None: the latest page) to the end of the chain.
+
+    Raises AssertionError on a broken chain: a page that does not link back, a
+    gap or overlap in overs, a cycle, or a link that disagrees with its index."""
+    requested = {}
+
+    def request(key):
+        if key not in requested:
+            path = OVER_SUMMARY_PAGE.format(match_key=match_key, page_key=key) if key else \
+                OVER_SUMMARY.format(match_key=match_key)
+            requested[key] = asyncio.ensure_future(async_get(f"{base_url}{path}", headers))
+        return requested[key]
+
+    link, back = ("next_page_key", "previous_page_key") if forward else ("previous_page_key", "next_page_key")
+    seen, size, came_from, key = set(), 0, None, start
+    try:
+        while True:
+            # pages of an innings are `size` overs apart
+            for ahead in following_keys(key, prefetch, size if forward else -size) if size else []:
+                request(ahead)
+            response = await request(key)
+            assert response.status_code == 200, f"over-summary {key}: HTTP {response.status_code}"
+            data = response.json()["data"]
+            if key is None:
+                # the bare path serves the latest page; file it under its key too
+                key = over_key(data["summaries"][0]["index"])
+                requested.setdefault(key, requested[None])
+            _check_page(key, data)
+            assert key not in seen, f"over-summary {key}: page comes round again"
+            seen.add(key)
+            if came_from is not None:
+                assert data[back] == came_from[0], (
+                    f"over-summary {key}: {back} is {data[back]!r}, reached from {came_from[0]}")
+                earlier, later = (came_from[1], data) if forward else (data, came_from[1])
+                assert _follows(earlier["summaries"][-1]["index"], later["summaries"][0]["index"]), (
+                    f"over-summary: page {over_key(later['summaries'][0]['index'])} follows over "
+                    f"{over_key(earlier['summaries'][-1]['index'])}")
+            size = max(size, len(data["summaries"]))
+            came_from, following = (key, data), data[link]
+            if following is not None:
+                # in flight while the consumer works on this page
+                request(following)
+            yield key, data
+            if following is None:
+                break
+            key = following
+    finally:
+        # speculative requests past the end of an innings are simply dropped
+        await asyncio.gather(*requested.values(), return_exceptions=True)
+
+
+async def async_crawl_summaries(base_url, headers, match_key, prefetch=PREFETCH):
+    """Every over-summary page of a match as (page key, data), latest page first, links checked both ways.
+
+    Each page is yielded as soon as it arrives, while the pages before it are
+    already in flight. A page's next_page_key is checked against the page it
+    was reached from, so walking previous_page_key once verifies both links."""
+    latest = True
+    async for key, data in async_walk_pages(base_url, headers, match_key, None, False, prefetch):
+        if latest:
+            assert data["next_page_key"] is None, (
+                f"over-summary {key}: latest page links on to {data['next_page_key']!r}")
+            latest = False
+        yield key, data
+
+
+async def async_fetch_summaries(base_url, headers, match_key, prefetch=PREFETCH):
+    """Every summary of a match, oldest over first."""
+    pages = [data async for _, data in async_crawl_summaries(base_url, headers, match_key, prefetch)]
+    return [summary for data in reversed(pages) for summary in data["summaries"]]
+
+
+def feed_summaries(overs):
+    """{over key: expected summary} folded from over documents in feed order."""
+    expected = {}
+    batting, bowling, dismissed = {}, {}, set()
+    for over in overs:
+        index = over["over"]["index"]
+        innings = index["innings"]
+        totals = [0] * len(OVER_FIELDS)
+        strikers, bowlers = {}, {}
+        for ball in over["over"]["balls"]:
+            team, batsman, bowler = ball["team_score"], ball["batsman"], ball["bowler"]
+            totals[0] += team["runs"]
+            totals[1] += team["is_wicket"]
+            totals[2] += batsman["is_four"]
+            totals[3] += batsman["is_six"]
+            totals[4] += team["extras"]
+            extra = _EXTRA.get(ball["ball_type"])
+            if extra is not None:
+                totals[extra] += 1 if ball["ball_type"] in COUNTED else team["extras"]
+
+            player = batsman["player_key"]
+            score = strikers.get(player) or batting.setdefault((innings, player), [0] * len(STRIKER_FIELDS))
+            strikers[player] = score
+            score[0] += batsman["runs"]
+            score[1] += batsman["ball_count"]
+            score[2] += bool(batsman["ball_count"]) and batsman["runs"] == 0
+
+            player = bowler["player_key"]
+            figures = bowlers.get(player) or bowling.setdefault((innings, player), [0] * len(BOWLER_FIELDS))
+            bowlers[player] = figures
+            figures[0] += bowler["ball_count"]
+            figures[1] += bowler["runs"]
+            figures[2] += bowler["is_wicket"]
+            figures[3] += batsman["is_dot_ball"]
+            figures[4] += ball["ball_type"] == "wide"
+            figures[5] += ball["ball_type"] == "no_ball"
+            figures[6] += batsman["is_four"]
+            figures[7] += batsman["is_six"]
+            wicket = ball.get("wicket")
+            if wicket:
+                dismissed.add((innings, wicket["player_key"]))
+                if bowler["is_wicket"] and wicket["wicket_type"] in _WICKET:
+                    figures[_WICKET[wicket["wicket_type"]]] += 1
+
+        # figures are cumulative for the innings, so they are read off once the over is done
+        expected[over_key(index)] = {
+            **dict(zip(OVER_FIELDS, totals)),
+            "strikers": {player: {**dict(zip(STRIKER_FIELDS, score)),
+                                  "strike_rate": _rate(score[0], score[1]),
+                                  "stats.dot_ball_percentage": _rate(score[2], score[1]),
+                                  "is_dismissed": (innings, player) in dismissed}
+                         for player, score in strikers.items()},
+            "bowlers": {player: dict(zip(BOWLER_FIELDS, figures)) for player, figures in bowlers.items()},
+        }
+    return expected
+
+
+def _diff_players(key, side, published, derived, names, errors):
+    scores = {}
+    for item in published or []:
+        # is_dismissed sits next to the score, not in it
+        scores[item.get("player_key")] = {**(item.get("score") or {}), "is_dismissed": item.get("is_dismissed")}
+    only_summary = [player for player in scores if player not in derived]
+    only_feed = [player for player in derived if player not in scores]
+    if only_summary or only_feed:
+        errors.append(f"{key}.{side}: only in summary {only_summary}, only in feed {only_feed}")
+    for player, expected in derived.items():
+        if player not in scores:
+            continue
+        for name in names:
+            value, want = _field(scores[player], name), expected[name]
+            if name in RATES:
+                equal = isinstance(value, (int, float)) and abs(value - want) <= RATE_TOLERANCE + 1e-9
+            else:
+                equal = value == want
+            if not equal:
+                errors.append(f"{key}.{side}[{player}].{name}: summary {value!r} != feed {want!r}")
+
+
+def compare_summaries(overs, summaries):
+    """Every difference between published over summaries and the ball-by-ball feed, per over and field."""
+    derived = feed_summaries(overs)
+    published = {over_key(summary["index"]): summary for summary in summaries}
+    errors = []
+    only_summary = [key for key in published if key not in derived]
+    only_feed = [key for key in derived if key not in published]
+    if only_summary or only_feed:
+        errors.append(f"overs only in the summaries {only_summary}, only in the feed {only_feed}")
+    for key, expected in derived.items():
+        summary = published.get(key)
+        if summary is None:
+            continue
+        for name in OVER_FIELDS:
+            if summary.get(name) != expected[name]:
+                errors.append(f"{key}.{name}: summary {summary.get(name)!r} != feed {expected[name]!r}")
+        _diff_players(key, "strikers", summary.get("strikers"), expected["strikers"],
+                      STRIKER_FIELDS + RATES + ("is_dismissed",), errors)
+        _diff_players(key, "bowlers", summary.get("bowlers"), expected["bowlers"], BOWLER_FIELDS, errors)
+    return errors
+
+
+async def async_reconcile_match(base_url, headers, match_key, prefetch=PREFETCH):
+    """Fetch the over summaries and the ball-by-ball feed together and return every difference."""
+    overs, summaries = await asyncio.gather(
+        async_fetch_feed(base_url, headers, match_key, prefetch),
+        async_fetch_summaries(base_url, headers, match_key, prefetch),
+    )
+    return compare_summaries(overs, summaries)
+
+
+def stored_summaries(store, match_key):
+    """Every summary of a match from a fixture store, oldest over first; None unless the whole chain is stored."""
+    pages, seen = [], set()
+    data = store.get(OVER_SUMMARY.format(match_key=match_key))
+    while isinstance(data, dict) and data.get("summaries"):
+        pages.append(data)
+        key = data["previous_page_key"]
+        if key is None:
+            return [summary for page in reversed(pages) for summary in page["summaries"]]
+        if key in seen:
+            break
+        seen.add(key)
+        data = store.get(OVER_SUMMARY_PAGE.format(match_key=match_key, page_key=key))
+    return None
+
+
+def corpus(store):
+    # (match key, ball-by-ball feed, over summaries) for every match in a fixture store that has both
+    for path in sorted(store.paths()):
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "match" and parts[2] == "over-summary":
+            overs, summaries = stored_feed(store, parts[1]), stored_summaries(store, parts[1])
+            if overs and summaries:
+                yield parts[1], overs, summaries
+
+
+def main():
+    from standin.store import build_store
+
+    parser = argparse.ArgumentParser(description="Reconcile the over summaries of a crawled corpus with the feed")
+    parser.add_argument("--fixtures", action="append", default=[], help="stand-in fixture directory")
+    parser.add_argument("--cassettes", action="append", default=[], help="recorded cassette directory")
+    args = parser.parse_args()
+
+    matches = list(corpus(build_store(args.fixtures, args.cassettes)))
+    started = time.perf_counter()
+    errors = []
+    for key, overs, summaries in matches:
+        errors += [f"{key}: {error}" for error in compare_summaries(overs, summaries)]
+    seconds = time.perf_counter() - started
+    for error in errors[:200]:
+        print(error)
+    rate = len(matches) / seconds if seconds else float("inf")
+    print(f"{len(matches)} matches reconciled in {seconds:.3f}s ({rate:.0f}/s), {len(errors)} problem(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
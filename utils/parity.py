@@ -0,0 +1,315 @@
+import math
+from utils.common import normalize_string
+
+# REST-vs-GraphQL parity rules
+# A rule set says which parts of a GraphQL tree must agree with the REST tree:
+#   fields("key", "name", status=enum)  - compare these fields; bare names must be equal
+#   rename("gqlName", rule)             - the GraphQL side calls the field differently
+#   enum                                - equal after normalize_string (case, punctuation; None == "")
+#   approx(tol)                         - numbers equal within tol
+#   unordered(rule=same)                - lists equal as multisets, elements compared after `rule` (same or enum)
+#   by_key(key, rule)                   - lists joined on key (a field name or a function), then compared pairwise
+#   entries(rule, key=None)             - GraphQL [{key, value}] list against a REST dict keyed the same way;
+#                                         `key` maps GraphQL keys to REST keys (e.g. str.lower)
+#   in_order(rule)                      - lists compared index by index, equal length
+#   optional(rule)                      - only compared when both sides have a value
+#   missing(rule, value=None)           - a field absent on either side is compared as `value` (dict.get)
+# A rule set compiles into nested closures on first use. compare() then walks
+# both trees together in one pass and returns every mismatch with its path;
+# lists are aligned with dict lookups, not nested scans.
+
+
+_REQUIRED = object()  # marks fields that must be present on both sides
+
+
+class Rule:
+    _compiled = None
+
+    def compile(self):
+        if self._compiled is None:
+            self._compiled = self._build()
+        return self._compiled
+
+
+class _Same(Rule):
+
+    def _build(self):
+        def check(g, r, path, out):
+            if g != r:
+                out.append(f"{path}: graphql {g!r} != rest {r!r}")
+        return check
+
+
+class _Enum(Rule):
+
+    def _build(self):
+        def check(g, r, path, out):
+            if normalize_string(g) != normalize_string(r):
+                out.append(f"{path}: graphql {g!r} != rest {r!r}")
+        return check
+
+
+class Approx(Rule):
+
+    def __init__(self, tol):
+        self.tol = tol
+
+    def _build(self):
+        tol = self.tol
+
+        def check(g, r, path, out):
+            if g is None or r is None or isinstance(g, bool) or isinstance(r, bool):
+                if g != r:
+                    out.append(f"{path}: graphql {g!r} != rest {r!r}")
+            elif not math.isclose(float(g), float(r), rel_tol=0, abs_tol=tol):
+                out.append(f"{path}: graphql {g!r} != rest {r!r} (tolerance {tol})")
+        return check
+
+
+class Fields(Rule):
+
+    def __init__(self, names, rules):
+        self.rules = dict.fromkeys(names, same)
+        self.rules.update(rules)
+
+    def extend(self, *names, **rules):
+        return Fields((), {**self.rules, **dict.fromkeys(names, same), **rules})
+
+    def _build(self):
+        checks = []
+        for name, rule in self.rules.items():
+            gql_name = name
+            if isinstance(rule, Rename):
+                gql_name, rule = rule.name, rule.rule
+            fill = rule.value if isinstance(rule, Missing) else _REQUIRED
+            checks.append((name, gql_name, _compile(rule), isinstance(rule, Optional), fill))
+
+        def check(g, r, path, out):
+            if not isinstance(g, dict) or not isinstance(r, dict):
+                if g != r:
+                    out.append(f"{path}: graphql {_kind(g)} vs rest {_kind(r)}")
+                return
+            for name, gql_name, sub, skip_missing, fill in checks:
+                in_g, in_r = gql_name in g, name in r
+                if in_g and in_r:
+                    sub(g[gql_name], r[name], f"{path}.{name}", out)
+                elif fill is not _REQUIRED:
+                    sub(g.get(gql_name, fill), r.get(name, fill), f"{path}.{name}", out)
+                elif not skip_missing and (in_g or in_r):
+                    out.append(f"{path}.{name}: missing in {'rest' if in_g else 'graphql'}")
+                elif not skip_missing:
+                    out.append(f"{path}.{name}: missing on both sides")
+        return check
+
+
+class Rename(Rule):
+
+    def __init__(self, name, rule):
+        self.name = name
+        self.rule = rule
+
+    def _build(self):
+        return _compile(self.rule)
+
+
+class Missing(Rule):
+
+    def __init__(self, rule, value):
+        self.rule = rule
+        self.value = value
+
+    def _build(self):
+        return _compile(self.rule)
+
+
+class Optional(Rule):
+
+    def __init__(self, rule):
+        self.rule = rule
+
+    def _build(self):
+        sub = _compile(self.rule)
+
+        def check(g, r, path, out):
+            if g is not None and r is not None and g != {} and r != {}:
+                sub(g, r, path, out)
+        return check
+
+
+class Unordered(Rule):
+
+    def __init__(self, rule):
+        self.rule = rule
+
+    def _build(self):
+        normalize = normalize_string if self.rule is enum else None
+
+        def check(g, r, path, out):
+            g, r = g or [], r or []
+            if normalize is not None:
+                g, r = [normalize(v) for v in g], [normalize(v) for v in r]
+            counts = {}
+            for value in g:
+                counts[value] = counts.get(value, 0) + 1
+            for value in r:
+                counts[value] = counts.get(value, 0) - 1
+            only_g = sorted(str(v) for v, n in counts.items() if n > 0)
+            only_r = sorted(str(v) for v, n in counts.items() if n < 0)
+            if only_g or only_r:
+                out.append(f"{path}: only in graphql {only_g}, only in rest {only_r}")
+        return check
+
+
+class ByKey(Rule):
+
+    def __init__(self, key, rule):
+        self.key = key
+        self.rule = rule
+
+    def _build(self):
+        key = self.key if callable(self.key) else (lambda item, name=self.key: item[name])
+        sub = _compile(self.rule)
+
+        def index(items, side, path, out):
+            joined = {}
+            for item in items or []:
+                k = key(item)
+                if k in joined:
+                    out.append(f"{path}: duplicate key {k!r} in {side}")
+                joined[k] = item
+            return joined
+
+        def check(g, r, path, out):
+            g_items, r_items = index(g, "graphql", path, out), index(r, "rest", path, out)
+            _join(g_items, r_items, sub, path, out)
+        return check
+
+
+class Entries(Rule):
+
+    def __init__(self, rule, key=None):
+        self.rule = rule
+        self.key = key
+
+    def _build(self):
+        sub = _compile(self.rule)
+        rekey = self.key or (lambda k: k)
+
+        def check(g, r, path, out):
+            g_items = {rekey(entry["key"]): entry["value"] for entry in g or []}
+            _join(g_items, r or {}, sub, path, out)
+        return check
+
+
+class InOrder(Rule):
+
+    def __init__(self, rule):
+        self.rule = rule
+
+    def _build(self):
+        sub = _compile(self.rule)
+
+        def check(g, r, path, out):
+            g, r = g or [], r or []
+            if len(g) != len(r):
+                out.append(f"{path}: {len(g)} items in graphql, {len(r)} in rest")
+            for index, (g_item, r_item) in enumerate(zip(g, r)):
+                sub(g_item, r_item, f"{path}[{index}]", out)
+        return check
+
+
+def _join(g_items, r_items, sub, path, out):
+    only_g = [k for k in g_items if k not in r_items]
+    only_r = [k for k in r_items if k not in g_items]
+    if only_g:
+        out.append(f"{path}: keys only in graphql {only_g}")
+    if only_r:
+        out.append(f"{path}: keys only in rest {only_r}")
+    for k, g_item in g_items.items():
+        if k in r_items:
+            sub(g_item, r_items[k], f"{path}[{k}]", out)
+
+
+def _kind(value):
+    return "null" if value is None else type(value).__name__
+
+
+def _noop(g, r, path, out):
+    pass
+
+
+def _compile(rule):
+    # None: presence is enough (key joins without a per-item rule)
+    return _noop if rule is None else rule.compile()
+
+
+same = _Same()
+enum = _Enum()
+
+
+def approx(tol=1e-6):
+    return Approx(tol)
+
+
+def fields(*names, **rules):
+    return Fields(names, rules)
+
+
+def rename(name, rule=same):
+    return Rename(name, rule)
+
+
+def optional(rule):
+    return Optional(rule)
+
+
+def missing(rule, value=None):
+    return Missing(rule, value)
+
+
+def unordered(rule=same):
+    return Unordered(rule)
+
+
+def by_key(key, rule=None):
+    return ByKey(key, rule)
+
+
+def entries(rule, key=None):
+    return Entries(rule, key)
+
+
+def in_order(rule=same):
+    return InOrder(rule)
+
+
+def compare(graphql, rest, rule, path="data"):
+    """Every mismatch between the GraphQL and REST trees under `rule`."""
+    out = []
+    rule.compile()(graphql, rest, path, out)
+    return out
+
+
+def assert_parity(graphql, rest, rule, path="data"):
+    mismatches = compare(graphql, rest, rule, path)
+    assert not mismatches, f"{len(mismatches)} REST/GraphQL mismatch(es):\n  " + "\n  ".join(mismatches)
+
+
+# Shared rules
+
+TEAM_PARITY = fields("key", "code", "name")
+
+TOURNAMENT_PARITY = fields("key", "name", "short_name")
+
+# worm, manhattan and run-rate charts
+GRAPH_PARITY = fields("x", "y", "y2_wickets", "x_axis_label", "y_axis_label", "data_label", "y_colors",
+                      chart_type=enum, first_bat_team=TEAM_PARITY, first_bowl_team=TEAM_PARITY)
+
+# live and pre-match odds; entries are joined on team_key
+ODDS_PARITY = fields(
+    bet_odds=fields(automatic=fields(
+        decimal=by_key("team_key", fields("value")),
+        fractional=by_key("team_key", fields("value", "numerator", "denominator")),
+    )),
+    result_prediction=fields(automatic=fields(percentage=by_key("team_key", fields("value")))),
+)
@@ -1,12 +1,249 @@
+import os
+import copy
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import Future
+from http.cookiejar import DefaultCookiePolicy
 import requests
+from requests.adapters import HTTPAdapter
+from utils import cassette
+from utils.response_store import get_store
+
+# Connection pooling
+# A single keep-alive session is shared by every helper below so repeated calls
+# to the same host reuse TCP/TLS connections instead of handshaking per request.
+# HTTP_POOL_CONNECTIONS - number of per-host pools kept alive (one per host)
+# HTTP_POOL_MAXSIZE     - max connections kept open per host
+
+# The API authenticates by header only, so the session accepts no cookies:
+# nothing a valid-token response sets can leak into an invalid or missing-token test.
+
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _send(method, url, headers, payload=None):
+    # every request leaves through here so cassettes see REST and GraphQL alike
+    if cassette.mode == "replay":
+        return cassette.replay(method, url, headers, payload)
+    response = get_session().request(method, url, headers=headers, json=payload)
+    if cassette.mode == "record" and response.status_code != 304:
+        cassette.record(method, url, headers, payload, response)
+    return response
+
+
+# Conditional GET cache
+# Roanuz responses carry a `cache` envelope (key, expires, etag, max_age).
+# Bodies are kept per URL + token: fresh entries are served locally until
+# `expires`, stale ones are revalidated with If-None-Match so an unchanged
+# resource costs a 304 instead of the full document. Entries are keyed on the
+# URL and every request header, so different credentials never share one.
+# Off by default, so the server under test answers every request; HTTP_CACHE=1
+# turns it on.
+# When RESPONSE_STORE_DIR is set, entries also persist across sessions in the
+# on-disk store from utils/response_store.py, under a hash of the real URL and
+# header values: a rotated token or another PROJECT_KEY never finds them.
+# Auth checks pass fresh=True and always reach the server.
+
+HTTP_CACHE = os.getenv("HTTP_CACHE", "0") == "1"
+# conditional headers change per attempt, not per resource
+VOLATILE_HEADERS = {"if-none-match", "if-modified-since"}
+
+_cache = {}
+
+
+def _cache_key(url, headers):
+    items = ((name.lower(), value) for name, value in (headers or {}).items())
+    return (url, tuple(sorted(item for item in items if item[0] not in VOLATILE_HEADERS)))
+
+
+def _store_key(key):
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+
+def _cache_envelope(response):
+    if response.status_code != 200:
+        return None
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if not isinstance(body, dict) or not isinstance(body.get("cache"), dict):
+        return None
+    return body["cache"]
+
+
+def _cache_store(key, url, headers, response):
+    envelope = _cache_envelope(response)
+    if envelope is None:
+        return
+    expires = envelope.get("expires")
+    if not isinstance(expires, (int, float)):
+        expires = time.time() + (envelope.get("max_age") or 0)
+    entry = {
+        "response": response,
+        "etag": response.headers.get("ETag") or envelope.get("etag"),
+        "expires": expires,
+        "max_age": envelope.get("max_age") or 0,
+    }
+    _cache[key] = entry
+
+    store = get_store()
+    if store is not None:
+        store.put(_store_key(key), response.status_code,
+                  cassette.stored_headers(response), response.content,
+                  entry["etag"], entry["expires"], entry["max_age"])
+
+
+def _cache_load(key, url, headers):
+    entry = _cache.get(key)
+    if entry is not None:
+        return entry
+    store = get_store()
+    if store is None:
+        return None
+    stored = store.get(_store_key(key))
+    if stored is None:
+        return None
+    response = cassette.build_response("GET", url, stored["status_code"], stored["headers"], stored["content"])
+    entry = {
+        "response": response,
+        "etag": stored["etag"],
+        "expires": stored["expires"],
+        "max_age": stored["max_age"],
+    }
+    _cache[key] = entry
+    return entry
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def _cached_get(url, headers):
+    key = _cache_key(url, headers)
+    entry = _cache_load(key, url, headers)
+    if entry is not None and entry["expires"] > time.time():
+        return entry["response"]
+
+    request_headers = dict(headers or {})
+    if entry is not None and entry["etag"]:
+        request_headers["If-None-Match"] = entry["etag"]
+    response = _send("GET", url, request_headers)
+
+    if entry is not None and response.status_code == 304:
+        entry["expires"] = time.time() + entry["max_age"]
+        store = get_store()
+        if store is not None:
+            store.touch(_store_key(key), entry["expires"])
+        return entry["response"]
+    _cache_store(key, url, headers, response)
+    return response
+
+
+# Single-flight
+# Identical GETs issued while one is already in flight wait for that call and
+# share its response instead of hitting the API again.
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(key, func, *args):
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+    if not leader:
+        return future.result()
+
+    try:
+        result = func(*args)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _get(url, headers):
+    if HTTP_CACHE:
+        return _cached_get(url, headers)
+    return _send("GET", url, headers)
+
 
 #RestAPI
 
-def send_get_request(url, headers):
-    return requests.get(url, headers=headers)
+def send_get_request(url, headers, fresh=False):
+    # fresh=True skips the GET cache and the response store
+    if fresh:
+        return _single_flight(("fresh",) + request_key("GET", url, headers), _send, "GET", url, headers)
+    return _single_flight(request_key("GET", url, headers), _get, url, headers)
+
+
+# Session memoization (opt-in)
+# Tests that read the same resource can share one response per run, keyed by
+# method + URL + headers. Pass fresh=True to force a real server round trip.
+# Only 200s are kept, so a transient 5xx or 429 is retried by the next caller.
+
+_memo = {}
+
+
+def request_key(method, url, headers):
+    return (method, url, tuple(sorted((headers or {}).items())))
+
+
+def clear_memo():
+    _memo.clear()
+
+
+def send_memoized_get_request(url, headers, fresh=False):
+    key = request_key("GET", url, headers)
+    if not fresh and key in _memo:
+        return _memo[key]
+    if fresh:
+        response = _send("GET", url, headers)
+    else:
+        response = send_get_request(url, headers)
+    if response.status_code == 200:
+        _memo[key] = response
+    return response
 
 def send_post_request(url, headers, payload=None):
-    return requests.post(url, headers=headers, json=payload)
+    return _send("POST", url, headers, payload)
 
 
 
@@ -21,5 +258,21 @@ def make_graphql_request(url, headers, query, variables=None, operation_name=Non
         "variables": variables or {},
         "operationName": operation_name,
     }
-    response = requests.post(url, headers=headers, json=payload)
+    response = _send("POST", url, headers, payload)
     return response
+
+
+# GraphQL payload templates (data/**/*_query.json) are read and parsed once per
+# run. Every caller gets its own deep copy, so filling in variables never leaks
+# into the next test.
+
+_payloads = {}
+
+
+def load_graphql_payload(path):
+    path = str(path)
+    template = _payloads.get(path)
+    if template is None:
+        with open(path, "r") as f:
+            template = _payloads[path] = json.load(f)
+    return copy.deepcopy(template)
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+# Persistent response store
+# Response bodies are written once under objects/<sha256 of body> and shared by
+# every request fingerprint that returned the same bytes. index.json maps each
+# fingerprint to its body digest, status, headers and the envelope's cache
+# fields (etag / expires / max_age) so a later pytest session can serve a fresh
+# body or revalidate a stale one without downloading it again.
+# Disk usage is capped at max_bytes; the least recently used fingerprints are
+# dropped first and bodies no fingerprint points at are deleted.
+#
+# RESPONSE_STORE_DIR       - enables the store at this path (off when unset)
+# RESPONSE_STORE_MAX_BYTES - disk budget for stored bodies (default 256 MiB)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResponseStore:
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(directory, "objects")
+        self.index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index = self._read_index()
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except ValueError:
+            # a truncated index only costs us the cache, never the run
+            return {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest)
+
+    def _sizes(self):
+        sizes = {}
+        for entry in self.index.values():
+            sizes[entry["digest"]] = entry["size"]
+        return sizes
+
+    def get(self, key):
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return None
+            path = self._object_path(entry["digest"])
+            if not os.path.exists(path):
+                del self.index[key]
+                self._dirty = True
+                return None
+            entry["last_access"] = time.time()
+            self._dirty = True
+            entry = dict(entry)
+        with open(path, "rb") as f:
+            entry["content"] = f.read()
+        return entry
+
+    def touch(self, key, expires):
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is not None:
+                entry["expires"] = expires
+                entry["last_access"] = time.time()
+                self._dirty = True
+
+    def put(self, key, status_code, headers, content, etag, expires, max_age):
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+
+        with self._lock:
+            self.index[key] = {
+                "digest": digest,
+                "size": len(content),
+                "status_code": status_code,
+                "headers": headers,
+                "etag": etag,
+                "expires": expires,
+                "max_age": max_age,
+                "last_access": time.time(),
+            }
+            self._dirty = True
+            self._evict()
+
+    def _evict(self):
+        sizes = self._sizes()
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+        refs = {}
+        for entry in self.index.values():
+            refs[entry["digest"]] = refs.get(entry["digest"], 0) + 1
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            del self.index[key]
+            refs[entry["digest"]] -= 1
+            if refs[entry["digest"]] == 0:
+                total -= entry["size"]
+                try:
+                    os.remove(self._object_path(entry["digest"]))
+                except FileNotFoundError:
+                    pass
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            # merge with entries other processes flushed since we loaded
+            on_disk = self._read_index()
+            for key, entry in on_disk.items():
+                mine = self.index.get(key)
+                if mine is None or entry["last_access"] > mine["last_access"]:
+                    if os.path.exists(self._object_path(entry["digest"])):
+                        self.index[key] = entry
+            self._evict()
+            tmp = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.index, f)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    directory = os.getenv("RESPONSE_STORE_DIR")
+    if not directory:
+        return None
+    if _store is None or _store.directory != directory:
+        max_bytes = int(os.getenv("RESPONSE_STORE_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+        _store = ResponseStore(directory, max_bytes)
+    return _store
+
+
+def flush_store():
+    if _store is not None:
+        _store.flush()
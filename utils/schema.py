@@ -0,0 +1,215 @@
+# Declarative response schemas
+# A schema describes what a payload must contain:
+#   obj("key", "name", teams=TEAMS)  - a dict with these keys; bare names only have to be present,
+#                                      keyword fields are checked against their own schema
+#   list_of(TEAM, min_items=1)       - a list whose every element matches TEAM (min_items/max_items bound its length)
+#   map_of(PLAYER)                   - a dict keyed by anything (innings, player keys) whose values match PLAYER
+#   nullable(VENUE)                  - None, or a value matching VENUE
+#   optional(VENUE)                  - may be missing, None or empty; checked otherwise
+#   str, (int, float)                - isinstance check
+# compile_schema() turns a schema into nested closures once, and the resulting
+# validator walks a payload in a single pass. It collects every violation, with
+# the path where it happened, instead of stopping at the first assert.
+
+
+class Schema:
+    _compiled = None
+
+    def compile(self):
+        if self._compiled is None:
+            self._compiled = self._build()
+        return self._compiled
+
+
+class Obj(Schema):
+
+    def __init__(self, required=(), fields=None):
+        self.fields = dict.fromkeys(required)
+        self.fields.update(fields or {})
+
+    def extend(self, *required, **fields):
+        extended = dict(self.fields)
+        extended.update(dict.fromkeys(required))
+        extended.update(fields)
+        return Obj(fields=extended)
+
+    def _build(self):
+        checks = [(name, _compile(spec), isinstance(spec, Optional)) for name, spec in self.fields.items()]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected object, got {_type_name(value)}")
+                return
+            for name, sub, may_be_missing in checks:
+                if name not in value:
+                    if not may_be_missing:
+                        errors.append(f"{path}: missing '{name}'")
+                elif sub is not None:
+                    sub(value[name], f"{path}.{name}", errors)
+        return check
+
+
+class ListOf(Schema):
+
+    def __init__(self, item, min_items=0, max_items=None):
+        self.item = item
+        self.min_items = min_items
+        self.max_items = max_items
+
+    def _build(self):
+        item = _compile(self.item)
+        min_items, max_items = self.min_items, self.max_items
+
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected list, got {_type_name(value)}")
+                return
+            if len(value) < min_items:
+                errors.append(f"{path}: expected at least {min_items} items, got {len(value)}")
+            if max_items is not None and len(value) > max_items:
+                errors.append(f"{path}: expected at most {max_items} items, got {len(value)}")
+            if item is not None:
+                for index, element in enumerate(value):
+                    item(element, f"{path}[{index}]", errors)
+        return check
+
+
+class MapOf(Schema):
+
+    def __init__(self, value):
+        self.value = value
+
+    def _build(self):
+        item = _compile(self.value)
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected object, got {_type_name(value)}")
+                return
+            if item is not None:
+                for key, element in value.items():
+                    item(element, f"{path}[{key}]", errors)
+        return check
+
+
+class Nullable(Schema):
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def _build(self):
+        inner = _compile(self.inner)
+
+        def check(value, path, errors):
+            if value is not None and inner is not None:
+                inner(value, path, errors)
+        return check
+
+
+class Optional(Nullable):
+
+    def _build(self):
+        inner = _compile(self.inner)
+
+        def check(value, path, errors):
+            if value is None or value in ("", [], {}) or inner is None:
+                return
+            inner(value, path, errors)
+        return check
+
+
+def obj(*required, **fields):
+    return Obj(required, fields)
+
+
+def list_of(item=None, min_items=0, max_items=None):
+    return ListOf(item, min_items, max_items)
+
+
+def map_of(value=None):
+    return MapOf(value)
+
+
+def nullable(inner=None):
+    return Nullable(inner)
+
+
+def optional(inner=None):
+    return Optional(inner)
+
+
+def _type_name(value):
+    return "null" if value is None else type(value).__name__
+
+
+def _compile(spec):
+    # None means "present, anything goes"
+    if spec is None:
+        return None
+    if isinstance(spec, Schema):
+        return spec.compile()
+    if isinstance(spec, (type, tuple)):
+        expected = spec
+        label = "|".join(t.__name__ for t in spec) if isinstance(spec, tuple) else spec.__name__
+
+        def check(value, path, errors):
+            if not isinstance(value, expected):
+                errors.append(f"{path}: expected {label}, got {_type_name(value)}")
+        return check
+    raise TypeError(f"Not a schema: {spec!r}")
+
+
+def compile_schema(spec):
+    check = _compile(spec)
+
+    def validate(value, path="response"):
+        errors = []
+        if check is not None:
+            check(value, path, errors)
+        return errors
+    return validate
+
+
+def assert_schema(value, spec, path="response"):
+    """Assert that `value` matches `spec`, listing every violation in the failure message.
+
+    Schema objects compile on first use and keep the result, so module-level schemas are compiled once."""
+    check = spec.compile() if isinstance(spec, Schema) else _compile(spec)
+    errors = []
+    if check is not None:
+        check(value, path, errors)
+    assert not errors, f"{len(errors)} schema violation(s):\n  " + "\n  ".join(errors)
+
+
+# Shared schemas
+# Objects that appear in many endpoints. Endpoint-specific variants add fields
+# with .extend(), e.g. VENUE.extend("geolocation").
+
+NUMBER = (int, float)
+
+COUNTRY = obj("short_code", "code", "name", "official_name", "is_region")
+
+TEAM = obj("key", "code", "name", "alternate_name", "alternate_code", "gender_name", "country_code")
+
+TEAMS = obj(a=TEAM, b=TEAM)
+
+VENUE = obj("key", "name", "city", country=COUNTRY)
+
+TOURNAMENT = obj("key", "name", "short_name", "alternate_name", "alternate_short_name")
+
+ASSOCIATION = obj("key", "code", "name")
+
+PLAYER = obj("key", "name", "jersey_name", "legal_name", "gender", "seasonal_role", "batting_style", "skills",
+             nationality=COUNTRY)
+
+CACHE = obj("key", "expires", "etag", "max_age")
+
+SCHEMA_VERSION = obj("major_version", "minor_version")
+
+MATCH = obj("key", "name", "short_name", "sub_title", "status", "start_at", "metric_group", "sport", "format",
+            tournament=TOURNAMENT, teams=TEAMS, venue=VENUE, association=ASSOCIATION)
+
+
+def envelope(data=None):
+    """The REST response wrapper around `data`."""
+    return obj("error", "http_status_code", data=data, cache=CACHE, schema=SCHEMA_VERSION)
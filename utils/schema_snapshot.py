@@ -0,0 +1,294 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from standin.rest import ROUTES
+from standin.store import rest_path
+from utils import cassette
+from utils.schema import obj, list_of, map_of, nullable, optional, NUMBER
+
+# Schema snapshots inferred from recorded responses
+# Every successful REST GET in a cassette directory is grouped by endpoint (the
+# stand-in's route table names them, e.g. "match/{match_key}/over-summary/")
+# and by the envelope's schema.major_version / minor_version. The bodies of a
+# group are folded into one inferred schema: key sets, which keys are always
+# present, value types, nullability and list lengths. The result is a snapshot
+# at SCHEMA_DIR/<endpoint>/<major>_<minor>.json.
+#
+#   python -m utils.schema_snapshot infer --cassettes cassettes   # create or extend snapshots
+#   python -m utils.schema_snapshot check --cassettes cassettes   # report drift against them
+#
+# Inference is incremental: a snapshot remembers the hashes of the bodies folded
+# into it, so re-running infer only adds new recordings. check remembers which
+# recordings already passed against which snapshot (SCHEMA_DIR/.checked.json)
+# and only looks at new or changed ones. Validation goes through utils/schema.py,
+# so a drifted response is one pass that lists every violation.
+
+SCHEMA_DIR = "schemas"
+CHECKED_FILE = ".checked.json"
+# objects with this many keys, or mostly non-field-like keys ("a_1", player keys), are maps keyed by data
+MAP_MIN_KEYS = 40
+FIELD_NAME = re.compile(r"^[a-z][a-z_]*$")
+
+_ENDPOINTS = [(re.compile(pattern + "$"), re.sub(r"\(\?P<(\w+)>[^)]*\)", r"{\1}", pattern)) for pattern, _ in ROUTES]
+
+
+def endpoint_of(path):
+    for pattern, template in _ENDPOINTS:
+        if pattern.match(path):
+            return template
+    return None
+
+
+def snapshot_path(endpoint, version, directory=SCHEMA_DIR):
+    name = endpoint.strip("/").replace("/", ".").replace("{", "").replace("}", "")
+    return os.path.join(directory, name, f"{version[0]}_{version[1]}.json")
+
+
+def schema_version(body):
+    schema = body.get("schema") if isinstance(body, dict) else None
+    if not isinstance(schema, dict) or "major_version" not in schema:
+        return None
+    return str(schema["major_version"]), str(schema.get("minor_version"))
+
+
+def body_hash(body):
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+
+
+def recordings(directory):
+    # (name, endpoint, version, body) for every recorded 200 JSON GET with a versioned envelope
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name)) as f:
+            entry = json.load(f)
+        request, response = entry["request"], entry["response"]
+        if request["method"] != "GET" or response["status_code"] != 200 or "body" not in response:
+            continue
+        path = rest_path(request["url"])
+        endpoint = endpoint_of(path) if path is not None else None
+        if endpoint is None:
+            continue
+        try:
+            body = json.loads(response["body"])
+        except ValueError:
+            continue
+        version = schema_version(body)
+        if version is not None:
+            yield name, endpoint, version, body
+
+
+# Inference
+
+def _kind(value, node):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, list):
+        return "list"
+    if not value:
+        return "map" if "map" in node.get("types", ()) else "object"
+    if "map" in node.get("types", ()):
+        return "map"
+    odd = sum(1 for key in value if not FIELD_NAME.match(key))
+    return "map" if len(value) >= MAP_MIN_KEYS or odd * 2 >= len(value) else "object"
+
+
+def _combine(a, b):
+    # union of two nodes, as if every value behind both had been merged into one
+    if not a or not b:
+        return dict(a or b)
+    node = {"seen": a["seen"] + b["seen"], "types": sorted(set(a["types"]) | set(b["types"]))}
+    if "objects" in a or "objects" in b:
+        node["objects"] = a.get("objects", 0) + b.get("objects", 0)
+        node["fields"] = dict(a.get("fields", {}))
+        for key, child in b.get("fields", {}).items():
+            node["fields"][key] = _combine(node["fields"].get(key), child)
+    for name in ("values", "items"):
+        if name in a or name in b:
+            node[name] = _combine(a.get(name), b.get(name))
+    if "min_items" in a or "min_items" in b:
+        node["min_items"] = min(x["min_items"] for x in (a, b) if "min_items" in x)
+        node["max_items"] = max(x["max_items"] for x in (a, b) if "max_items" in x)
+    return node
+
+
+def _to_map(node):
+    # keys seen so far turn out to be data, not field names: fold them into the map's values
+    values = node.get("values")
+    for child in node.pop("fields", {}).values():
+        values = _combine(values, child)
+    node.pop("objects", None)
+    node["values"] = values or {}
+    node["types"] = [kind for kind in node["types"] if kind != "object"]
+
+
+def merge(node, value):
+    """Fold one value into an inferred schema node (a JSON-serializable dict) and return it."""
+    kind = _kind(value, node)
+    if kind == "map" and "object" in node.get("types", ()):
+        _to_map(node)
+    node["seen"] = node.get("seen", 0) + 1
+    if kind not in node.setdefault("types", []):
+        node["types"] = sorted(node["types"] + [kind])
+    if kind == "object":
+        node["objects"] = node.get("objects", 0) + 1
+        fields = node.setdefault("fields", {})
+        for key, item in value.items():
+            fields[key] = merge(fields.get(key, {}), item)
+    elif kind == "map":
+        values = node.get("values", {})
+        for item in value.values():
+            values = merge(values, item)
+        node["values"] = values
+    elif kind == "list":
+        node["min_items"] = min(node.get("min_items", len(value)), len(value))
+        node["max_items"] = max(node.get("max_items", len(value)), len(value))
+        items = node.get("items", {})
+        for item in value:
+            items = merge(items, item)
+        node["items"] = items
+    return node
+
+
+def to_schema(node):
+    """The utils/schema.py schema an inferred node stands for."""
+    if not node:
+        return None
+    types = set(node["types"]) - {"null"}
+    spec = None
+    if types and types <= {"int", "number"}:
+        spec = NUMBER if "number" in types else int
+    elif types == {"bool"}:
+        spec = bool
+    elif types == {"str"}:
+        spec = str
+    elif types == {"list"}:
+        fixed = node["min_items"] == node["max_items"] and node["seen"] > 1
+        spec = list_of(to_schema(node.get("items")),
+                       min_items=node["min_items"] if fixed else 0,
+                       max_items=node["max_items"] if fixed else None)
+    elif types == {"object"}:
+        required, optional_fields = [], {}
+        for key, child in node.get("fields", {}).items():
+            if child["seen"] == node["objects"]:
+                required.append((key, to_schema(child)))
+            else:
+                optional_fields[key] = optional(to_schema(child))
+        spec = obj(**dict(required), **optional_fields)
+    elif types == {"map"}:
+        spec = map_of(to_schema(node.get("values")))
+    if spec is not None and "null" in node["types"]:
+        spec = nullable(spec)
+    return spec
+
+
+# Snapshots
+
+def load_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_snapshot(path, snapshot):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def infer(cassette_dir, directory=SCHEMA_DIR):
+    """Fold every new recording into its snapshot; returns {snapshot path: bodies added}."""
+    snapshots, added = {}, {}
+    for _, endpoint, version, body in recordings(cassette_dir):
+        path = snapshot_path(endpoint, version, directory)
+        if path not in snapshots:
+            snapshots[path] = load_snapshot(path) or {
+                "endpoint": endpoint,
+                "schema_version": {"major_version": version[0], "minor_version": version[1]},
+                "sources": [],
+                "root": {},
+            }
+        snapshot = snapshots[path]
+        digest = body_hash(body)
+        if digest in snapshot["sources"]:
+            continue
+        merge(snapshot["root"], body)
+        snapshot["sources"].append(digest)
+        added[path] = added.get(path, 0) + 1
+    for path in added:
+        snapshots[path]["sources"].sort()
+        save_snapshot(path, snapshots[path])
+    return added
+
+
+def check(cassette_dir, directory=SCHEMA_DIR, everything=False):
+    """Validate recordings against their snapshots; returns {recording: [problems]} for the failing ones."""
+    ledger_path = os.path.join(directory, CHECKED_FILE)
+    ledger = {} if everything else (load_snapshot(ledger_path) or {})
+    validators, failures = {}, {}
+    for name, endpoint, version, body in recordings(cassette_dir):
+        path = snapshot_path(endpoint, version, directory)
+        if path not in validators:
+            snapshot = load_snapshot(path)
+            schema = to_schema(snapshot["root"]) if snapshot else None
+            validators[path] = (schema.compile() if schema is not None else None,
+                                body_hash(snapshot) if snapshot else None)
+        validate, snapshot_digest = validators[path]
+        if snapshot_digest is None:
+            failures[name] = [f"no snapshot for {endpoint} at schema {version[0]}/{version[1]}"]
+            continue
+        stamp = f"{body_hash(body)}:{snapshot_digest}"
+        if ledger.get(name) == stamp:
+            continue
+        errors = []
+        validate(body, endpoint, errors)
+        if errors:
+            failures[name] = errors
+            ledger.pop(name, None)
+        else:
+            ledger[name] = stamp
+    if os.path.isdir(directory):
+        save_snapshot(ledger_path, ledger)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Infer and check schema snapshots from recorded responses")
+    parser.add_argument("command", choices=("infer", "check"))
+    parser.add_argument("--cassettes", default=cassette.CASSETTE_DIR, help="directory of recorded cassettes")
+    parser.add_argument("--schemas", default=SCHEMA_DIR, help="directory of schema snapshots")
+    parser.add_argument("--all", action="store_true", help="check: re-check recordings that passed before")
+    args = parser.parse_args()
+
+    if args.command == "infer":
+        added = infer(args.cassettes, args.schemas)
+        for path, count in sorted(added.items()):
+            print(f"{path}: +{count}")
+        print(f"{sum(added.values())} new responses in {len(added)} snapshots")
+        return 0
+
+    failures = check(args.cassettes, args.schemas, everything=args.all)
+    for name, errors in sorted(failures.items()):
+        print(f"{name}: {len(errors)} problem(s)")
+        for error in errors[:20]:
+            print(f"  {error}")
+    print(f"{len(failures)} recordings drifted" if failures else "no drift")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())